@@ -17,17 +17,44 @@ https://iogs-lense-ressources.github.io/camera-gui/contents/appli_CMOS_labwork.h
 Creation : sept/2023
 Modification : oct/2024
 """
+import sys
+import time
 from pathlib import Path
 
 import cv2
 import numpy as np
-from lensepy.images.conversion import quantize_image
+
+# Shared image processing package (appli/processing)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from widgets.main_widget import *
-from lensecam.camera_thread import CameraThread
+from widgets.camera_thread import FrameCameraThread
 from lensecam.basler.camera_basler import get_bits_per_pixel
 from PyQt6.QtWidgets import QMainWindow, QApplication, QFileDialog
 from lensepy.images.processing import *
+from processing.averaging import FrameAverager
+from processing.scheduler import SettleTracker
+from processing.frame_timing import FrameTimingAnalyzer, LatencyTracker
+from processing.auto_exposure import AutoExposureController
+from processing.operators import (OPERATORS, apply_operator, get_kernel, THRESHOLD_TYPES,
+                                  NATIVE_OPERATORS)
+from processing.pipeline import Pipeline
+from processing.tiling import TiledExecutor
+from processing.lut import LutOperator
+from processing.edges import (GradientComputer, get_canny_thresholds, get_edge_points,
+                              draw_points, gradient_to_image)
+from processing.segmentation import segment_watershed, region_statistics, draw_regions
+from processing.corners import CornerTracker, draw_corners
+from processing.particles import ParticleTracker, CsvSink
+from processing.sampling import sampling_pyramid
+from processing.quantization import quantization_errors
+from processing.noise import NoiseInjector
+from processing.frequency import SpectrumAnalyzer, get_filter_mask, SPECTRUM_DISPLAY_INTERVAL
+from processing.mtf import measure_mtf, draw_edge
+from processing.focus import FocusMeter, get_grid_stride
+from processing.profiles import LineProfiler, get_line_through
+from processing.matching import TemplateMatcher, draw_match
+from processing.drift import DriftMonitor
 
 def save_file_path(default_file_path: str, file_name: str = "", dialog: bool = True) -> tuple[str, str]:
     if default_file_path is not None:
@@ -75,18 +102,54 @@ class MainWindow(QMainWindow):
         # Displayed image
         self.check_diff = False
         self.kernel_type = None
+        # Frame averaging (available for all the modes)
+        self.frame_averager = FrameAverager()
         # Camera
         self.brand_camera = None
         self.camera_device = None
         self.camera = None
         self.camera_index = 0  # TO UPDATE !! when a new camera is selected with a camera_list object
-        self.camera_thread = CameraThread()
-        self.camera_thread.image_acquired.connect(self.thread_update_image)
+        # Every frame is tagged (frame number, timestamps) to detect jitter and dropped frames
+        self.frame_timing = FrameTimingAnalyzer()
+        # Auto-exposure loop, running in the camera thread
+        self.auto_exposure = AutoExposureController()
+        # Drift and vibrations : all the frames are registered in the camera thread
+        self.drift_monitor = DriftMonitor()
+        self.camera_thread = FrameCameraThread(self.frame_timing, self.auto_exposure,
+                                               self.drift_monitor)
+        self.camera_thread.frame_acquired.connect(self.thread_update_image)
+        self.camera_thread.exposure_changed.connect(self.action_exposure_applied)
+        self.camera_thread.error_occurred.connect(self.action_camera_error)
         self.camera_exposure_time = 0
+        # Frames acquired just after a parameter change are not valid for measurements
+        self.settle_tracker = SettleTracker(metadata_key='exposure')
+        self.frame_valid = True
+        # Processing graph - a node is recomputed only if its frame or its parameters changed
+        self.frame_id = 0
+        self.tiling = TiledExecutor()   # Neighbourhood operators on large AOI, in bands
+        self.pipeline = Pipeline()
+        self.native_depth = True        # NATIVE_OPERATORS at the bits depth of the camera
+        self.watershed_latency = LatencyTracker()   # Largest AOI segmented at the frame rate
+        self.template_latency = LatencyTracker()    # Template matching on the whole frame
+        self.drift_counter = None       # Last sample of the drift monitor displayed
+        self.particles_sink = None      # CSV file of the particle analysis
+        self.particles_frame_id = None  # Last frame written in the CSV file
+        self.spectrum_display_time = 0  # Last display of the spectrum (rate limited)
         # GUI structure
         self.central_widget = MainWidget(self)
         self.setCentralWidget(self.central_widget)
         load_menu('menu/menu.txt', self.central_widget.main_menu)
+        self.init_frame_averager()
+        if 'settle_frames' in self.central_widget.default_parameters:
+            self.settle_tracker.settle_frames = int(self.central_widget.default_parameters['settle_frames'])
+            self.auto_exposure.tracker.settle_frames = self.settle_tracker.settle_frames
+        if 'max_settle_frames' in self.central_widget.default_parameters:
+            self.settle_tracker.max_settle_frames = int(
+                self.central_widget.default_parameters['max_settle_frames'])
+        self.init_auto_exposure_params()
+        if 'native_depth' in self.central_widget.default_parameters:
+            self.native_depth = self.central_widget.default_parameters['native_depth'] == 'on'
+        self.init_pipeline()
         if self.central_widget.auto_connect_camera():
             self.main_action('images')
         self.central_widget.main_signal.connect(self.main_action)
@@ -99,6 +162,10 @@ class MainWindow(QMainWindow):
         :param event: Event that triggered the action.
         """
         print(f'Expo = {self.camera_exposure_time} us')
+        # New widgets : all the displays must be updated
+        self.pipeline.invalidate()
+        self.close_particles_sink()
+        self.drift_monitor.enabled = False
         if self.raw_image is not None:
             size = self.raw_image.shape[1] * self.raw_image.shape[0]
             self.fast_mode = size > 1e5 # Fast mode if number of pixels > 1e5
@@ -201,18 +268,241 @@ class MainWindow(QMainWindow):
             self.check_diff = False
             self.central_widget.options_widget.options_changed.connect(self.action_filter_smooth)
 
+        elif self.central_widget.mode == 'filter_fft':
+            self.central_widget.options_widget.fft_changed.connect(self.action_filter_fft)
+            self.action_filter_fft('fft')
+
         elif self.central_widget.mode == 'tools_slice':
             self.central_widget.options_widget.options_changed.connect(self.action_slice_tools)
 
-    def thread_update_image(self, image_array):
+        elif self.central_widget.mode == 'tools_mtf':
+            self.central_widget.options_widget.mtf_changed.connect(self.action_mtf_tools)
+            self.action_mtf_tools('mtf')
+
+        elif self.central_widget.mode == 'tools_focus':
+            self.focus_meter.reset()
+            self.central_widget.options_widget.focus_changed.connect(self.action_focus_tools)
+            self.action_focus_tools('focus')
+
+        elif self.central_widget.mode == 'tools_drift':
+            # The next frame of the camera thread is the reference
+            self.drift_monitor.aoi = self.aoi
+            self.drift_monitor.request_reset()
+            self.drift_monitor.enabled = True
+            self.drift_counter = None
+            self.central_widget.options_widget.drift_changed.connect(self.action_drift_tools)
+            self.action_drift_tools('drift')
+
+        elif self.central_widget.mode == 'edge_sobel':
+            self.central_widget.options_widget.edge_changed.connect(self.action_edge_gradient)
+            self.action_edge_gradient('edge_gradient')
+
+        elif self.central_widget.mode == 'edge_canny':
+            self.central_widget.options_widget.edge_changed.connect(self.action_edge_canny)
+            self.action_edge_canny('edge_canny')
+
+        elif self.central_widget.mode == 'segment_watershed':
+            self.watershed_latency.reset()
+            self.central_widget.options_widget.watershed_changed.connect(
+                self.action_segment_watershed)
+            self.action_segment_watershed('watershed')
+
+        elif self.central_widget.mode == 'detect_harrys':
+            self.corner_tracker.reset()
+            self.central_widget.options_widget.corners_changed.connect(self.action_detect_corners)
+            self.action_detect_corners('corners')
+
+        elif self.central_widget.mode == 'detect_template':
+            self.template_matcher.reset()
+            self.template_latency.reset()
+            self.central_widget.options_widget.template_changed.connect(
+                self.action_detect_template)
+            self.action_detect_template('template')
+
+        elif self.central_widget.mode == 'segment_particles':
+            self.particle_tracker.reset()
+            self.central_widget.options_widget.particles_changed.connect(
+                self.action_segment_particles)
+            self.action_segment_particles('particles')
+
+        elif self.central_widget.mode == 'frame_average':
+            self.central_widget.options_widget.averaging_changed.connect(self.action_frame_average)
+
+        elif self.central_widget.mode == 'auto_exposure':
+            self.central_widget.options_widget.auto_exposure_changed.connect(self.action_auto_exposure)
+
+        elif self.central_widget.mode == 'frame_timing':
+            self.central_widget.options_widget.timing_changed.connect(self.action_frame_timing)
+            self.action_frame_timing('update')
+
+    def init_frame_averager(self):
+        """Initialize the frame averager with default_config.txt."""
+        default_parameters = self.central_widget.default_parameters
+        if 'average_frames' in default_parameters:
+            self.frame_averager.set_nb_frames(int(default_parameters['average_frames']))
+        if 'average_alpha' in default_parameters:
+            self.frame_averager.set_alpha(float(default_parameters['average_alpha']))
+        if 'average_mode' in default_parameters:
+            self.frame_averager.set_mode(default_parameters['average_mode'])
+
+    def init_auto_exposure_params(self):
+        """Initialize the auto-exposure controller with default_config.txt."""
+        default_parameters = self.central_widget.default_parameters
+        if 'auto_exposure_metric' in default_parameters:
+            self.auto_exposure.set_metric(default_parameters['auto_exposure_metric'])
+        if 'auto_exposure_target' in default_parameters:
+            self.auto_exposure.set_target(float(default_parameters['auto_exposure_target']))
+        if 'auto_exposure_percentile' in default_parameters:
+            self.auto_exposure.percentile = float(default_parameters['auto_exposure_percentile'])
+        if 'auto_exposure_stride' in default_parameters:
+            self.auto_exposure.stride = max(1, int(default_parameters['auto_exposure_stride']))
+        if 'auto_exposure' in default_parameters:
+            self.auto_exposure.set_enabled(default_parameters['auto_exposure'] == 'on')
+
+    def init_pipeline(self):
+        """
+        Create the processing graph : frame -> AOI (raw / 8 bits) -> operators.
+        In native mode, the operators of NATIVE_OPERATORS process the raw AOI and their
+        results are only converted to 8 bits for the display (see get_source and
+        to_display). The other ones process the 8 bits AOI.
+        """
+        self.pipeline.add_source('frame')
+        self.pipeline.add_node('aoi_raw', OPERATORS['aoi'], ['frame'])
+        self.pipeline.add_node('aoi', OPERATORS['to_8bits'], ['aoi_raw'])
+        self.pipeline.add_node('threshold', OPERATORS['threshold'], ['aoi_raw'])
+        for name in ['contrast_brightness', 'enhance_contrast']:
+            if self.get_source(name) == 'aoi_raw':
+                # Operator at the bits depth of the camera and display in one pass
+                self.pipeline.add_node(name, OPERATORS[name], ['aoi_raw'])
+            else:
+                # Conversion to 8 bits and operator fused in one table
+                self.pipeline.add_node(name, LutOperator(['to_8bits', name]), ['aoi_raw'])
+        # Quantization : errors of all the bits depths from the histogram of the raw AOI
+        self.pipeline.add_node('histogram_raw', OPERATORS['histogram'], ['aoi_raw'])
+        self.pipeline.add_node('quantization_errors', quantization_errors, ['histogram_raw'])
+        # Sampling : images of all the factors kept for the frame (slider of the factor)
+        self.pipeline.add_node('sampling', sampling_pyramid, [self.get_source('sampling')])
+        # Smoothing filters : applied to the AOI with an optional injected noise
+        self.pipeline.add_node('noise', NoiseInjector(), ['aoi'])
+        self.pipeline.add_node('morphology', self.tiling.get_operator('morphology'), ['aoi'])
+        self.pipeline.add_node('smooth', self.tiling.get_operator('smooth'), ['noise'])
+        # Frequency analysis : FFT once per frame, for the filter and the spectrum
+        self.spectrum_analyzer = SpectrumAnalyzer()
+        self.pipeline.add_node('spectrum', self.spectrum_analyzer.transform, ['aoi'])
+        self.pipeline.add_node('fft_filter', self.spectrum_analyzer.filter, ['spectrum'])
+        # MTF : slanted edge measured at the bits depth of the camera
+        self.pipeline.add_node('mtf', measure_mtf, ['aoi_raw'])
+        # Profiles : sampling coordinates cached until the lines move
+        self.line_profiler = LineProfiler()
+        self.pipeline.add_node('profile_row', self.line_profiler, ['aoi_raw'])
+        self.pipeline.add_node('profile_column', self.line_profiler, ['aoi_raw'])
+        # Focus : metric on a sparse grid of the raw AOI, one value of the trace per frame
+        self.focus_meter = FocusMeter()
+        self.pipeline.add_node('focus', self.focus_meter, ['aoi_raw'])
+        # Edges : histogram cached per frame for the thresholds of the Canny detector
+        self.pipeline.add_node('histogram', OPERATORS['histogram'], ['aoi'])
+        self.pipeline.add_node('edge_gradient', GradientComputer(), ['aoi'])
+        self.pipeline.add_node('canny', OPERATORS['canny'], ['aoi'])
+        # Segmentation : labels, then statistics of the regions
+        self.pipeline.add_node('watershed', segment_watershed, ['aoi'])
+        self.pipeline.add_node('regions', region_statistics,
+                               ['watershed', self.get_source('regions')])
+        # Corners : detected, or tracked from the previous frame (budget mode)
+        self.corner_tracker = CornerTracker()
+        self.pipeline.add_node('corners', self.corner_tracker, ['aoi'])
+        # Template matching : template taught from the AOI, searched in the whole frame
+        self.template_matcher = TemplateMatcher()
+        self.pipeline.add_node('frame_8bits', OPERATORS['to_8bits'], ['frame'])
+        self.pipeline.add_node('template', self.template_matcher, ['frame_8bits'])
+        # Particles : analysis of the thresholded AOI, tracked from frame to frame
+        self.particle_tracker = ParticleTracker()
+        self.pipeline.add_node('particles', self.particle_tracker, ['threshold'])
+
+    def set_pipeline_frame(self):
+        """Send a new frame to the processing graph."""
+        self.frame_id += 1
+        self.pipeline.set_frame('frame', self.raw_image, self.frame_id)
+
+    def process_node(self, name: str, params: dict = None):
+        """
+        Return the output of a node of the processing graph, computed only if required.
+        :param name: Name of the node.
+        :param params: New parameters of the node. Default None.
+        :return: Output of the node.
+        """
+        self.pipeline.set_params('aoi_raw', {'aoi': self.aoi})
+        self.pipeline.set_params('aoi', {'bit_depth': self.image_bits_depth})
+        if params is not None:
+            self.pipeline.set_params(name, {**params, 'bit_depth': self.image_bits_depth})
+        return self.pipeline.get(name)
+
+    def get_source(self, name: str) -> str:
+        """
+        Return the input node of an operator : raw AOI for the operators of NATIVE_OPERATORS
+        in native mode, 8 bits AOI otherwise.
+        :param name: Name of the operator.
+        """
+        return 'aoi_raw' if self.native_depth and name in NATIVE_OPERATORS else 'aoi'
+
+    def get_image_depth(self, image: np.ndarray) -> int:
+        """Return the bits depth of an image of the processing graph."""
+        return 8 if image.dtype == np.uint8 else self.image_bits_depth
+
+    def to_display(self, image: np.ndarray) -> np.ndarray:
+        """Convert a processed image to 8 bits, only for the display."""
+        if image.dtype == np.uint8:
+            return image
+        return apply_operator('to_8bits', image, {'bit_depth': self.image_bits_depth})
+
+    def display_double_histo(self, name: str, source: str = None):
+        """
+        Display the histograms of the AOI and of the output of a node (bot_right widget).
+        Histograms are only computed when the data changed.
+        :param name: Name of the node.
+        :param source: Name of the input node. Default None (AOI).
+        """
+        source = source or self.get_source(name)
+        bot_right = self.central_widget.bot_right_widget
+        source_image, output_image = self.pipeline.get(source), self.pipeline.get(name)
+        bot_right.set_bit_depth(self.get_image_depth(output_image),
+                                histo1=self.get_image_depth(source_image))
+        if self.pipeline.has_changed(source, 'bot_right'):
+            bot_right.histo1.set_image(source_image)
+        if self.pipeline.has_changed(name, 'bot_right'):
+            bot_right.histo2.set_image(output_image)
+
+    def init_auto_exposure(self):
+        """Give the camera settings to the auto-exposure controller, before starting the thread."""
+        min_expo, max_expo = self.camera.get_exposure_range()
+        self.auto_exposure.set_exposure_range(min_expo, min(max_expo, 2000000))
+        self.auto_exposure.set_exposure(self.camera_exposure_time)
+        self.auto_exposure.bit_depth = self.image_bits_depth
+        self.auto_exposure.aoi = self.aoi
+
+    def thread_update_image(self, image_array, metadata: dict = None):
+        start_time = time.perf_counter()
+        try:
+            self.process_image(image_array, metadata)
+        finally:
+            # Processing time of the frame, logged with the dropped frames
+            load_ms = (time.perf_counter() - start_time) * 1000
+            self.frame_timing.set_load(load_ms, self.central_widget.mode)
+            self.camera_thread.frame_processed()
+
+    def process_image(self, image_array, metadata: dict = None):
         if image_array is not None:
+            self.frame_valid = self.settle_tracker.add_frame(metadata)
             if self.image_bits_depth > 8:
                 self.raw_image = image_array.view(np.uint16)
+                # Averaging is done at the native bit depth of the camera
+                self.raw_image = self.frame_averager.add_frame(self.raw_image)
                 self.image = self.raw_image >> (self.image_bits_depth-8)
                 self.image = self.image.astype(np.uint8)
             else:
                 self.raw_image = image_array.view(np.uint8)
+                self.raw_image = self.frame_averager.add_frame(self.raw_image)
                 self.image = self.raw_image
+            self.set_pipeline_frame()
         self.image_disp = self.image
         #print(type(self.image_disp))
         self.central_widget.top_left_widget.set_image_from_array(self.image_disp)
@@ -247,20 +537,10 @@ class MainWindow(QMainWindow):
             #self.central_widget.update_image(aoi=True)
         elif self.central_widget.mode == 'histo_time':
             self.central_widget.update_image(aoi=True)
-            if self.central_widget.options_widget.is_acquiring():
+            if self.central_widget.options_widget.is_acquiring() and self.frame_valid:
+                # O(1) append in the ring buffer, chart updated from a decimated view
                 self.central_widget.options_widget.increase_counter(self.raw_image)
-                list_values = np.array(self.central_widget.options_widget.pixels_value)
-                time_values = np.linspace(1, list_values[0].shape[0], list_values[0].shape[0])
-                table_values = np.array(list_values)
-                if len(table_values.shape) <= 2:
-                    self.central_widget.bot_right_widget.set_data(time_values, table_values[0,:],
-                                                                  x_label=translate('sample_number'),
-                                                                  y_label=translate('pixel_value'))
-                else: # RGB
-                    self.central_widget.bot_right_widget.set_data(time_values, table_values[0, :, :],
-                                                                  x_label=translate('sample_number'),
-                                                                  y_label=translate('pixel_value'))
-                self.central_widget.bot_right_widget.update_chart(20)
+                self.central_widget.bot_right_widget.update_chart()
 
         elif self.central_widget.mode == 'quant_samp':
             self.central_widget.update_image(aoi=True)
@@ -287,26 +567,61 @@ class MainWindow(QMainWindow):
         elif self.central_widget.mode == 'erosion_dilation':
             self.central_widget.update_image(aoi=True)
             self.action_erosion_dilation(None)
-            if self.central_widget.submode == 'erorion':
-                self.action_erosion_dilation('erosion')
-            elif self.central_widget.mode == 'dilation':
-                self.action_erosion_dilation('dilation')
         elif self.central_widget.mode == 'opening_closing':
             self.central_widget.update_image(aoi=True)
             self.action_erosion_dilation(None)
-            if self.central_widget.submode == 'opening':
-                self.action_erosion_dilation('opening')
-            elif self.central_widget.mode == 'closing':
-                self.action_erosion_dilation('closing')
         elif self.central_widget.mode == 'gradient':
             self.central_widget.update_image(aoi=True)
             self.action_erosion_dilation('gradient')
         elif self.central_widget.mode == 'filter_smooth':
             self.central_widget.update_image(aoi=True)
             self.action_filter_smooth(None)
+        elif self.central_widget.mode == 'filter_fft':
+            self.central_widget.update_image(aoi=True)
+            self.action_filter_fft(None)
         elif self.central_widget.mode == 'tools_slice':
             self.central_widget.update_image(aoi=True)
             self.action_slice_tools(None)
+        elif self.central_widget.mode == 'tools_mtf':
+            self.central_widget.update_image(aoi=True)
+            self.action_mtf_tools(None)
+        elif self.central_widget.mode == 'tools_focus':
+            self.central_widget.update_image(aoi=True)
+            self.action_focus_tools(None)
+        elif self.central_widget.mode == 'tools_drift':
+            self.central_widget.update_image(aoi=True)
+            self.action_drift_tools(None)
+        elif self.central_widget.mode == 'edge_sobel':
+            self.central_widget.update_image(aoi=True)
+            self.action_edge_gradient(None)
+        elif self.central_widget.mode == 'edge_canny':
+            self.central_widget.update_image(aoi=True)
+            self.action_edge_canny(None)
+        elif self.central_widget.mode == 'segment_watershed':
+            self.central_widget.update_image(aoi=True)
+            self.action_segment_watershed(None)
+        elif self.central_widget.mode == 'detect_harrys':
+            self.central_widget.update_image(aoi=True)
+            self.action_detect_corners(None)
+        elif self.central_widget.mode == 'detect_template':
+            self.central_widget.update_image(aoi=True)
+            self.action_detect_template(None)
+        elif self.central_widget.mode == 'segment_particles':
+            self.central_widget.update_image(aoi=True)
+            self.action_segment_particles(None)
+        elif self.central_widget.mode == 'frame_average':
+            if self.aoi is not None:
+                self.central_widget.update_image(aoi=True)
+            self.central_widget.options_widget.set_counter(self.frame_averager.get_counter())
+        elif self.central_widget.mode == 'auto_exposure':
+            image = get_aoi_array(self.raw_image, self.aoi) if self.aoi is not None else self.raw_image
+            self.central_widget.top_right_widget.set_bit_depth(self.image_bits_depth)
+            self.central_widget.top_right_widget.set_image(image, fast_mode=self.fast_mode)
+            self.central_widget.top_right_widget.update_info()
+            self.central_widget.options_widget.set_status(self.auto_exposure.statistics,
+                                                          self.camera_exposure_time)
+        elif self.central_widget.mode == 'frame_timing':
+            self.action_frame_timing('update')
 
     def action_image_from_file(self, event: np.ndarray):
         """
@@ -327,6 +642,7 @@ class MainWindow(QMainWindow):
         self.raw_image = image.squeeze()
         self.image = self.raw_image
         self.aoi = None
+        self.set_pipeline_frame()
         self.central_widget.top_left_widget.set_image_from_array(self.raw_image)
         self.central_widget.top_left_widget.repaint()
         self.central_widget.options_widget.button_open_image.setStyleSheet(unactived_button)
@@ -358,6 +674,7 @@ class MainWindow(QMainWindow):
         self.central_widget.main_menu.expo_widget.set_min_max_values(min_expo, max_expo)
         # Start Thread
         self.image_bits_depth = get_bits_per_pixel(self.camera.get_color_mode())
+        self.init_auto_exposure()
 
         self.camera_thread.start()
 
@@ -367,6 +684,7 @@ class MainWindow(QMainWindow):
             x, y = self.central_widget.options_widget.get_position()
             w, h = self.central_widget.options_widget.get_size()
             self.aoi = (x, y, w, h)
+            self.auto_exposure.aoi = self.aoi
             menu1 = self.central_widget.get_list_menu('type1')
             self.central_widget.main_menu.set_enabled(menu1, True)
 
@@ -510,8 +828,11 @@ class MainWindow(QMainWindow):
     def action_histo_time(self, event):
         """Action performed when an event occurred in the histo_time options widget."""
         if event == 'start':
-            self.central_widget.options_widget.start_acquisition()
+            self.central_widget.options_widget.start_acquisition(color=len(self.raw_image.shape) > 2)
             self.central_widget.options_widget.set_enabled_save(False)
+            self.central_widget.bot_right_widget.set_series(
+                self.central_widget.options_widget.get_series(),
+                x_label=translate('sample_number'), y_label=translate('pixel_value'))
         elif event == 'acq_end':
             pixels = self.central_widget.options_widget.get_pixels(0)
             pixels = np.array(pixels).squeeze()
@@ -526,6 +847,7 @@ class MainWindow(QMainWindow):
             self.central_widget.top_right_widget.set_bit_depth(self.image_bits_depth)
             self.central_widget.top_right_widget.set_image(pixels)
             self.central_widget.top_right_widget.update_info()
+            self.central_widget.bot_right_widget.set_pixel_index(pixel_index)
         elif event == 'save_hist_time':
             pixel_index = self.central_widget.options_widget.get_pixel_index()
             pixels = self.central_widget.options_widget.get_pixels(pixel_index)
@@ -538,23 +860,34 @@ class MainWindow(QMainWindow):
 
     def action_quantize_image(self, event):
         """Action performed when an event occurred in the quantization options widget."""
-        aoi_array_raw = get_aoi_array(self.raw_image, self.aoi)
-        aoi_array = get_aoi_array(self.image, self.aoi)
+        aoi_array_raw = self.process_node('aoi_raw')
+        aoi_array = self.process_node(self.get_source('quantization'))
         if event == 'quantized':
             bit_depth = self.central_widget.options_widget.get_bits_depth()
-            quantized_image = quantize_image(aoi_array, bit_depth)
-            self.central_widget.top_right_widget.set_image_from_array(quantized_image << (8-bit_depth))
+            quantized_image = apply_operator('quantization', aoi_array,
+                                             {'bit_depth': bit_depth,
+                                              'init_depth': self.get_image_depth(aoi_array)})
+            display_image = (quantized_image << (8-bit_depth)).astype(np.uint8)
+            self.central_widget.top_right_widget.set_image_from_array(display_image)
             self.central_widget.bot_right_widget.set_bit_depth(bit_depth, histo1=self.image_bits_depth)
             self.central_widget.bot_right_widget.set_images(aoi_array_raw, quantized_image)
+        # Errors of all the bits depths, only computed for a new frame or a new AOI
+        self.process_node('histogram_raw', {})
+        errors = self.process_node('quantization_errors', {'midpoint': True})
+        if event == 'quantized' or self.pipeline.has_changed('quantization_errors', 'options'):
+            self.central_widget.options_widget.set_errors(errors)
 
     def action_sampling_image(self, event):
         """Action performed when an event occurred in the sampling options widget."""
-        aoi_array = get_aoi_array(self.image, self.aoi)
+        aoi_array = self.process_node(self.get_source('sampling'))
         if event == 'resampled':
-            sample_factor = self.central_widget.options_widget.get_sample_factor()
-            small_image, downsampled_image = downsample_and_upscale(aoi_array, sample_factor)
-            self.central_widget.top_right_widget.set_image_from_array(downsampled_image)
-            self.central_widget.bot_right_widget.set_bit_depth(8)
+            options_widget = self.central_widget.options_widget
+            pyramid = self.process_node('sampling', {'method': options_widget.get_method()})
+            small_image, downsampled_image = pyramid.get(options_widget.get_sample_factor())
+            self.central_widget.top_right_widget.set_image_from_array(
+                self.to_display(downsampled_image))
+            bit_depth = self.get_image_depth(aoi_array)
+            self.central_widget.bot_right_widget.set_bit_depth(bit_depth, histo1=bit_depth)
             self.central_widget.bot_right_widget.set_images(aoi_array, small_image)
 
     def action_contrast_brightness(self, event):
@@ -566,61 +899,59 @@ class MainWindow(QMainWindow):
         elif event == 'contrast_brightness':
             self.central_widget.submode = 'contrast_brightness'
 
-        aoi_array = get_aoi_array(self.image, self.aoi)
+        aoi_array = self.process_node(self.get_source('contrast_brightness'))
         if self.central_widget.submode == 'contrast_brightness':
-            contrast_value = self.central_widget.options_widget.get_contrast()
-            brightness_value = self.central_widget.options_widget.get_brightness()
-            eroded = contrast_brightness_image(aoi_array, contrast_value, brightness_value)
+            # Result in 8 bits (display mapping in the same pass)
+            params = {'contrast': self.central_widget.options_widget.get_contrast(),
+                      'brightness': self.central_widget.options_widget.get_brightness(),
+                      'display': True}
+            eroded = self.process_node('contrast_brightness', params)
+            self.display_double_histo('contrast_brightness')
         else:
             eroded = aoi_array
-        self.central_widget.bot_right_widget.set_bit_depth(8)
-        self.central_widget.bot_right_widget.set_images(aoi_array, eroded)
+            bit_depth = self.get_image_depth(aoi_array)
+            self.central_widget.bot_right_widget.set_bit_depth(bit_depth, histo1=bit_depth)
+            self.central_widget.bot_right_widget.set_images(aoi_array, eroded)
         if self.check_diff:
-            eroded = aoi_array - eroded
-        self.central_widget.top_right_widget.set_image_from_array(eroded)
+            eroded = self.process_node('aoi') - self.to_display(eroded)
+        self.central_widget.top_right_widget.set_image_from_array(self.to_display(eroded))
 
     def action_enhance_contrast(self, event):
         """Action performed when an event occurred in the erosion/dilation options widget."""
-        aoi_array = get_aoi_array(self.image, self.aoi)
-        delta_image_depth = (self.image_bits_depth - 8)  # Power of 2 for depth conversion
-        min_value = int(self.central_widget.options_widget.get_min() // 2**delta_image_depth)
-        max_value = int(self.central_widget.options_widget.get_max() // 2**delta_image_depth)
-        max_range = 255
-        gain = max_range/(max_value-min_value)
-        output_image = ((aoi_array.astype(np.int16)-min_value+1) * gain).astype(np.int16)
-        output_image[output_image > max_range] = 255
-        output_image[output_image <= 1] = 0
-        output_image = output_image.astype(np.uint8)
-
-        self.central_widget.bot_right_widget.set_bit_depth(8)
-        self.central_widget.bot_right_widget.set_images(aoi_array, output_image)
+        aoi_array = self.process_node(self.get_source('enhance_contrast'))
+        # Power of 2 for depth conversion
+        delta_image_depth = self.image_bits_depth - self.get_image_depth(aoi_array)
+        # Result in 8 bits (display mapping in the same pass)
+        params = {'min': int(self.central_widget.options_widget.get_min() // 2**delta_image_depth),
+                  'max': int(self.central_widget.options_widget.get_max() // 2**delta_image_depth),
+                  'display': True}
+        output_image = self.process_node('enhance_contrast', params)
+        self.display_double_histo('enhance_contrast')
         if self.check_diff:
-            output_image = aoi_array - output_image
-        self.central_widget.top_right_widget.set_image_from_array(output_image)
+            output_image = self.process_node('aoi') - output_image
+        self.central_widget.top_right_widget.set_image_from_array(self.to_display(output_image))
 
     def action_threshold(self, event):
         """Action performed when an event occurred in the threshold options widget."""
         if event == 'threshold_type':
             threshold_index = self.central_widget.options_widget.get_threshold_type_index()
             self.central_widget.submode = threshold_index
-        aoi_array_raw = get_aoi_array(self.raw_image, self.aoi)
-
         threshold_value = int(self.central_widget.options_widget.get_threshold_value())
         threshold_value_hat = int(self.central_widget.options_widget.get_threshold_hat_value())
 
-        if self.central_widget.submode == 1: # Normal threshold
-            ret, output_image = cv2.threshold(aoi_array_raw, threshold_value, 255, cv2.THRESH_BINARY)
-        elif self.central_widget.submode == 2: # Inverted threshold
-            ret, output_image = cv2.threshold(aoi_array_raw, threshold_value,
-                                              255, cv2.THRESH_BINARY_INV)
-        elif self.central_widget.submode == 3: # Hat threshold
-            output_image = cv2.inRange(aoi_array_raw, threshold_value, threshold_value_hat)
+        submode = self.central_widget.submode
+        params = {'type': THRESHOLD_TYPES[submode] if submode in (1, 2, 3) else None,
+                  'value': threshold_value, 'value_hat': threshold_value_hat,
+                  'bit_depth': self.image_bits_depth}
+        output_image = self.process_node('threshold', params)
+
+        # Histogram of the AOI only computed for a new frame or a new AOI
+        if self.pipeline.has_changed('aoi_raw', 'bot_right'):
+            self.central_widget.bot_right_widget.set_bit_depth(self.image_bits_depth)
+            self.central_widget.bot_right_widget.set_image(self.pipeline.get('aoi_raw'),
+                                                           fast_mode=True)
         else:
-            delta_depth = self.image_bits_depth - 8
-            output_image = (aoi_array_raw >> delta_depth).astype(np.uint8)
-
-        self.central_widget.bot_right_widget.set_bit_depth(self.image_bits_depth)
-        self.central_widget.bot_right_widget.set_image(aoi_array_raw, fast_mode=True)
+            clear_v_lines(self.central_widget.bot_right_widget)
         self.central_widget.bot_right_widget.set_v_line(threshold_value)
         if self.central_widget.submode == 3: # Hat threshold:
             self.central_widget.bot_right_widget.set_v_line(threshold_value_hat, 'b')
@@ -654,38 +985,21 @@ class MainWindow(QMainWindow):
             self.kernel_type = 'ellip'
 
         kernel = self.central_widget.options_widget.get_kernel().T
-        if self.kernel_type == 'cross':
-            kernel = get_cross_kernel(kernel.shape[0])
-            self.central_widget.options_widget.set_kernel(kernel)
-        elif self.kernel_type == 'rect':
-            kernel = get_rect_kernel(kernel.shape[0])
-            self.central_widget.options_widget.set_kernel(kernel)
-        elif self.kernel_type == 'ellip':
-            kernel = get_ellip_kernel(kernel.shape[0])
+        if self.kernel_type in ('cross', 'rect', 'ellip'):
+            kernel = get_kernel(self.kernel_type, kernel.shape[0])
             self.central_widget.options_widget.set_kernel(kernel)
         else:
             self.central_widget.options_widget.inactivate_kernel()
             self.central_widget.options_widget.set_kernel(kernel.T)
         self.central_widget.options_widget.repaint()
 
-        aoi_array = get_aoi_array(self.image, self.aoi)
-        if self.central_widget.submode == 'erosion':
-            eroded = erode_image(aoi_array, kernel)
-        elif self.central_widget.submode == 'dilation':
-            eroded = dilate_image(aoi_array, kernel)
-        elif self.central_widget.submode == 'opening':
-            eroded = opening_image(aoi_array, kernel)
-        elif self.central_widget.submode == 'closing':
-            eroded = closing_image(aoi_array, kernel)
-        elif self.central_widget.submode == 'gradient':
-            eroded = gradient_image(aoi_array, kernel)
-        else:
-            eroded = aoi_array
-        self.central_widget.bot_right_widget.set_bit_depth(8)
-        self.central_widget.bot_right_widget.set_images(aoi_array, eroded)
+        aoi_array = self.process_node('aoi')
+        eroded = self.process_node('morphology',
+                                   {'operation': self.central_widget.submode, 'kernel': kernel})
+        self.display_double_histo('morphology')
         if self.check_diff:
             eroded = aoi_array - eroded
-        self.central_widget.top_right_widget.set_image_from_array(eroded)
+        self.central_widget.top_right_widget.set_image_from_array(self.to_display(eroded))
 
     def action_filter_smooth(self, event):
         """Action performed when an event occurred in the erosion/dilation options widget."""
@@ -694,31 +1008,314 @@ class MainWindow(QMainWindow):
         elif event == 'check_diff:1':
             self.check_diff = True
 
-        aoi_array = get_aoi_array(self.image, self.aoi)
-        eroded = self.central_widget.options_widget.get_selection(aoi_array)
-        self.central_widget.bot_right_widget.set_bit_depth(8)
-        self.central_widget.bot_right_widget.set_images(aoi_array, eroded)
+        options_widget = self.central_widget.options_widget
+        aoi_array = self.process_node('noise', options_widget.get_noise_params())
+        eroded = self.process_node('smooth', options_widget.get_params())
+        self.display_double_histo('smooth', 'noise')
+        if eroded is None:
+            # No filter : the noisy image is displayed
+            eroded = aoi_array
         if self.check_diff:
             eroded = aoi_array - eroded
-        self.central_widget.top_right_widget.set_image_from_array(eroded)
+        self.central_widget.top_right_widget.set_image_from_array(self.to_display(eroded))
+
+    def action_filter_fft(self, event):
+        """Action performed when an event occurred in the FFT options widget."""
+        options_widget = self.central_widget.options_widget
+        params = options_widget.get_params()
+        # The spectrum is displayed at a limited rate, or for new parameters
+        now = time.perf_counter()
+        display_spectrum = (event == 'fft' or
+                            now - self.spectrum_display_time >= SPECTRUM_DISPLAY_INTERVAL)
+        if params['type'] is None and not display_spectrum:
+            # No filter : the FFT is only required for the spectrum
+            return
+        transformed = self.process_node('spectrum', {})
+        filtered = self.process_node('fft_filter', params)
+        if self.pipeline.has_changed('fft_filter', 'top_right'):
+            if filtered is None:
+                filtered = self.process_node('aoi')
+            self.central_widget.top_right_widget.set_image_from_array(self.to_display(filtered))
+        fft_time = (time.perf_counter() - now) * 1000
+        display_time = None
+        if display_spectrum and (event == 'fft' or
+                                 self.pipeline.has_changed('spectrum', 'bot_right')):
+            start_time = time.perf_counter()
+            mask = None
+            if params['type'] is not None:
+                mask = get_filter_mask(self.spectrum_analyzer.shape, params)
+            spectrum_image = self.spectrum_analyzer.get_log_magnitude(transformed, mask)
+            self.central_widget.bot_right_widget.set_image_from_array(spectrum_image)
+            self.spectrum_display_time = now
+            display_time = (time.perf_counter() - start_time) * 1000
+        options_widget.set_status(fft_time, display_time)
 
     def action_slice_tools(self, event):
         """Action performed when an event occurred in the slice tools options widget."""
-        h, v = self.central_widget.options_widget.get_slices_values()
-        aoi_array = get_aoi_array(self.raw_image, self.aoi)
-        x_v = np.linspace(0, aoi_array.shape[1]-1, aoi_array.shape[1])
-        y_v = aoi_array[v-1,:]
-        self.central_widget.top_right_widget.set_data(x_v, y_v,
-                                                      x_label='Line position', y_label='Intensity')
-        self.central_widget.top_right_widget.refresh_chart()
-        x_h = np.linspace(0, aoi_array.shape[0]-1, aoi_array.shape[0])
-        y_h = aoi_array[:,h-1]
-        self.central_widget.bot_right_widget.set_data(x_h, y_h,
-                                                      x_label='Line position', y_label='Intensity')
-        self.central_widget.bot_right_widget.refresh_chart()
-
-        self.central_widget.top_left_widget.set_crosshair(x=h, y=v)
-
+        options_widget = self.central_widget.options_widget
+        h, v = options_widget.get_slices_values()
+        # Profiles through the selected pixel : at the angle (row for 0) and perpendicular
+        params = {'center': (h - 1, v - 1), 'angle': options_widget.get_angle(),
+                  'width': options_widget.get_band_width()}
+        x_v, y_v = self.process_node('profile_row', params)
+        x_h, y_h = self.process_node('profile_column', {**params, 'angle': params['angle'] - 90})
+        if self.pipeline.has_changed('profile_row', 'top_right'):
+            self.central_widget.top_right_widget.set_data(x_v, y_v, x_label='Line position',
+                                                          y_label='Intensity')
+            self.central_widget.top_right_widget.refresh_chart()
+        if self.pipeline.has_changed('profile_column', 'bot_right'):
+            self.central_widget.bot_right_widget.set_data(x_h, y_h, x_label='Line position',
+                                                          y_label='Intensity')
+            self.central_widget.bot_right_widget.refresh_chart()
+
+        shape = self.pipeline.get('aoi_raw').shape
+        segments = [get_line_through(shape, params['center'], params['angle']) +
+                    (params['width'], (0, 255, 0)),
+                    get_line_through(shape, params['center'], params['angle'] - 90) +
+                    (params['width'], (255, 0, 0))]
+        self.central_widget.top_left_widget.set_segments(segments)
+
+    def action_mtf_tools(self, event):
+        """Action performed when an event occurred in the MTF options widget."""
+        start_time = time.perf_counter()
+        options_widget = self.central_widget.options_widget
+        result = self.process_node('mtf', options_widget.get_params())
+        if self.pipeline.has_changed('mtf', 'top_right'):
+            output_image = draw_edge(self.pipeline.get('aoi'), result)
+            self.central_widget.top_right_widget.set_image_from_array(output_image)
+            self.central_widget.bot_right_widget.set_mtf(result)
+            options_widget.set_results(result, (time.perf_counter() - start_time) * 1000)
+
+    def action_focus_tools(self, event):
+        """Action performed when an event occurred in the focus options widget."""
+        options_widget = self.central_widget.options_widget
+        if event in ('focus', 'reset'):
+            # New metric : values are not comparable with the previous ones
+            self.focus_meter.reset()
+        start_time = time.perf_counter()
+        self.process_node('focus', options_widget.get_params())
+        processing_time = (time.perf_counter() - start_time) * 1000
+        meter = self.focus_meter
+        if meter.value is None:
+            # Reset on the same frame : the trace restarts with the next frame
+            self.central_widget.top_right_widget.set_trace([], [])
+            return
+        if self.pipeline.has_changed('focus', 'top_right') or event is not None:
+            self.central_widget.top_right_widget.set_trace(meter.trace.get_time_axis(),
+                                                           meter.trace.get_data(), meter.peak)
+            stride = get_grid_stride(self.pipeline.get('aoi_raw').shape)
+            options_widget.set_status(meter.value, meter.peak, meter.get_peak_ratio(), stride,
+                                      processing_time)
+
+    def action_drift_tools(self, event):
+        """Action performed when an event occurred in the drift options widget."""
+        monitor = self.drift_monitor
+        if event == 'reference':
+            monitor.request_reset()
+        # Frames are registered in the camera thread : display only for new samples
+        counter = monitor.shifts.get_counter()
+        if counter == self.drift_counter and event is None:
+            return
+        self.drift_counter = counter
+        self.central_widget.top_right_widget.set_curves(*monitor.get_history())
+        self.central_widget.bot_right_widget.set_curves(*monitor.get_spectrum())
+        self.central_widget.options_widget.set_status(monitor.last, monitor.get_statistics(),
+                                                      monitor.processing_time)
+
+    def action_edge_gradient(self, event):
+        """Action performed when an event occurred in the gradient options widget."""
+        start_time = time.perf_counter()
+        options_widget = self.central_widget.options_widget
+        params = {'operator': options_widget.get_operator(),
+                  'kernel_size': options_widget.get_kernel_size()}
+        magnitude, angle = self.process_node('edge_gradient', params)
+        # Display only updated for a new gradient or a new display option
+        if self.pipeline.has_changed('edge_gradient', 'top_right') or event is not None:
+            if options_widget.get_display() == 'orientation':
+                output_image = gradient_to_image(magnitude, angle)
+            else:
+                output_image = gradient_to_image(magnitude)
+            self.central_widget.top_right_widget.set_image_from_array(output_image)
+        if self.pipeline.has_changed('edge_gradient', 'bot_right'):
+            self.central_widget.bot_right_widget.set_image(gradient_to_image(magnitude),
+                                                           fast_mode=True)
+        options_widget.set_status((time.perf_counter() - start_time) * 1000)
+
+    def action_edge_canny(self, event):
+        """Action performed when an event occurred in the Canny options widget."""
+        start_time = time.perf_counter()
+        options_widget = self.central_widget.options_widget
+        if options_widget.get_auto():
+            # Median of the AOI from its histogram, computed once per frame
+            low, high = get_canny_thresholds(self.process_node('histogram'))
+            options_widget.set_thresholds(low, high)
+        else:
+            low, high = options_widget.get_thresholds()
+        edges = self.process_node('canny', {'low': low, 'high': high})
+        # Sparse overlay : only the edge pixels are drawn over the AOI
+        points = get_edge_points(edges)
+        output_image = draw_points(self.pipeline.get('aoi'), points)
+        self.central_widget.top_right_widget.set_image_from_array(output_image)
+        # Histogram of the AOI only displayed for a new frame or a new AOI
+        if self.pipeline.has_changed('aoi', 'bot_right'):
+            self.central_widget.bot_right_widget.set_image(self.pipeline.get('aoi'),
+                                                           fast_mode=True)
+        else:
+            clear_v_lines(self.central_widget.bot_right_widget)
+        self.central_widget.bot_right_widget.set_v_line(low)
+        self.central_widget.bot_right_widget.set_v_line(high, 'b')
+        options_widget.set_status(len(points), (time.perf_counter() - start_time) * 1000)
+
+    def action_segment_watershed(self, event):
+        """Action performed when an event occurred in the watershed options widget."""
+        if event == 'reset_latency':
+            self.watershed_latency.reset()
+        start_time = time.perf_counter()
+        options_widget = self.central_widget.options_widget
+        labels, nb_regions = self.process_node('watershed', options_widget.get_params())
+        statistics = self.process_node('regions')
+        if self.pipeline.has_changed('watershed', 'top_right'):
+            output_image = draw_regions(self.pipeline.get('aoi'), labels)
+            self.central_widget.top_right_widget.set_image_from_array(output_image)
+            options_widget.set_regions(statistics)
+            self.central_widget.bot_right_widget.set_statistics(statistics)
+            # Only the frames really processed are taken into account
+            self.watershed_latency.add((time.perf_counter() - start_time) * 1000, labels.size)
+        period = self.frame_timing.get_statistics().get('median')
+        options_widget.set_latency(self.watershed_latency.get_statistics(period))
+
+    def action_detect_corners(self, event):
+        """Action performed when an event occurred in the corners options widget."""
+        if event == 'corners':
+            # New parameters : full detection
+            self.corner_tracker.reset()
+        start_time = time.perf_counter()
+        corners = self.process_node('corners', self.central_widget.options_widget.get_params())
+        if self.pipeline.has_changed('corners', 'top_right'):
+            output_image = draw_corners(self.pipeline.get('aoi'), corners)
+            self.central_widget.top_right_widget.set_image_from_array(output_image)
+            self.central_widget.options_widget.set_status(len(corners), self.corner_tracker.tracked,
+                                                          (time.perf_counter() - start_time) * 1000)
+
+    def action_detect_template(self, event):
+        """Action performed when an event occurred in the template matching options widget."""
+        options_widget = self.central_widget.options_widget
+        matcher = self.template_matcher
+        try:
+            if event == 'teach':
+                matcher.teach(self.process_node('aoi').copy(), options_widget.get_angle_range())
+            elif event == 'rotation' and matcher.template is not None:
+                matcher.teach(matcher.template, options_widget.get_angle_range())
+        except ValueError:
+            # Uniform AOI (dark or saturated frame) : any position would match
+            options_widget.set_message('label_template_uniform')
+            return
+        if event in ('teach', 'rotation'):
+            self.template_latency.reset()
+        if matcher.template is None:
+            return
+        if event is not None:
+            self.central_widget.bot_right_widget.set_image_from_array(matcher.template)
+        start_time = time.perf_counter()
+        frame = self.process_node('frame_8bits', {})
+        # The node is computed again for a new template
+        match = self.process_node('template', {**options_widget.get_params(),
+                                               'teach_id': matcher.teach_id})
+        if self.pipeline.has_changed('template', 'top_right'):
+            self.template_latency.add((time.perf_counter() - start_time) * 1000, frame.size)
+            self.central_widget.top_right_widget.set_image_from_array(draw_match(frame, match))
+            period = self.frame_timing.get_statistics().get('median')
+            options_widget.set_status(match, self.template_latency.get_statistics(period), period)
+
+    def action_segment_particles(self, event):
+        """Action performed when an event occurred in the particles options widget."""
+        options_widget = self.central_widget.options_widget
+        if event == 'particles':
+            # New parameters : new tracks
+            self.particle_tracker.reset()
+        elif event == 'record':
+            if self.particles_sink is None:
+                directory = Path(self.saved_dir) if self.saved_dir else Path.home()
+                file_name = f'particles_{time.strftime("%Y%m%d_%H%M%S")}.csv'
+                try:
+                    self.particles_sink = CsvSink(str(directory / file_name))
+                    options_widget.set_recording(self.particles_sink.file_path)
+                except OSError as error:
+                    options_widget.set_record_error(str(error))
+            else:
+                self.close_particles_sink()
+                options_widget.set_recording(None)
+        start_time = time.perf_counter()
+        self.process_node('threshold', options_widget.get_threshold_params())
+        particles = self.process_node('particles', options_widget.get_params())
+        if self.pipeline.has_changed('particles', 'top_right'):
+            centroids = np.column_stack((particles['centroid_x'], particles['centroid_y']))
+            output_image = draw_corners(self.pipeline.get('aoi'), centroids)
+            self.central_widget.top_right_widget.set_image_from_array(output_image)
+            self.central_widget.bot_right_widget.set_statistics(particles)
+            nb_rows = None
+            if self.particles_sink is not None:
+                # Each frame is written only once
+                if self.particles_frame_id != self.frame_id:
+                    self.particles_sink.write(self.frame_id, time.time(), particles)
+                    self.particles_frame_id = self.frame_id
+                nb_rows = self.particles_sink.nb_rows
+            options_widget.set_status(len(particles['area']),
+                                      (time.perf_counter() - start_time) * 1000, nb_rows)
+
+    def close_particles_sink(self):
+        """Stop the recording of the particle analysis."""
+        if self.particles_sink is not None:
+            self.particles_sink.close()
+            self.particles_sink = None
+            self.particles_frame_id = None
+
+    def action_camera_settings_changed(self, event):
+        """Action performed when a camera parameter changed in the camera settings widget."""
+        if event == 'camera_settings_changed':
+            self.camera_exposure_time = self.central_widget.bot_right_widget.slider_exposure_time.get_value()
+            self.settle_tracker.arm(self.camera_exposure_time)
+            self.auto_exposure.set_exposure(self.camera_exposure_time)
+        else:
+            self.settle_tracker.arm()
+        # The frame averager must not mix frames with different settings
+        self.frame_averager.reset()
+
+    def action_frame_average(self, event):
+        """Action performed when an event occurred in the frame averaging options widget."""
+        self.frame_averager.set_mode(self.central_widget.options_widget.get_mode())
+        self.frame_averager.set_nb_frames(self.central_widget.options_widget.get_nb_frames())
+        self.frame_averager.set_alpha(self.central_widget.options_widget.get_alpha())
+
+    def action_auto_exposure(self, event):
+        """Action performed when an event occurred in the auto-exposure options widget."""
+        options_widget = self.central_widget.options_widget
+        self.auto_exposure.set_metric(options_widget.get_metric())
+        self.auto_exposure.set_target(options_widget.get_target())
+        self.auto_exposure.percentile = options_widget.get_percentile()
+        if options_widget.get_enabled() != self.auto_exposure.enabled:
+            self.auto_exposure.set_enabled(options_widget.get_enabled())
+
+    def action_exposure_applied(self, exposure: float):
+        """Action performed when the auto-exposure wrote a new exposure time to the camera."""
+        self.camera_exposure_time = exposure
+        self.settle_tracker.arm(exposure)
+        self.frame_averager.reset()
+        if isinstance(self.central_widget.bot_right_widget, CameraSettingsWidget):
+            self.central_widget.bot_right_widget.display_exposure(exposure)
+
+    def action_camera_error(self, message: str):
+        """Action performed when a frame failed in the camera thread (acquisition goes on)."""
+        print(f'Camera thread - Frame {self.frame_id} - {message}')
+
+    def action_frame_timing(self, event):
+        """Action performed when an event occurred in the frame timing options widget."""
+        if event == 'reset':
+            self.frame_timing.reset()
+        self.central_widget.options_widget.set_statistics(self.frame_timing.get_statistics())
+        self.central_widget.options_widget.set_drops(self.frame_timing.get_drops())
+        self.central_widget.top_right_widget.update_intervals(self.frame_timing)
+        self.central_widget.bot_right_widget.update_histogram(self.frame_timing)
 
     def resizeEvent(self, event):
         """
@@ -738,6 +1335,8 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             print('Closing App')
+            self.tiling.shutdown()
+            self.close_particles_sink()
             if self.camera is not None:
                 print('With camera')
                 if self.brand_camera == 'IDS':
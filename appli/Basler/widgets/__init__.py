@@ -1,7 +1,17 @@
 __all__ = [
     "aoi_select_widget",
     "camera",
+    "camera_thread",
+    "detection_widget",
+    "drift_widget",
+    "edge_widget",
+    "focus_widget",
+    "frequency_widget",
     "histo_widget",
     "images_widget",
+    "mtf_widget",
+    "options_widget",
     "quant_samp_widget",
+    "segmentation_widget",
+    "timing_widget",
 ]
\ No newline at end of file
@@ -280,6 +280,15 @@ class CameraSettingsWidget(QWidget):
         bl = 10 # self.camera.get_black_level()
         self.slider_black_level.set_value(bl)
 
+    def display_exposure(self, exposure_time: float) -> None:
+        """Display an exposure time set by the application, without writing it to the camera.
+
+        :param exposure_time: Exposure time in microseconds.
+        """
+        self.slider_exposure_time.slider.blockSignals(True)
+        self.slider_exposure_time.set_value(exposure_time)
+        self.slider_exposure_time.slider.blockSignals(False)
+
 
 class CameraInfosWidget(QWidget):
     def __init__(self, parent = None):
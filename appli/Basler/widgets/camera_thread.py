@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""*camera_thread.py* file.
+
+This file contains a camera thread that sends each frame with its metadata
+(frame number, timestamp of the camera, reception time on the computer).
+
+For Basler cameras, images are grabbed continuously by pylon (one by one strategy)
+and the frame number (BlockID) and the timestamp of the camera are read from the
+grab result. If the camera supports chunks, the exposure time of each frame is also
+sent by the camera (chunk ExposureTime) : the frames acquired with the old value after
+a change are detected without a fixed settle count (see processing.scheduler). Gaps in the frame numbers are frames dropped by the camera or the
+USB link. For the other cameras, images are collected with camera.get_image().
+
+All the frames are sent to the timing analyzer. A frame is sent to the GUI only
+when the previous one was processed (see frame_processed) and at the display rate,
+so the Qt event queue never grows when processing is slower than the camera.
+
+The auto-exposure controller and the drift monitor also run in this thread, on all
+the frames.
+
+Errors are handled frame by frame (grab timeout, exception of an analyzer) : the
+grab result is always released, the error is sent to the GUI and the acquisition
+goes on. The thread only stops after MAX_CONSECUTIVE_ERRORS failed grabs in a row
+(camera disconnected).
+Exposure times are written to the camera between 2 frames : if several values
+are requested during a frame, only the last one is written (coalesced writes).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import time
+import numpy as np
+from PyQt6.QtCore import pyqtSignal
+from pypylon import pylon
+from lensecam.camera_thread import CameraThread
+from processing.frame_timing import FrameTimingAnalyzer, get_frame_metadata
+from processing.auto_exposure import AutoExposureController
+from processing.drift import DriftMonitor
+
+# Minimum interval between 2 frames sent to the GUI, in s
+DISPLAY_INTERVAL = 0.05
+# Number of failed grabs in a row before the thread stops
+MAX_CONSECUTIVE_ERRORS = 10
+
+
+class FrameCameraThread(CameraThread):
+    """
+    Camera thread sending the frames and their metadata.
+    """
+
+    frame_acquired = pyqtSignal(np.ndarray, dict)
+    exposure_changed = pyqtSignal(float)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, analyzer: FrameTimingAnalyzer = None,
+                 auto_exposure: AutoExposureController = None,
+                 drift_monitor: DriftMonitor = None):
+        """
+        Default Constructor.
+        :param analyzer: Timing analyzer fed with all the frames. Default None.
+        :param auto_exposure: Auto-exposure controller fed with all the frames. Default None.
+        :param drift_monitor: Drift monitor fed with all the frames. Default None.
+        """
+        super().__init__()
+        self.analyzer = analyzer
+        self.auto_exposure = auto_exposure
+        self.drift_monitor = drift_monitor
+        self.__busy = False
+        self.__last_display = 0
+        self.__pending_exposure = None
+
+    def request_exposure(self, exposure: float):
+        """
+        Request a new exposure time, written to the camera before the next frame.
+        :param exposure: Exposure time in microseconds.
+        """
+        self.__pending_exposure = exposure
+
+    def __apply_settings(self):
+        """Write the last requested exposure time to the camera."""
+        exposure, self.__pending_exposure = self.__pending_exposure, None
+        if exposure is not None:
+            self.camera.set_exposure(exposure)
+            self.exposure_changed.emit(exposure)
+
+    def frame_processed(self):
+        """Declare that the GUI processed the last frame."""
+        self.__busy = False
+
+    def stop(self, timeout: bool = True):
+        """
+        Stop thread linked to the camera, even if the acquisition was already stopped.
+        :param timeout: True to wait for the end of the thread.
+        """
+        self.running = False
+        if timeout and self.isRunning():
+            self.wait(5000)
+        if self.camera is not None:
+            self.camera.stop_acquisition()
+            self.camera.free_memory()
+
+    def run(self):
+        """Collect frames from the camera and send them to the GUI."""
+        try:
+            if self.camera.camera_acquiring is False:
+                self.camera.alloc_memory()
+                self.camera.start_acquisition()
+                self.running = True
+            self.__busy = False
+            device = getattr(self.camera, 'camera_device', None)
+            if hasattr(device, 'StartGrabbing'):
+                self.__run_pylon(device)
+            else:
+                self.__run_generic()
+        except Exception as e:
+            print(f'Thread Running - Exception - {e}')
+        self.stopping = False
+
+    def __run_pylon(self, device):
+        """Continuous grabbing with pylon - frame number and timestamp of the camera."""
+        if not device.IsOpen():
+            device.Open()
+        if device.IsGrabbing():
+            device.StopGrabbing()
+        chunk_exposure = self.__enable_chunk_exposure(device)
+        device.StartGrabbing(pylon.GrabStrategy_OneByOne)
+        nb_errors = 0
+        try:
+            while self.running:
+                grab_result = None
+                try:
+                    grab_result = device.RetrieveResult(3000, pylon.TimeoutHandling_ThrowException)
+                    if grab_result.GrabSucceeded():
+                        exposure = None
+                        if chunk_exposure:
+                            exposure = float(grab_result.ChunkExposureTime.Value)
+                        metadata = get_frame_metadata(int(grab_result.BlockID),
+                                                      int(grab_result.TimeStamp), exposure)
+                        self.__send_frame(grab_result.Array, metadata)
+                    self.__apply_settings()
+                    nb_errors = 0
+                except Exception as e:
+                    nb_errors = self.__report_error(e, nb_errors)
+                finally:
+                    if grab_result is not None:
+                        grab_result.Release()
+                self.stopping = False
+        finally:
+            device.StopGrabbing()
+
+    def __enable_chunk_exposure(self, device) -> bool:
+        """
+        Send the exposure time with each frame (chunk ExposureTime), before the grabbing.
+        :param device: Pylon camera.
+        :return: True if the camera supports the chunk.
+        """
+        try:
+            device.ChunkModeActive.Value = True
+            device.ChunkSelector.Value = 'ExposureTime'
+            device.ChunkEnable.Value = True
+            return True
+        except Exception as e:
+            # Chunks not available : settle count only
+            print(f'Chunk ExposureTime not available - {e}')
+            return False
+
+    def __run_generic(self):
+        """Single frame acquisition - only the reception time is available."""
+        nb_errors = 0
+        while self.running:
+            try:
+                image_array = self.camera.get_image()
+                self.__send_frame(image_array, get_frame_metadata())
+                self.__apply_settings()
+                nb_errors = 0
+            except Exception as e:
+                nb_errors = self.__report_error(e, nb_errors)
+            time.sleep(DISPLAY_INTERVAL)
+            self.stopping = False
+
+    def __report_error(self, error: Exception, nb_errors: int) -> int:
+        """
+        Send an error of a frame to the GUI.
+        :param error: Exception raised by the grab or the processing of a frame.
+        :param nb_errors: Number of failed frames in a row, before this one.
+        :return: Number of failed frames in a row.
+        :raise Exception: The error, after MAX_CONSECUTIVE_ERRORS failed frames in a row.
+        """
+        nb_errors += 1
+        self.error_occurred.emit(f'{type(error).__name__} - {error}')
+        if nb_errors >= MAX_CONSECUTIVE_ERRORS:
+            raise error
+        return nb_errors
+
+    def __send_frame(self, image_array: np.ndarray, metadata: dict):
+        """Send a frame to the analyzers and, if the GUI is ready, to the GUI."""
+        try:
+            if self.auto_exposure is not None and image_array is not None:
+                exposure = self.auto_exposure.update(image_array)
+                if exposure is not None:
+                    self.request_exposure(exposure)
+            if self.drift_monitor is not None and image_array is not None:
+                self.drift_monitor.update(image_array, metadata)
+        except Exception as e:
+            # An analyzer error must not stop the stream
+            self.error_occurred.emit(f'{type(e).__name__} - {e}')
+        displayed = (not self.__busy and
+                     metadata['host_time'] - self.__last_display >= DISPLAY_INTERVAL)
+        if self.analyzer is not None:
+            self.analyzer.add_frame(metadata, displayed)
+        if displayed:
+            self.__busy = True
+            self.__last_display = metadata['host_time']
+            self.frame_acquired.emit(image_array, metadata)
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""*detection_widget.py* file.
+
+This file contains graphical elements to set the options of the detection menu
+(Harris / Shi-Tomasi corners, template matching).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_combobox import *
+from lensepy.pyqt6.widget_slider import *
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QPushButton, QMainWindow
+)
+from PyQt6.QtCore import pyqtSignal
+
+
+class CornersOptionsWidget(QWidget):
+    """
+    Options widget of the corner detection menu.
+    """
+
+    corners_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_corners = QLabel(translate('title_corners'))
+        self.label_title_corners.setStyleSheet(styleH1)
+
+        # Detector
+        # --------
+        self.methods = ['harris', 'shi_tomasi']
+        self.method_choice = ButtonSelectionWidget(parent=self,
+                                                   name=translate('label_corners_method'))
+        self.method_choice.set_list_options([translate('corners_harris'),
+                                             translate('corners_shi_tomasi')])
+        self.method_choice.activate_index(1)
+        self.method_choice.clicked.connect(self.action_options_changed)
+
+        self.slider_max_corners = SliderBloc(translate('slider_corners_max'), unit='',
+                                             min_value=10, max_value=1000, integer=True)
+        self.slider_max_corners.set_value(100)
+        self.slider_max_corners.slider_changed.connect(self.action_options_changed)
+
+        self.slider_min_distance = SliderBloc(translate('slider_corners_distance'), unit='px',
+                                              min_value=1, max_value=50, integer=True)
+        self.slider_min_distance.set_value(10)
+        self.slider_min_distance.slider_changed.connect(self.action_options_changed)
+
+        self.slider_quality = SliderBloc(translate('slider_corners_quality'), unit='%',
+                                         min_value=1, max_value=50, integer=True)
+        self.slider_quality.set_value(5)
+        self.slider_quality.slider_changed.connect(self.action_options_changed)
+
+        # Sub-pixel refinement and tracking
+        # ---------------------------------
+        self.subpix_choice = ButtonSelectionWidget(parent=self,
+                                                   name=translate('label_corners_subpix'))
+        self.subpix_choice.set_list_options([translate('corners_off'), translate('corners_on')])
+        self.subpix_choice.activate_index(2)
+        self.subpix_choice.clicked.connect(self.action_options_changed)
+
+        self.track_choice = ButtonSelectionWidget(parent=self,
+                                                  name=translate('label_corners_track'))
+        self.track_choice.set_list_options([translate('corners_off'), translate('corners_on')])
+        self.track_choice.activate_index(1)
+        self.track_choice.clicked.connect(self.action_options_changed)
+
+        self.label_status = QLabel('')
+        self.label_status.setStyleSheet(styleH3)
+
+        self.layout.addWidget(self.label_title_corners)
+        self.layout.addWidget(self.method_choice)
+        self.layout.addWidget(self.slider_max_corners)
+        self.layout.addWidget(self.slider_min_distance)
+        self.layout.addWidget(self.slider_quality)
+        self.layout.addWidget(self.subpix_choice)
+        self.layout.addWidget(self.track_choice)
+        self.layout.addWidget(self.label_status)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        self.corners_changed.emit('corners')
+
+    def get_params(self) -> dict:
+        """Return the parameters of the detector (see processing.corners)."""
+        index = self.method_choice.get_selection_index()
+        return {'method': self.methods[index] if index is not None and index >= 0 else 'harris',
+                'max_corners': int(self.slider_max_corners.get_value()),
+                'min_distance': int(self.slider_min_distance.get_value()),
+                'quality': self.slider_quality.get_value() / 100,
+                'subpix': self.subpix_choice.get_selection_index() == 1,
+                'track': self.track_choice.get_selection_index() == 1}
+
+    def set_status(self, nb_corners: int, tracked: bool, processing_time: float):
+        """
+        Display the number of corners and the processing time.
+        :param nb_corners: Number of corners.
+        :param tracked: True if the corners were tracked from the previous frame.
+        :param processing_time: Processing time in ms.
+        """
+        mode = translate('corners_tracked') if tracked else translate('corners_detected')
+        self.label_status.setText(f'{nb_corners} {mode} / {processing_time:.1f} ms')
+
+
+class TemplateOptionsWidget(QWidget):
+    """
+    Options widget of the template matching menu (teach and find).
+    """
+
+    template_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_template = QLabel(translate('title_template'))
+        self.label_title_template.setStyleSheet(styleH1)
+
+        # Teach : the template is the AOI
+        # -------------------------------
+        self.teach_button = QPushButton(translate('button_template_teach'))
+        self.teach_button.setStyleSheet(unactived_button)
+        self.teach_button.setFixedHeight(BUTTON_HEIGHT)
+        self.teach_button.clicked.connect(self.action_teach)
+
+        self.angle_ranges = [0, 15, 45]
+        self.rotation_choice = ButtonSelectionWidget(parent=self,
+                                                     name=translate('label_template_rotation'))
+        self.rotation_choice.set_list_options([translate('corners_off'), '± 15°', '± 45°'])
+        self.rotation_choice.activate_index(1)
+        self.rotation_choice.clicked.connect(self.action_rotation_changed)
+
+        # Find
+        # ----
+        self.slider_min_score = SliderBloc(translate('slider_template_min_score'), unit='%',
+                                           min_value=10, max_value=100, integer=True)
+        self.slider_min_score.set_value(60)
+        self.slider_min_score.slider_changed.connect(self.action_options_changed)
+
+        self.track_choice = ButtonSelectionWidget(parent=self,
+                                                  name=translate('label_corners_track'))
+        self.track_choice.set_list_options([translate('corners_off'), translate('corners_on')])
+        self.track_choice.activate_index(2)
+        self.track_choice.clicked.connect(self.action_options_changed)
+
+        self.label_match = QLabel(translate('label_template_not_taught'))
+        self.label_match.setStyleSheet(styleH3)
+        self.label_latency = QLabel('')
+
+        self.layout.addWidget(self.label_title_template)
+        self.layout.addWidget(self.teach_button)
+        self.layout.addWidget(self.rotation_choice)
+        self.layout.addWidget(self.slider_min_score)
+        self.layout.addWidget(self.track_choice)
+        self.layout.addWidget(self.label_match)
+        self.layout.addWidget(self.label_latency)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def action_teach(self, event):
+        """Action performed when the teach button is clicked."""
+        self.template_changed.emit('teach')
+
+    def action_rotation_changed(self, event):
+        """Action performed when the rotation range changed (templates to rotate again)."""
+        self.template_changed.emit('rotation')
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        self.template_changed.emit('template')
+
+    def get_angle_range(self) -> float:
+        """Return the maximum rotation of the pattern in degrees."""
+        index = self.rotation_choice.get_selection_index()
+        return self.angle_ranges[index] if index is not None and index >= 0 else 0
+
+    def get_params(self) -> dict:
+        """Return the parameters of the search (see processing.matching)."""
+        return {'min_score': self.slider_min_score.get_value() / 100,
+                'track': self.track_choice.get_selection_index() == 1}
+
+    def set_message(self, key: str):
+        """
+        Display a message instead of the result of the search.
+        :param key: Key of the message in the dictionary.
+        """
+        self.label_match.setText(translate(key))
+        self.label_latency.setText('')
+
+    def set_status(self, match: dict, latency: dict, period: float = None):
+        """
+        Display the position of the pattern and the processing time.
+        :param match: Result of the search (see processing.matching), or None.
+        :param latency: Statistics of the processing times (see processing.frame_timing).
+        :param period: Period of the stream in ms. Default None.
+        """
+        if match is None:
+            self.label_match.setText(translate('template_not_found'))
+        else:
+            state = translate('template_found' if match['found'] else 'template_not_found')
+            if match['tracked']:
+                state += f" ({translate('template_tracked')})"
+            self.label_match.setText(f"{state}\n"
+                                     f"X = {match['x']:.2f} / Y = {match['y']:.2f} px\n"
+                                     f"{translate('template_score')} : {match['score']:.3f}\n"
+                                     f"{translate('template_angle')} : {match['angle']:.1f}°")
+        if latency.get('nb_frames', 0) == 0:
+            self.label_latency.setText('')
+            return
+        text = f"{latency['last']:.1f} ms (p95 = {latency['p95']:.1f} ms)"
+        if period is not None:
+            text += f"\n{translate('template_frame_period')} : {period:.1f} ms"
+        self.label_latency.setText(text)
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = CornersOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
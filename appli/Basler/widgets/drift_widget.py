@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""*drift_widget.py* file.
+
+This file contains graphical elements to display the drift and the vibrations of a
+setup (shifts of the AOI relative to a reference frame, trace and spectrum).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_xy_chart import XYChartWidget
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QPushButton, QMainWindow
+)
+from PyQt6.QtCore import pyqtSignal
+from pyqtgraph import mkPen
+
+
+class DriftOptionsWidget(QWidget):
+    """
+    Options widget of the drift menu.
+    """
+
+    drift_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_drift = QLabel(translate('title_drift'))
+        self.label_title_drift.setStyleSheet(styleH1)
+        self.label_info = QLabel(translate('label_drift_info'))
+        self.label_info.setWordWrap(True)
+
+        # Reference
+        # ---------
+        self.reference_button = QPushButton(translate('button_drift_reference'))
+        self.reference_button.setStyleSheet(unactived_button)
+        self.reference_button.setFixedHeight(BUTTON_HEIGHT)
+        self.reference_button.clicked.connect(self.action_reference)
+
+        # Results
+        # -------
+        self.label_shift = QLabel('')
+        self.label_shift.setStyleSheet(styleH2)
+        self.label_rms = QLabel('')
+        self.label_rms.setStyleSheet(styleH3)
+        self.label_peak_to_peak = QLabel('')
+        self.label_peak_to_peak.setStyleSheet(styleH3)
+        self.label_status = QLabel('')
+
+        self.layout.addWidget(self.label_title_drift)
+        self.layout.addWidget(self.label_info)
+        self.layout.addWidget(self.reference_button)
+        self.layout.addWidget(self.label_shift)
+        self.layout.addWidget(self.label_rms)
+        self.layout.addWidget(self.label_peak_to_peak)
+        self.layout.addWidget(self.label_status)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def action_reference(self, event):
+        """Action performed when the reference button is clicked."""
+        self.drift_changed.emit('reference')
+
+    def set_status(self, last: tuple, statistics: dict, processing_time: float):
+        """
+        Display the shifts.
+        :param last: Last sample (dx, dy, response), or None.
+        :param statistics: Statistics of the last samples (see DriftMonitor.get_statistics),
+            or None.
+        :param processing_time: Registration time of a frame in ms.
+        """
+        if last is None or statistics is None:
+            self.label_shift.setText(translate('drift_waiting'))
+            self.label_rms.setText('')
+            self.label_peak_to_peak.setText('')
+            self.label_status.setText('')
+            return
+        dx, dy, response = last
+        rms, peak_to_peak = statistics['rms'], statistics['peak_to_peak']
+        self.label_shift.setText(f'dx = {dx:.3f} px / dy = {dy:.3f} px')
+        self.label_rms.setText(f"{translate('drift_rms')} : {rms[0]:.3f} / {rms[1]:.3f} px")
+        self.label_peak_to_peak.setText(f"{translate('drift_peak_to_peak')} : "
+                                        f"{peak_to_peak[0]:.3f} / {peak_to_peak[1]:.3f} px")
+        self.label_status.setText(f"{translate('drift_response')} : {response:.2f} / "
+                                  f"{statistics['rate']:.1f} Hz / {statistics['number']} "
+                                  f"{translate('drift_samples')} / {processing_time:.2f} ms")
+
+
+class DriftChartWidget(XYChartWidget):
+    """
+    Chart of the horizontal and vertical shifts (curves updated, not rebuilt).
+    """
+
+    def __init__(self, parent, title: str = '', x_label: str = '', y_label: str = '',
+                 log_mode: bool = False):
+        """
+        Default Constructor.
+        :param parent: Parent widget.
+        :param title: Title of the chart.
+        :param x_label: Label of the X-axis.
+        :param y_label: Label of the Y-axis.
+        :param log_mode: True for a logarithmic Y-axis. Default False.
+        """
+        super().__init__(parent=parent)
+        self.set_title(title)
+        self.set_background('white')
+        plot_widget = self.plot_chart_widget
+        plot_widget.showGrid(x=True, y=True)
+        plot_widget.setLabel('bottom', x_label)
+        plot_widget.setLabel('left', y_label)
+        plot_widget.setLogMode(x=False, y=log_mode)
+        legend = plot_widget.addLegend()
+        self.plot_chart.setPen(mkPen(color=BLUE_IOGS, width=2))
+        legend.addItem(self.plot_chart, 'dx')
+        self.dy_curve = plot_widget.plot(pen=mkPen(color='r', width=2), name='dy')
+        self.setMinimumHeight(200)
+
+    def set_curves(self, x_axis, shifts):
+        """
+        Display the shifts.
+        :param x_axis: Values of the X-axis (times or frequencies).
+        :param shifts: Array (N, 2) of the horizontal and vertical values.
+        """
+        if len(x_axis) == 0:
+            self.plot_chart.setData([], [])
+            self.dy_curve.setData([], [])
+            return
+        self.plot_chart.setData(x_axis, shifts[:, 0])
+        self.dy_curve.setData(x_axis, shifts[:, 1])
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = DriftOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
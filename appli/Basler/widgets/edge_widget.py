@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""*edge_widget.py* file.
+
+This file contains graphical elements to set the options of the edge detection
+menu (gradient with Sobel or Scharr operators, Canny detector).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_combobox import *
+from lensepy.pyqt6.widget_slider import *
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QMainWindow
+)
+from PyQt6.QtCore import pyqtSignal
+
+
+class EdgeGradientOptionsWidget(QWidget):
+    """
+    Options widget of the gradient (Sobel / Scharr) menu.
+    """
+
+    edge_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_edge_gradient = QLabel(translate('title_edge_gradient'))
+        self.label_title_edge_gradient.setStyleSheet(styleH1)
+
+        # Operator, size of the kernel and display
+        # ----------------------------------------
+        self.operators = ['sobel', 'scharr']
+        self.operator_choice = ButtonSelectionWidget(parent=self,
+                                                     name=translate('label_edge_operator'))
+        self.operator_choice.set_list_options([translate('edge_sobel'),
+                                               translate('edge_scharr')])
+        self.operator_choice.activate_index(1)
+        self.operator_choice.clicked.connect(self.action_options_changed)
+
+        self.kernel_sizes = [3, 5, 7]
+        self.size_choice = ButtonSelectionWidget(parent=self,
+                                                 name=translate('label_edge_kernel_size'))
+        self.size_choice.set_list_options([str(size) for size in self.kernel_sizes])
+        self.size_choice.activate_index(1)
+        self.size_choice.clicked.connect(self.action_options_changed)
+
+        self.displays = ['magnitude', 'orientation']
+        self.display_choice = ButtonSelectionWidget(parent=self,
+                                                    name=translate('label_edge_display'))
+        self.display_choice.set_list_options([translate('edge_magnitude'),
+                                              translate('edge_orientation')])
+        self.display_choice.activate_index(1)
+        self.display_choice.clicked.connect(self.action_options_changed)
+
+        self.label_status = QLabel('')
+        self.label_status.setStyleSheet(styleH3)
+
+        self.layout.addWidget(self.label_title_edge_gradient)
+        self.layout.addWidget(self.operator_choice)
+        self.layout.addWidget(self.size_choice)
+        self.layout.addWidget(self.display_choice)
+        self.layout.addWidget(self.label_status)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        # The Scharr kernel is always 3x3
+        self.size_choice.setEnabled(self.get_operator() == 'sobel')
+        self.edge_changed.emit('edge_gradient')
+
+    def set_status(self, processing_time: float):
+        """
+        Display the processing time of the gradient.
+        :param processing_time: Processing time in ms.
+        """
+        self.label_status.setText(f'{processing_time:.1f} ms')
+
+    def get_operator(self) -> str:
+        """Return the selected operator ('sobel' or 'scharr')."""
+        index = self.operator_choice.get_selection_index()
+        if index is None or index < 0:
+            return 'sobel'
+        return self.operators[index]
+
+    def get_kernel_size(self) -> int:
+        """Return the size of the Sobel kernel."""
+        index = self.size_choice.get_selection_index()
+        if index is None or index < 0:
+            return 3
+        return self.kernel_sizes[index]
+
+    def get_display(self) -> str:
+        """Return the displayed result ('magnitude' or 'orientation')."""
+        index = self.display_choice.get_selection_index()
+        if index is None or index < 0:
+            return 'magnitude'
+        return self.displays[index]
+
+
+class CannyOptionsWidget(QWidget):
+    """
+    Options widget of the Canny detector menu.
+    """
+
+    edge_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_edge_canny = QLabel(translate('title_edge_canny'))
+        self.label_title_edge_canny.setStyleSheet(styleH1)
+
+        # Thresholds (automatic from the histogram, or manual)
+        # ----------------------------------------------------
+        self.thresholds_choice = ButtonSelectionWidget(parent=self,
+                                                       name=translate('label_canny_thresholds'))
+        self.thresholds_choice.set_list_options([translate('canny_thresholds_auto'),
+                                                 translate('canny_thresholds_manual')])
+        self.thresholds_choice.activate_index(1)
+        self.thresholds_choice.clicked.connect(self.action_options_changed)
+
+        self.slider_low = SliderBloc(translate('slider_canny_low'), unit='',
+                                     min_value=0, max_value=255, integer=True)
+        self.slider_low.set_value(50)
+        self.slider_low.slider_changed.connect(self.action_options_changed)
+
+        self.slider_high = SliderBloc(translate('slider_canny_high'), unit='',
+                                      min_value=0, max_value=255, integer=True)
+        self.slider_high.set_value(150)
+        self.slider_high.slider_changed.connect(self.action_options_changed)
+
+        self.label_status = QLabel('')
+        self.label_status.setStyleSheet(styleH3)
+
+        self.layout.addWidget(self.label_title_edge_canny)
+        self.layout.addWidget(self.thresholds_choice)
+        self.layout.addWidget(self.slider_low)
+        self.layout.addWidget(self.slider_high)
+        self.layout.addWidget(self.label_status)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+        self.update_sliders()
+
+    def update_sliders(self):
+        """Enable sliders in manual mode."""
+        self.slider_low.set_enabled(not self.get_auto())
+        self.slider_high.set_enabled(not self.get_auto())
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        self.update_sliders()
+        self.edge_changed.emit('edge_canny')
+
+    def set_thresholds(self, low: int, high: int):
+        """
+        Display the thresholds computed from the histogram.
+        :param low: Low threshold of the hysteresis.
+        :param high: High threshold of the hysteresis.
+        """
+        for slider, value in ((self.slider_low, low), (self.slider_high, high)):
+            slider.slider.blockSignals(True)
+            slider.set_value(value)
+            slider.slider.blockSignals(False)
+
+    def set_status(self, nb_points: int, processing_time: float):
+        """
+        Display the number of edge pixels and the processing time.
+        :param nb_points: Number of edge pixels.
+        :param processing_time: Processing time in ms.
+        """
+        self.label_status.setText(f"{nb_points} {translate('edge_points')} / "
+                                  f"{processing_time:.1f} ms")
+
+    def get_auto(self) -> bool:
+        """Return True if the thresholds are computed from the histogram."""
+        return self.thresholds_choice.get_selection_index() != 1
+
+    def get_thresholds(self) -> tuple[int, int]:
+        """Return the low and high thresholds of the hysteresis."""
+        return int(self.slider_low.get_value()), int(self.slider_high.get_value())
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = CannyOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""*focus_widget.py* file.
+
+This file contains graphical elements to display a live focus indicator (metric of
+the sharpness of the AOI, rolling trace and peak-hold value).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_combobox import ButtonSelectionWidget
+from lensepy.pyqt6.widget_xy_chart import XYChartWidget
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QPushButton, QMainWindow
+)
+from PyQt6.QtCore import pyqtSignal
+from pyqtgraph import mkPen, InfiniteLine
+
+
+class FocusOptionsWidget(QWidget):
+    """
+    Options widget of the focus menu.
+    """
+
+    focus_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_focus = QLabel(translate('title_focus'))
+        self.label_title_focus.setStyleSheet(styleH1)
+
+        # Metric
+        # ------
+        self.metrics = ['laplacian', 'tenengrad', 'gradient_energy']
+        self.metric_choice = ButtonSelectionWidget(parent=self, name=translate('label_focus_metric'))
+        self.metric_choice.set_list_options([translate('focus_laplacian'),
+                                             translate('focus_tenengrad'),
+                                             translate('focus_gradient_energy')])
+        self.metric_choice.activate_index(1)
+        self.metric_choice.clicked.connect(self.action_metric_changed)
+
+        # Value and peak-hold
+        # -------------------
+        self.label_value = QLabel('')
+        self.label_value.setStyleSheet(styleH2)
+        self.label_peak = QLabel('')
+        self.label_peak.setStyleSheet(styleH3)
+        self.reset_button = QPushButton(translate('button_reset_focus_peak'))
+        self.reset_button.setStyleSheet(unactived_button)
+        self.reset_button.setFixedHeight(BUTTON_HEIGHT)
+        self.reset_button.clicked.connect(self.action_reset_peak)
+        self.label_status = QLabel('')
+
+        self.layout.addWidget(self.label_title_focus)
+        self.layout.addWidget(self.metric_choice)
+        self.layout.addWidget(self.label_value)
+        self.layout.addWidget(self.label_peak)
+        self.layout.addWidget(self.reset_button)
+        self.layout.addWidget(self.label_status)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def action_metric_changed(self, event):
+        """Action performed when the metric changed."""
+        self.focus_changed.emit('focus')
+
+    def action_reset_peak(self, event):
+        """Action performed when the reset button is clicked."""
+        self.focus_changed.emit('reset')
+
+    def get_params(self) -> dict:
+        """Return the parameters of the focus metric (see processing.focus)."""
+        index = self.metric_choice.get_selection_index()
+        if index is None or index < 0:
+            index = 0
+        return {'metric': self.metrics[index]}
+
+    def set_status(self, value: float, peak: float, ratio: float, stride: int,
+                   processing_time: float):
+        """
+        Display the focus metric.
+        :param value: Last value of the metric.
+        :param peak: Peak-hold value of the metric.
+        :param ratio: Last value relative to the peak-hold value.
+        :param stride: Step of the sparse grid of the metric.
+        :param processing_time: Time of the metric in ms.
+        """
+        ratio_text = '-' if ratio is None else f'{ratio * 100:.1f} %'
+        self.label_value.setText(f"{translate('focus_value')} : {value:.4g} ({ratio_text})")
+        self.label_peak.setText(f"{translate('focus_peak')} : {peak:.4g}")
+        self.label_status.setText(f"{translate('focus_stride')} : {stride} / "
+                                  f"{processing_time:.2f} ms")
+
+
+class FocusChartWidget(XYChartWidget):
+    """
+    Rolling trace of the focus metric, with the peak-hold value (updated, not rebuilt).
+    """
+
+    def __init__(self, parent, title: str = ''):
+        """
+        Default Constructor.
+        :param parent: Parent widget.
+        :param title: Title of the chart.
+        """
+        super().__init__(parent=parent)
+        self.set_title(title)
+        self.set_background('white')
+        plot_widget = self.plot_chart_widget
+        plot_widget.showGrid(x=True, y=True)
+        plot_widget.setLabel('bottom', translate('focus_frames'))
+        plot_widget.setLabel('left', translate('focus_value'))
+        self.plot_chart.setPen(mkPen(color=BLUE_IOGS, width=2))
+        self.peak_line = InfiniteLine(pos=0, angle=0, pen=mkPen(color='r', style=2))
+        plot_widget.addItem(self.peak_line)
+        self.setMinimumHeight(200)
+
+    def set_trace(self, x_axis, values, peak: float = None):
+        """
+        Display the trace of the metric.
+        :param x_axis: Frame numbers.
+        :param values: Values of the metric.
+        :param peak: Peak-hold value. Default None (no line).
+        """
+        self.plot_chart.setData(x_axis, values)
+        self.peak_line.setVisible(peak is not None)
+        if peak is not None:
+            self.peak_line.setValue(peak)
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = FocusOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""*frequency_widget.py* file.
+
+This file contains graphical elements to set the options of the frequency analysis
+(spectrum of the AOI and frequency-domain filters).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_combobox import *
+from lensepy.pyqt6.widget_slider import *
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QMainWindow
+)
+from PyQt6.QtCore import pyqtSignal
+
+
+class FFTOptionsWidget(QWidget):
+    """
+    Options widget of the frequency analysis menu.
+    """
+
+    fft_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_fft = QLabel(translate('title_fft'))
+        self.label_title_fft.setStyleSheet(styleH1)
+
+        # Filter
+        # ------
+        self.filter_types = [None, 'lowpass', 'highpass', 'bandpass', 'notch']
+        self.filter_choice = ButtonSelectionWidget(parent=self, name=translate('label_fft_filter'))
+        self.filter_choice.set_list_options([translate('fft_none'),
+                                             translate('fft_lowpass'),
+                                             translate('fft_highpass'),
+                                             translate('fft_bandpass'),
+                                             translate('fft_notch')])
+        self.filter_choice.activate_index(1)
+        self.filter_choice.clicked.connect(self.action_options_changed)
+
+        # Cutoff frequencies in % of the Nyquist frequency
+        self.slider_low = SliderBloc(translate('slider_fft_low'), unit='%',
+                                     min_value=1, max_value=100, integer=True)
+        self.slider_low.set_value(5)
+        self.slider_low.slider_changed.connect(self.action_options_changed)
+        self.slider_high = SliderBloc(translate('slider_fft_high'), unit='%',
+                                      min_value=1, max_value=100, integer=True)
+        self.slider_high.set_value(30)
+        self.slider_high.slider_changed.connect(self.action_options_changed)
+        self.slider_order = SliderBloc(translate('slider_fft_order'), unit='',
+                                       min_value=1, max_value=10, integer=True)
+        self.slider_order.set_value(2)
+        self.slider_order.slider_changed.connect(self.action_options_changed)
+
+        # Notch : frequency of the periodic noise
+        self.slider_notch_x = SliderBloc(translate('slider_fft_notch_x'), unit='%',
+                                         min_value=0, max_value=100, integer=True)
+        self.slider_notch_x.set_value(50)
+        self.slider_notch_x.slider_changed.connect(self.action_options_changed)
+        self.slider_notch_y = SliderBloc(translate('slider_fft_notch_y'), unit='%',
+                                         min_value=-100, max_value=100, integer=True)
+        self.slider_notch_y.set_value(0)
+        self.slider_notch_y.slider_changed.connect(self.action_options_changed)
+        self.slider_notch_radius = SliderBloc(translate('slider_fft_notch_radius'), unit='%',
+                                              min_value=1, max_value=20, integer=True)
+        self.slider_notch_radius.set_value(2)
+        self.slider_notch_radius.slider_changed.connect(self.action_options_changed)
+
+        self.label_status = QLabel('')
+        self.label_status.setStyleSheet(styleH3)
+
+        self.layout.addWidget(self.label_title_fft)
+        self.layout.addWidget(self.filter_choice)
+        self.layout.addWidget(self.slider_low)
+        self.layout.addWidget(self.slider_high)
+        self.layout.addWidget(self.slider_order)
+        self.layout.addWidget(self.slider_notch_x)
+        self.layout.addWidget(self.slider_notch_y)
+        self.layout.addWidget(self.slider_notch_radius)
+        self.layout.addWidget(self.label_status)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+        self.update_enabled()
+
+    def update_enabled(self):
+        """Enable the sliders of the selected filter only."""
+        filter_type = self.get_params()['type']
+        self.slider_low.set_enabled(filter_type in ('highpass', 'bandpass'))
+        self.slider_high.set_enabled(filter_type in ('lowpass', 'bandpass'))
+        self.slider_order.set_enabled(filter_type is not None)
+        for slider in (self.slider_notch_x, self.slider_notch_y, self.slider_notch_radius):
+            slider.set_enabled(filter_type == 'notch')
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        self.update_enabled()
+        self.fft_changed.emit('fft')
+
+    def get_params(self) -> dict:
+        """Return the parameters of the filter (see processing.frequency)."""
+        index = self.filter_choice.get_selection_index()
+        return {'type': self.filter_types[index] if index is not None and index >= 0 else None,
+                'low': self.slider_low.get_value() / 100,
+                'high': self.slider_high.get_value() / 100,
+                'order': int(self.slider_order.get_value()),
+                'notch_x': self.slider_notch_x.get_value() / 100,
+                'notch_y': self.slider_notch_y.get_value() / 100,
+                'notch_radius': self.slider_notch_radius.get_value() / 100}
+
+    def set_status(self, fft_time: float, display_time: float = None):
+        """
+        Display the processing times.
+        :param fft_time: Time of the FFT and of the filter in ms.
+        :param display_time: Time of the display of the spectrum in ms. Default None
+            (spectrum not updated).
+        """
+        text = f"FFT : {fft_time:.1f} ms"
+        if display_time is not None:
+            text += f"\n{translate('fft_spectrum')} : {display_time:.1f} ms"
+            self.label_status.setText(text)
+        elif '\n' in self.label_status.text():
+            self.label_status.setText(text + '\n' + self.label_status.text().split('\n')[1])
+        else:
+            self.label_status.setText(text)
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = FFTOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
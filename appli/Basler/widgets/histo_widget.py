@@ -20,7 +20,13 @@ from PyQt6.QtWidgets import (
     QMessageBox, QFileDialog
 )
 from PyQt6.QtCore import pyqtSignal, QDir, Qt
+from pyqtgraph import mkPen, InfiniteLine
 from matplotlib import pyplot as plt
+from processing.timeseries import TimeSeriesBuffer
+
+MAX_TIME_POINTS = 100000
+# Number of pixels of the time analysis
+NB_TIME_PIXELS = 4
 
 
 def process_hist_from_array(array: np.ndarray, bins: list) -> (np.ndarray, np.ndarray):
@@ -33,6 +39,16 @@ def process_hist_from_array(array: np.ndarray, bins: list) -> (np.ndarray, np.nd
     plot_hist, plot_bins_data = np.histogram(array, bins=bins)
     return plot_bins_data, plot_hist
 
+def clear_v_lines(histogram_widget):
+    """
+    Remove the vertical lines of a histogram widget (added by set_v_line),
+    to move them without computing the histogram again.
+    :param histogram_widget: ImageHistogramWidget.
+    """
+    plot_item = histogram_widget.plot_chart_widget.getPlotItem()
+    for item in [item for item in plot_item.items if isinstance(item, InfiniteLine)]:
+        plot_item.removeItem(item)
+
 def save_hist(data: np.ndarray, data_hist: np.ndarray, bins: np.ndarray,
               title: str = 'Image Histogram', file_name: str = 'histogram.png',
               informations: str = '', dir_path: str = '',
@@ -112,12 +128,12 @@ def save_hist(data: np.ndarray, data_hist: np.ndarray, bins: np.ndarray,
         warn = QMessageBox.warning(None, 'Saving Error', 'No file saved !')
 
 def rand_pixels(aoi: list) -> (list, list):
-    """Selection of 4 pixels in the area of interest."""
+    """Selection of NB_TIME_PIXELS pixels in the area of interest."""
     x, y, h, w = aoi
     # Reset old coordinates
     image_x = []
     image_y = []
-    for i in range(4):
+    for i in range(NB_TIME_PIXELS):
         image_x.append(np.random.randint(x, x+h))
         image_y.append(np.random.randint(y, y+w))
     return image_x, image_y
@@ -208,7 +224,8 @@ class HistoTimeOptionsWidget(QWidget):
         self.nb_of_points = 0
         self.image_x = []
         self.image_y = []
-        self.pixels_value = [[], [], [], []]
+        # Empty series of gray pixels until the first acquisition
+        self.pixels_value = TimeSeriesBuffer(2, shape=(NB_TIME_PIXELS,))
         self.counter = 0
         self.acquiring = False
 
@@ -230,7 +247,7 @@ class HistoTimeOptionsWidget(QWidget):
         # Number of points
         self.nb_of_points_widget = QWidget()
         self.nb_of_points_sublayout = QHBoxLayout()
-        self.nb_of_points_label = QLabel('Number of points (2 to 2000) = ')
+        self.nb_of_points_label = QLabel(f'Number of points (2 to {MAX_TIME_POINTS}) = ')
         self.nb_of_points_label.setStyleSheet(styleH2)
         self.nb_of_points_value = QLineEdit()
         self.nb_of_points_value.setText(str(self.nb_of_points))
@@ -287,13 +304,14 @@ class HistoTimeOptionsWidget(QWidget):
     def clicked_action(self):
         sender = self.sender()
         if sender == self.start_button:
-            if 1 < int(self.nb_of_points_value.text()) <= 2000:
+            if 1 < int(self.nb_of_points_value.text()) <= MAX_TIME_POINTS:
                 self.nb_of_points = int(self.nb_of_points_value.text())
                 self.start_acq_clicked.emit('start')
                 self.progress_bar.setMinimum(0)
                 self.progress_bar.setMaximum(self.nb_of_points)
             else:
-                warn = QMessageBox.warning(self, 'Wrong value', 'The value is not in the range 1 to 2000')
+                warn = QMessageBox.warning(self, 'Wrong value',
+                                           f'The value is not in the range 2 to {MAX_TIME_POINTS}')
         elif sender == self.save_histo_button:
             self.start_acq_clicked.emit('save_hist_time')
         elif sender == self.pixel_select:
@@ -306,11 +324,14 @@ class HistoTimeOptionsWidget(QWidget):
         """Return true if the acquisition is running."""
         return self.acquiring
 
-    def start_acquisition(self):
+    def start_acquisition(self, color: bool = False):
         """
         Start a new time acquisition for 4 pixels.
+        :param color: True if the images are RGB images.
         """
-        self.pixels_value = [[], [], [], []]
+        # Ring buffer preallocated for the whole acquisition - O(1) per sample
+        shape = (NB_TIME_PIXELS, 3) if color else (NB_TIME_PIXELS,)
+        self.pixels_value = TimeSeriesBuffer(self.nb_of_points, shape=shape)
         self.acquiring = True
         self.counter = 0
 
@@ -319,24 +340,22 @@ class HistoTimeOptionsWidget(QWidget):
         Increase the counter of acquisition and add the data to the list of each pixel.
         :param image_array: Array containing the image.
         """
-        for i in range(4):
-            if len(image_array.shape) <= 2:
-                self.pixels_value[i].append(image_array[self.image_y[i], self.image_x[i]])
-            else: #RGB
-                pixel_R = image_array[self.image_y[i], self.image_x[i], 0]
-                pixel_G = image_array[self.image_y[i], self.image_x[i], 1]
-                pixel_B = image_array[self.image_y[i], self.image_x[i], 2]
-                self.pixels_value[i].append([pixel_R, pixel_G, pixel_B])
+        # Gray : 4 values / RGB : 4 x 3 values
+        self.pixels_value.append(image_array[self.image_y, self.image_x])
         self.counter += 1
         self.waiting_value()
 
-    def get_pixels(self, index: int):
+    def get_series(self) -> TimeSeriesBuffer:
+        """Return the time series of the 4 pixels."""
+        return self.pixels_value
+
+    def get_pixels(self, index: int) -> np.ndarray:
         """
         Return data for 1 pixel.
         :param index: Index of the pixel to return.
-        :return: List of the data.
+        :return: Array of the data (empty before the first acquisition).
         """
-        return self.pixels_value[index]
+        return self.pixels_value.get_data()[:, index]
 
     def waiting_value(self):
         # Display time elapsed...
@@ -375,14 +394,25 @@ class HistoTimeOptionsWidget(QWidget):
         self.image_y = pixels_y
 
 class HistoTimeChartWidget(QWidget):
+    """
+    Chart of the time series of a pixel.
+    Curves are updated (not rebuilt) from a min/max decimated view of the series,
+    so the redraw time does not depend on the number of samples.
+    """
 
     def __init__(self, parent):
         """
-
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
         """
         super().__init__(parent=None)
         self.layout = QVBoxLayout()
         self.parent = parent
+        self.series = None
+        self.pixel_index = 0
+        self.curves = []
+        self.pens = [mkPen(color=BLUE_IOGS, width=2), mkPen(color='r', width=2),
+                     mkPen(color='g', width=2), mkPen(color='b', width=2)]
 
         # Graph
         # -----
@@ -391,6 +421,36 @@ class HistoTimeChartWidget(QWidget):
         self.time_chart.set_background('white')
 
         self.layout.addWidget(self.time_chart)
+        self.setLayout(self.layout)
+
+    def set_series(self, series: TimeSeriesBuffer, pixel_index: int = 0,
+                   x_label: str = '', y_label: str = ''):
+        """
+        Set the time series to display on the chart.
+        :param series: Time series of the pixels.
+        :param pixel_index: Index of the pixel to display.
+        :param x_label: Label of the X-axis.
+        :param y_label: Label of the Y-axis.
+        """
+        self.series = series
+        self.pixel_index = pixel_index
+        plot_widget = self.time_chart.plot_chart_widget
+        plot_widget.clear()
+        plot_widget.showGrid(x=True, y=True)
+        plot_widget.setLabel('bottom', x_label)
+        plot_widget.setLabel('left', y_label)
+        if len(series.shape) <= 1:
+            self.curves = [plot_widget.plot(pen=self.pens[0])]
+        else:   # RGB
+            self.curves = [plot_widget.plot(pen=self.pens[k+1]) for k in range(series.shape[1])]
+
+    def set_pixel_index(self, pixel_index: int):
+        """
+        Change the displayed pixel.
+        :param pixel_index: Index of the pixel to display.
+        """
+        self.pixel_index = pixel_index
+        self.update_chart()
 
     def set_data(self, x_axis, y_axis, x_label: str = '', y_label: str = ''):
         """
@@ -405,16 +465,16 @@ class HistoTimeChartWidget(QWidget):
         """
         self.time_chart.set_data(x_axis, y_axis, x_label=x_label, y_label=y_label)
 
-    def update_chart(self, number_samples: int = 50):
+    def update_chart(self):
         """
-        Set the X and Y axis data to display on the chart.
-
-        Parameters
-        ----------
-        x_axis : Numpy array
-            X-axis value to display.
-        y_axis : Numpy array
-            Y-axis value to display.
+        Update the curves with the decimated view of the time series.
         """
-        self.time_chart.refresh_chart(number_samples)
-        self.time_chart.display_last(number_samples)
\ No newline at end of file
+        if self.series is None or self.series.get_counter() == 0:
+            return
+        x_view, y_view = self.series.get_min_max_view()
+        y_view = y_view[:, self.pixel_index]
+        if len(self.curves) == 1:
+            self.curves[0].setData(x_view, y_view)
+        else:   # RGB
+            for k, curve in enumerate(self.curves):
+                curve.setData(x_view, y_view[:, k])
\ No newline at end of file
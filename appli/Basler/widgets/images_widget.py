@@ -215,6 +215,7 @@ class ImagesDisplayWidget(QWidget):
         self.image = None
         self.hline_y = None
         self.vline_x = None
+        self.segments = []
         # GUI Elements
         self.image_display = QLabel('Image to display')
         self.image_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -246,6 +247,16 @@ class ImagesDisplayWidget(QWidget):
         if self.image is not None:
             self._draw_image_with_lines()
 
+    def set_segments(self, segments: list):
+        """
+        Draw segments over the image (profiles at any angle, averaged over a band).
+        :param segments: List of (start, end, width, color) : (x, y) coordinates of the
+            ends in pixels, width of the band in pixels, RGB color.
+        """
+        self.segments = segments
+        if self.image is not None:
+            self._draw_image_with_lines()
+
     def set_image_from_array(self, pixels: np.ndarray, aoi: bool = False) -> None:
         """
         Display a new image from an array (Numpy)
@@ -288,6 +299,15 @@ class ImagesDisplayWidget(QWidget):
             painter.drawLine(0, int(self.hline_y*aspect_ratio),
                              qimage.width(), int(self.hline_y*aspect_ratio))
 
+        # Segments, as wide as their band (transparent)
+        for (x0, y0), (x1, y1), width, color in self.segments:
+            alpha = 255 if width <= 1 else 100
+            pen = QPen(QColor(*color, alpha), max(2, int(width*aspect_ratio)),
+                       Qt.PenStyle.SolidLine, Qt.PenCapStyle.FlatCap)
+            painter.setPen(pen)
+            painter.drawLine(int(x0*aspect_ratio), int(y0*aspect_ratio),
+                             int(x1*aspect_ratio), int(y1*aspect_ratio))
+
         painter.end()
 
         pmap = QPixmap.fromImage(qimage)
@@ -30,6 +30,16 @@ from widgets.quant_samp_widget import *
 from widgets.pre_processing_widget import *
 from widgets.filters_widget import *
 from widgets.slice_widgets import *
+from widgets.options_widget import *
+from widgets.timing_widget import *
+from widgets.edge_widget import *
+from widgets.segmentation_widget import *
+from widgets.detection_widget import *
+from widgets.frequency_widget import *
+from widgets.mtf_widget import *
+from widgets.focus_widget import *
+from widgets.drift_widget import *
+from processing.particles import PARTICLE_COLUMNS
 
 BOT_HEIGHT, TOP_HEIGHT = 45, 50
 LEFT_WIDTH, RIGHT_WIDTH = 45, 45
@@ -397,6 +407,7 @@ class MainWidget(QWidget):
 
                         # Start Thread
                         self.parent.image_bits_depth = get_bits_per_pixel(self.parent.camera.get_color_mode())
+                        self.parent.init_auto_exposure()
                         self.parent.camera_thread.start()
                         self.fast_mode = True
                     return True
@@ -559,6 +570,7 @@ class MainWidget(QWidget):
             if self.parent.camera is not None:
                 # Open camera settings
                 self.bot_right_widget = CameraSettingsWidget(self, self.parent.camera)
+                self.bot_right_widget.settings_changed.connect(self.parent.action_camera_settings_changed)
                 self.set_bot_right_widget(self.bot_right_widget)
                 self.options_widget = CameraInfosWidget(self)
                 self.set_options_widget(self.options_widget)
@@ -630,6 +642,7 @@ class MainWidget(QWidget):
             if self.parent.camera is not None:
                 # Open camera settings
                 self.bot_right_widget = CameraSettingsWidget(self, self.parent.camera)
+                self.bot_right_widget.settings_changed.connect(self.parent.action_camera_settings_changed)
                 self.set_bot_right_widget(self.bot_right_widget)
                 self.bot_right_widget.update_parameters(auto_min_max=True)
             else:
@@ -647,6 +660,7 @@ class MainWidget(QWidget):
             if self.parent.camera is not None:
                 # Open camera settings
                 self.bot_right_widget = CameraSettingsWidget(self, self.parent.camera)
+                self.bot_right_widget.settings_changed.connect(self.parent.action_camera_settings_changed)
                 self.set_bot_right_widget(self.bot_right_widget)
                 self.bot_right_widget.update_parameters(auto_min_max=True)
             else:
@@ -766,6 +780,20 @@ class MainWidget(QWidget):
                                                       name_histo_2='Modified Image')
             self.set_bot_right_widget(self.bot_right_widget)
 
+        elif self.mode == 'filter_fft':
+            self.update_image(aoi=True)
+            self.options_widget = FFTOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = ImagesDisplayWidget(self)
+            self.set_top_right_widget(self.top_right_widget)
+            self.resize_top_right_image()
+            # Spectrum of the AOI
+            self.bot_right_widget = ImagesDisplayWidget(self)
+            self.set_bot_right_widget(self.bot_right_widget)
+            new_size = self.parent.size()
+            self.bot_right_widget.update_size((new_size.width() * RIGHT_WIDTH) // 100,
+                                              (new_size.height() * BOT_HEIGHT) // 100)
+
         elif self.mode == 'tools_slice':
             self.update_image(aoi=True)
 
@@ -786,6 +814,139 @@ class MainWidget(QWidget):
             self.bot_right_widget.show_grid(False)
             self.set_bot_right_widget(self.bot_right_widget)
 
+        elif self.mode == 'tools_mtf':
+            self.update_image(aoi=True)
+            self.options_widget = MTFOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            # AOI with the fitted edge
+            self.top_right_widget = ImagesDisplayWidget(self)
+            self.set_top_right_widget(self.top_right_widget)
+            self.resize_top_right_image()
+            self.bot_right_widget = MTFChartWidget(self, translate('title_mtf_chart'))
+            self.set_bot_right_widget(self.bot_right_widget)
+
+        elif self.mode == 'tools_focus':
+            self.update_image(aoi=True)
+            self.options_widget = FocusOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = FocusChartWidget(self, translate('title_focus_chart'))
+            self.set_top_right_widget(self.top_right_widget)
+
+        elif self.mode == 'tools_drift':
+            self.update_image(aoi=True)
+            self.options_widget = DriftOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = DriftChartWidget(self, translate('title_drift_chart'),
+                                                     translate('drift_time'),
+                                                     translate('drift_shift'))
+            self.set_top_right_widget(self.top_right_widget)
+            self.bot_right_widget = DriftChartWidget(self, translate('title_drift_spectrum'),
+                                                     translate('drift_frequency'),
+                                                     translate('drift_amplitude'), log_mode=True)
+            self.set_bot_right_widget(self.bot_right_widget)
+
+        elif self.mode == 'edge_sobel':
+            self.update_image(aoi=True)
+            self.options_widget = EdgeGradientOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = ImagesDisplayWidget(self)
+            self.set_top_right_widget(self.top_right_widget)
+            self.resize_top_right_image()
+            self.bot_right_widget = ImageHistogramWidget(translate('histo_edge_magnitude'))
+            self.bot_right_widget.set_background('white')
+            self.set_bot_right_widget(self.bot_right_widget)
+
+        elif self.mode == 'edge_canny':
+            self.update_image(aoi=True)
+            self.options_widget = CannyOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = ImagesDisplayWidget(self)
+            self.set_top_right_widget(self.top_right_widget)
+            self.resize_top_right_image()
+            self.bot_right_widget = ImageHistogramWidget(translate('histo_original_image'))
+            self.bot_right_widget.set_axis_labels(translate('x_label_histo'),
+                                                  translate('y_label_histo'))
+            self.bot_right_widget.set_background('white')
+            self.set_bot_right_widget(self.bot_right_widget)
+
+        elif self.mode == 'segment_watershed':
+            self.update_image(aoi=True)
+            self.options_widget = WatershedOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = ImagesDisplayWidget(self)
+            self.set_top_right_widget(self.top_right_widget)
+            self.resize_top_right_image()
+            self.bot_right_widget = RegionsTableWidget(self)
+            self.set_bot_right_widget(self.bot_right_widget)
+
+        elif self.mode == 'segment_particles':
+            self.update_image(aoi=True)
+            self.options_widget = ParticlesOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = ImagesDisplayWidget(self)
+            self.set_top_right_widget(self.top_right_widget)
+            self.resize_top_right_image()
+            self.bot_right_widget = RegionsTableWidget(self, PARTICLE_COLUMNS)
+            self.set_bot_right_widget(self.bot_right_widget)
+
+        elif self.mode == 'detect_harrys':
+            self.update_image(aoi=True)
+            self.options_widget = CornersOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = ImagesDisplayWidget(self)
+            self.set_top_right_widget(self.top_right_widget)
+            self.resize_top_right_image()
+
+        elif self.mode == 'detect_template':
+            self.update_image(aoi=True)
+            self.options_widget = TemplateOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            # Whole frame with the found pattern
+            self.top_right_widget = ImagesDisplayWidget(self)
+            self.set_top_right_widget(self.top_right_widget)
+            self.resize_top_right_image()
+            # Taught template
+            self.bot_right_widget = ImagesDisplayWidget(self)
+            self.set_bot_right_widget(self.bot_right_widget)
+            new_size = self.parent.size()
+            self.bot_right_widget.update_size((new_size.width() * RIGHT_WIDTH) // 100,
+                                              (new_size.height() * BOT_HEIGHT) // 100)
+
+        elif self.mode == 'frame_average':
+            if self.parent.aoi is not None:
+                self.update_image(aoi=True)
+            self.options_widget = FrameAverageOptionsWidget(self)
+            averager = self.parent.frame_averager
+            self.options_widget.set_parameters(averager.mode, averager.nb_frames, averager.alpha)
+            self.set_options_widget(self.options_widget)
+
+        elif self.mode == 'auto_exposure':
+            self.options_widget = AutoExposureOptionsWidget(self)
+            controller = self.parent.auto_exposure
+            self.options_widget.set_parameters(controller.enabled, controller.metric,
+                                               controller.target, controller.percentile)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = ImageHistogramWidget('Image Histogram')
+            self.top_right_widget.set_background('white')
+            self.top_right_widget.set_axis_labels(translate('x_label_histo'),
+                                                  translate('y_label_histo'))
+            self.set_top_right_widget(self.top_right_widget)
+            if self.parent.camera is not None:
+                self.bot_right_widget = CameraSettingsWidget(self, self.parent.camera)
+                self.bot_right_widget.settings_changed.connect(self.parent.action_camera_settings_changed)
+                self.set_bot_right_widget(self.bot_right_widget)
+                self.bot_right_widget.update_parameters(auto_min_max=True)
+
+        elif self.mode == 'frame_timing':
+            self.options_widget = FrameTimingOptionsWidget(self)
+            self.set_options_widget(self.options_widget)
+            self.top_right_widget = FrameTimingChartWidget(self, translate('title_timing_intervals'))
+            self.top_right_widget.set_labels(translate('frame_number'), translate('interval_ms'))
+            self.set_top_right_widget(self.top_right_widget)
+            self.bot_right_widget = FrameTimingChartWidget(self, translate('title_timing_histogram'))
+            self.bot_right_widget.set_labels(translate('interval_ms'), translate('y_label_timing_histo'))
+            self.set_bot_right_widget(self.bot_right_widget)
+
         self.main_signal.emit(event)
 
     def resize_top_right_image(self):
@@ -819,6 +980,8 @@ class MainWidget(QWidget):
         """Action performed when the exposure value in the main menu slider changed."""
         expo_value = self.main_menu.get_expo_value()
         self.parent.camera.set_exposure(expo_value)
+        self.parent.settle_tracker.arm(expo_value)
+        self.parent.auto_exposure.set_exposure(expo_value)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""*mtf_widget.py* file.
+
+This file contains graphical elements to measure the MTF of an optical system with
+a slanted edge in the AOI (options and chart of the MTF).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_combobox import ButtonSelectionWidget
+from lensepy.pyqt6.widget_xy_chart import XYChartWidget
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QMainWindow
+)
+from PyQt6.QtCore import pyqtSignal
+from pyqtgraph import mkPen, InfiniteLine
+
+
+class MTFOptionsWidget(QWidget):
+    """
+    Options widget of the MTF menu.
+    """
+
+    mtf_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_mtf = QLabel(translate('title_mtf'))
+        self.label_title_mtf.setStyleSheet(styleH1)
+        self.label_info_mtf = QLabel(translate('label_mtf_info'))
+        self.label_info_mtf.setWordWrap(True)
+
+        # Oversampling of the edge spread function
+        # ----------------------------------------
+        self.oversampling_values = [2, 4, 8]
+        self.oversampling_choice = ButtonSelectionWidget(parent=self,
+                                                         name=translate('label_mtf_oversampling'))
+        self.oversampling_choice.set_list_options([str(value) for value in self.oversampling_values])
+        self.oversampling_choice.activate_index(2)
+        self.oversampling_choice.clicked.connect(self.action_options_changed)
+
+        self.label_results = QLabel('')
+        self.label_results.setStyleSheet(styleH3)
+        self.label_status = QLabel('')
+
+        self.layout.addWidget(self.label_title_mtf)
+        self.layout.addWidget(self.label_info_mtf)
+        self.layout.addWidget(self.oversampling_choice)
+        self.layout.addWidget(self.label_results)
+        self.layout.addWidget(self.label_status)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        self.mtf_changed.emit('mtf')
+
+    def get_params(self) -> dict:
+        """Return the parameters of the measurement (see processing.mtf)."""
+        index = self.oversampling_choice.get_selection_index()
+        if index is None or index < 0:
+            index = 1
+        return {'oversampling': self.oversampling_values[index]}
+
+    def set_results(self, result: dict, processing_time: float):
+        """
+        Display the results of the measurement.
+        :param result: Result of the measurement (see processing.mtf.measure_mtf), or None.
+        :param processing_time: Time of the measurement in ms.
+        """
+        if result is None:
+            self.label_results.setText(translate('mtf_no_edge'))
+        elif result['error'] is not None:
+            # Edge aligned with the pixels or low contrast : no valid MTF
+            self.label_results.setText(
+                f"{translate('mtf_error_' + result['error'])}\n"
+                f"{translate('mtf_edge')} : {result['angle']:.1f}° / SNR = {result['snr']:.1f}")
+        else:
+            mtf50 = '-' if result['mtf50'] is None else f"{result['mtf50']:.3f}"
+            orientation = translate('mtf_vertical' if result['vertical'] else 'mtf_horizontal')
+            self.label_results.setText(
+                f"MTF50 : {mtf50} {translate('mtf_cycles_pixel')}\n"
+                f"MTF (Nyquist) : {result['mtf_nyquist']:.3f}\n"
+                f"{translate('mtf_edge')} : {orientation} / {result['angle']:.1f}°")
+        self.label_status.setText(f"{processing_time:.1f} ms")
+
+
+class MTFChartWidget(XYChartWidget):
+    """
+    Chart of the MTF and of the contrast of a bar target (curves updated, not rebuilt).
+    """
+
+    def __init__(self, parent, title: str = ''):
+        """
+        Default Constructor.
+        :param parent: Parent widget.
+        :param title: Title of the chart.
+        """
+        super().__init__(parent=parent)
+        self.set_title(title)
+        self.set_background('white')
+        plot_widget = self.plot_chart_widget
+        plot_widget.showGrid(x=True, y=True)
+        plot_widget.setLabel('bottom', translate('mtf_frequency'))
+        plot_widget.setLabel('left', translate('mtf_contrast'))
+        legend = plot_widget.addLegend()
+        plot_widget.setYRange(0, 1.1)
+        self.plot_chart.setPen(mkPen(color=BLUE_IOGS, width=2))
+        legend.addItem(self.plot_chart, 'MTF')
+        self.bar_curve = plot_widget.plot(pen=mkPen(color='r', width=2, style=2),
+                                          name=translate('mtf_bar_contrast'))
+        self.nyquist_line = InfiniteLine(pos=0.5, angle=90, pen=mkPen(color='k', style=3))
+        self.mtf50_line = InfiniteLine(pos=0, angle=90, pen=mkPen(color='g'))
+        plot_widget.addItem(self.nyquist_line)
+        plot_widget.addItem(self.mtf50_line)
+        self.setMinimumHeight(200)
+
+    def set_mtf(self, result: dict):
+        """
+        Display the MTF and the contrast of a bar target.
+        :param result: Result of the measurement (see processing.mtf.measure_mtf), or None.
+            Invalid measurements are not displayed.
+        """
+        if result is None or result['error'] is not None:
+            self.plot_chart.setData([], [])
+            self.bar_curve.setData([], [])
+            self.mtf50_line.setVisible(False)
+            return
+        self.plot_chart.setData(result['frequencies'], result['mtf'])
+        self.bar_curve.setData(result['frequencies'], result['bar_contrast'])
+        self.mtf50_line.setVisible(result['mtf50'] is not None)
+        if result['mtf50'] is not None:
+            self.mtf50_line.setValue(result['mtf50'])
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = MTFOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
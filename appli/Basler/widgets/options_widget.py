@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""*options_widget.py* file.
+
+This file contains graphical elements to set the options of the interface
+(frame averaging, auto-exposure...).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_combobox import *
+from lensepy.pyqt6.widget_slider import *
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QMainWindow
+)
+from PyQt6.QtCore import pyqtSignal
+
+
+class FrameAverageOptionsWidget(QWidget):
+    """
+    Options widget of the frame averaging menu.
+    """
+
+    averaging_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_average = QLabel(translate('title_frame_average'))
+        self.label_title_average.setStyleSheet(styleH1)
+
+        # Averaging mode
+        # --------------
+        self.modes = ['none', 'mean', 'ema']
+        self.mode_choice = ButtonSelectionWidget(parent=self, name=translate('label_average_mode'))
+        self.list_options = [translate('average_none'),
+                             translate('average_mean'),
+                             translate('average_ema')]
+        self.mode_choice.set_list_options(self.list_options)
+        self.mode_choice.clicked.connect(self.action_mode_changed)
+
+        self.slider_nb_frames = SliderBloc(translate('slider_average_frames'), unit='frames',
+                                           min_value=1, max_value=64, integer=True)
+        self.slider_nb_frames.set_value(8)
+        self.slider_nb_frames.set_enabled(False)
+        self.slider_nb_frames.slider_changed.connect(self.action_slider_changed)
+
+        self.slider_alpha = SliderBloc(translate('slider_average_alpha'), unit='',
+                                       min_value=0.01, max_value=1)
+        self.slider_alpha.set_value(0.2)
+        self.slider_alpha.set_enabled(False)
+        self.slider_alpha.slider_changed.connect(self.action_slider_changed)
+
+        self.label_counter = QLabel('')
+        self.label_counter.setStyleSheet(styleH3)
+
+        self.layout.addWidget(self.label_title_average)
+        self.layout.addWidget(self.mode_choice)
+        self.layout.addWidget(self.slider_nb_frames)
+        self.layout.addWidget(self.slider_alpha)
+        self.layout.addWidget(self.label_counter)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def set_parameters(self, mode: str, nb_frames: int, alpha: float):
+        """
+        Display the actual parameters of the frame averager.
+        :param mode: Averaging mode - 'none', 'mean' or 'ema'.
+        :param nb_frames: Number of frames to average.
+        :param alpha: Smoothing factor of the exponential moving average.
+        """
+        self.slider_nb_frames.set_value(nb_frames)
+        self.slider_alpha.set_value(alpha)
+        if mode in self.modes:
+            self.mode_choice.activate_index(self.modes.index(mode) + 1)
+            self.update_sliders(mode)
+
+    def update_sliders(self, mode: str):
+        """Enable sliders depending on the averaging mode."""
+        self.slider_nb_frames.set_enabled(mode == 'mean')
+        self.slider_alpha.set_enabled(mode == 'ema')
+
+    def action_mode_changed(self, event):
+        """Action performed when the averaging mode changed."""
+        self.update_sliders(self.get_mode())
+        self.averaging_changed.emit('average_mode')
+
+    def action_slider_changed(self, event):
+        """Action performed when a slider changed."""
+        self.averaging_changed.emit('average_params')
+
+    def set_counter(self, counter: int):
+        """Display the number of frames in the average."""
+        self.label_counter.setText(f'{counter} frame(s)')
+
+    def get_mode(self) -> str:
+        """Return the selected averaging mode."""
+        index = self.mode_choice.get_selection_index()
+        if index is None or index < 0:
+            return 'none'
+        return self.modes[index]
+
+    def get_nb_frames(self) -> int:
+        """Return the number of frames to average."""
+        return int(self.slider_nb_frames.get_value())
+
+    def get_alpha(self) -> float:
+        """Return the smoothing factor of the exponential moving average."""
+        return float(self.slider_alpha.get_value())
+
+
+class AutoExposureOptionsWidget(QWidget):
+    """
+    Options widget of the auto-exposure menu.
+    """
+
+    auto_exposure_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_auto_exposure = QLabel(translate('title_auto_exposure'))
+        self.label_title_auto_exposure.setStyleSheet(styleH1)
+
+        # Enable and metric
+        # -----------------
+        self.enabled_choice = ButtonSelectionWidget(parent=self,
+                                                    name=translate('label_auto_exposure'))
+        self.enabled_choice.set_list_options([translate('auto_exposure_off'),
+                                              translate('auto_exposure_on')])
+        self.enabled_choice.clicked.connect(self.action_options_changed)
+
+        self.metrics = ['mean', 'percentile']
+        self.metric_choice = ButtonSelectionWidget(parent=self,
+                                                   name=translate('label_auto_exposure_metric'))
+        self.metric_choice.set_list_options([translate('auto_exposure_mean'),
+                                             translate('auto_exposure_percentile')])
+        self.metric_choice.clicked.connect(self.action_options_changed)
+
+        self.slider_target = SliderBloc(translate('slider_auto_exposure_target'), unit='%',
+                                        min_value=1, max_value=99, integer=True)
+        self.slider_target.set_value(80)
+        self.slider_target.slider_changed.connect(self.action_options_changed)
+
+        self.slider_percentile = SliderBloc(translate('slider_auto_exposure_percentile'),
+                                            unit='%', min_value=50, max_value=100)
+        self.slider_percentile.set_value(99)
+        self.slider_percentile.slider_changed.connect(self.action_options_changed)
+
+        self.label_status = QLabel('')
+        self.label_status.setStyleSheet(styleH3)
+
+        self.layout.addWidget(self.label_title_auto_exposure)
+        self.layout.addWidget(self.enabled_choice)
+        self.layout.addWidget(self.metric_choice)
+        self.layout.addWidget(self.slider_target)
+        self.layout.addWidget(self.slider_percentile)
+        self.layout.addWidget(self.label_status)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def set_parameters(self, enabled: bool, metric: str, target: float, percentile: float):
+        """
+        Display the actual parameters of the auto-exposure controller.
+        :param enabled: True if the auto-exposure is enabled.
+        :param metric: 'mean' or 'percentile'.
+        :param target: Target value, normalized to full scale (0 to 1).
+        :param percentile: Percentile of the histogram (0 to 100).
+        """
+        self.enabled_choice.activate_index(2 if enabled else 1)
+        if metric in self.metrics:
+            self.metric_choice.activate_index(self.metrics.index(metric) + 1)
+        self.slider_target.set_value(round(target * 100))
+        self.slider_percentile.set_value(percentile)
+        self.slider_percentile.set_enabled(metric == 'percentile')
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        self.slider_percentile.set_enabled(self.get_metric() == 'percentile')
+        self.auto_exposure_changed.emit('auto_exposure')
+
+    def set_status(self, statistics: dict, exposure: float):
+        """
+        Display the last statistics and the exposure time.
+        :param statistics: Statistics of the last frame (normalized to full scale).
+        :param exposure: Exposure time in microseconds.
+        """
+        text = f'{exposure:.0f} us'
+        if statistics is not None:
+            text += (f" / {translate('auto_exposure_mean')} = {statistics['mean']*100:.1f} %"
+                     f" / {translate('auto_exposure_percentile')} = "
+                     f"{statistics['percentile']*100:.1f} %")
+        self.label_status.setText(text)
+
+    def get_enabled(self) -> bool:
+        """Return True if the auto-exposure is enabled."""
+        return self.enabled_choice.get_selection_index() == 1
+
+    def get_metric(self) -> str:
+        """Return the selected metric."""
+        index = self.metric_choice.get_selection_index()
+        if index is None or index < 0:
+            return 'percentile'
+        return self.metrics[index]
+
+    def get_target(self) -> float:
+        """Return the target value, normalized to full scale (0 to 1)."""
+        return self.slider_target.get_value() / 100
+
+    def get_percentile(self) -> float:
+        """Return the percentile of the histogram (0 to 100)."""
+        return float(self.slider_percentile.get_value())
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = FrameAverageOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
@@ -22,6 +22,7 @@ from PyQt6.QtGui import QPixmap, QPainter, QPen, QColor
 from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QRect
 from lensepy.pyqt6.widget_combobox import *
 from lensepy.pyqt6.widget_slider import *
+from processing.lut import LutOperator
 
 class ThresholdOptionsWidget(QWidget):
     """
@@ -121,6 +122,7 @@ class ContrastAdjustOptionsWidget(QWidget):
         super().__init__(parent=None)
         self.layout = QVBoxLayout()
         self.parent = parent
+        self.enhance_contrast = LutOperator(['enhance_contrast'])
 
         max_value = (2**self.parent.parent.image_bits_depth - 1)
 
@@ -163,12 +165,7 @@ class ContrastAdjustOptionsWidget(QWidget):
         delta_image_depth = (self.parent.bits_depth - 8)  # Power of 2 for depth conversion
         min_value = int(self.slider_threshold_min.get_value() // 2**delta_image_depth)
         max_value = int(self.slider_threshold_max.get_value() // 2**delta_image_depth)
-        max_range = 255
-        gain = max_range/(max_value-min_value)
-        output_image = ((image.astype(np.int16)-min_value+1) * gain).astype(np.int16)
-        output_image[output_image > max_range] = 255
-        output_image[output_image <= 1] = 0
-        return output_image.astype(np.uint8)
+        return self.enhance_contrast(image, {'min': min_value, 'max': max_value})
 
 
 class ErosionDilationOptionsWidget(QWidget):
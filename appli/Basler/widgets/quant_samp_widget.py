@@ -13,6 +13,8 @@ import sys
 from lensepy import translate
 from lensepy.css import *
 from lensepy.pyqt6.widget_slider import SliderBloc
+from lensepy.pyqt6.widget_combobox import ButtonSelectionWidget
+from lensepy.pyqt6.widget_xy_chart import XYChartWidget
 import numpy as np
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
@@ -51,8 +53,16 @@ class QuantizationOptionsWidget(QWidget):
         self.slider_quantization.set_value(8)
         self.slider_quantization.slider_changed.connect(self.action_slider_bits_depth_changed)
 
+        # Quantization errors for all the bits depths
+        # -------------------------------------------
+        self.label_errors = QLabel('')
+        self.label_errors.setStyleSheet(styleH3)
+        self.chart_errors = QuantizationErrorChartWidget(self, translate('title_quantization_psnr'))
+
         self.layout.addWidget(self.label_title_quantization)
         self.layout.addWidget(self.slider_quantization)
+        self.layout.addWidget(self.label_errors)
+        self.layout.addWidget(self.chart_errors)
         self.layout.addStretch()
         self.setLayout(self.layout)
 
@@ -66,6 +76,53 @@ class QuantizationOptionsWidget(QWidget):
         """
         return int(self.slider_quantization.get_value())
 
+    def set_errors(self, errors: dict):
+        """
+        Display the quantization errors of the selected bits depth and of all the depths.
+        :param errors: Quantization errors (see processing.quantization).
+        """
+        self.chart_errors.set_errors(errors)
+        index = np.flatnonzero(errors['bits'] == self.get_bits_depth())
+        if len(index) == 0:
+            self.label_errors.setText('')
+            return
+        k = index[0]
+        self.label_errors.setText(f"MSE = {errors['mse'][k]:.3g} / PSNR = {errors['psnr'][k]:.1f} dB\n"
+                                  f"{translate('quantization_occupancy')} = "
+                                  f"{errors['occupancy'][k] * 100:.1f} % / "
+                                  f"{translate('quantization_entropy')} = "
+                                  f"{errors['entropy'][k]:.2f} bits")
+
+
+class QuantizationErrorChartWidget(XYChartWidget):
+    """
+    Chart of the PSNR as a function of the bits depth (updated, not rebuilt).
+    """
+
+    def __init__(self, parent, title: str = ''):
+        """
+        Default Constructor.
+        :param parent: Parent widget.
+        :param title: Title of the chart.
+        """
+        super().__init__(parent=parent)
+        self.set_title(title)
+        self.set_background('white')
+        self.plot_chart_widget.showGrid(x=True, y=True)
+        self.plot_chart_widget.setLabel('bottom', translate('quantization_bits'))
+        self.plot_chart_widget.setLabel('left', 'PSNR (dB)')
+        self.setMinimumHeight(200)
+
+    def set_errors(self, errors: dict):
+        """
+        Display the PSNR of all the bits depths.
+        :param errors: Quantization errors (see processing.quantization).
+        """
+        # No error (infinite PSNR) at the bits depth of the image
+        finite = np.isfinite(errors['psnr'])
+        self.plot_chart.setData(errors['bits'][finite], errors['psnr'][finite], symbol='o')
+
+
 class SamplingOptionsWidget(QWidget):
     """
     Options widget of the Quantization select menu.
@@ -95,8 +152,19 @@ class SamplingOptionsWidget(QWidget):
         self.slider_sampling.set_value(1)
         self.slider_sampling.slider_changed.connect(self.action_slider_samples_changed)
 
+        # Downsampling method
+        # -------------------
+        self.methods = ['mean', 'pick']
+        self.method_choice = ButtonSelectionWidget(parent=self,
+                                                   name=translate('label_sampling_method'))
+        self.method_choice.set_list_options([translate('sampling_mean'),
+                                             translate('sampling_pick')])
+        self.method_choice.activate_index(1)
+        self.method_choice.clicked.connect(self.action_slider_samples_changed)
+
         self.layout.addWidget(self.label_title_sampling)
         self.layout.addWidget(self.slider_sampling)
+        self.layout.addWidget(self.method_choice)
         self.layout.addStretch()
         self.setLayout(self.layout)
 
@@ -110,6 +178,11 @@ class SamplingOptionsWidget(QWidget):
         """
         return int(self.slider_sampling.get_value())
 
+    def get_method(self) -> str:
+        """Return the downsampling method (see processing.sampling)."""
+        index = self.method_choice.get_selection_index()
+        return self.methods[index] if index is not None and index >= 0 else 'mean'
+
 
 if __name__ == '__main__':
     from PyQt6.QtWidgets import QApplication
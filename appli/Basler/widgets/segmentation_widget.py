@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""*segmentation_widget.py* file.
+
+This file contains graphical elements to set the options of the segmentation menu
+(marker-based watershed, particle analysis) and to display the statistics of the
+regions.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+import numpy as np
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_combobox import *
+from lensepy.pyqt6.widget_slider import *
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QMainWindow, QPushButton,
+    QTableWidget, QTableWidgetItem
+)
+from PyQt6.QtCore import pyqtSignal
+
+# Maximum number of regions in the table (largest regions first)
+MAX_TABLE_ROWS = 50
+
+
+class WatershedOptionsWidget(QWidget):
+    """
+    Options widget of the watershed segmentation menu.
+    """
+
+    watershed_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_watershed = QLabel(translate('title_watershed'))
+        self.label_title_watershed.setStyleSheet(styleH1)
+
+        # Threshold (Otsu method or manual) and objects
+        # ---------------------------------------------
+        self.threshold_choice = ButtonSelectionWidget(parent=self,
+                                                      name=translate('label_watershed_threshold'))
+        self.threshold_choice.set_list_options([translate('watershed_otsu'),
+                                                translate('watershed_manual')])
+        self.threshold_choice.activate_index(1)
+        self.threshold_choice.clicked.connect(self.action_options_changed)
+
+        self.slider_threshold = SliderBloc(translate('slider_watershed_threshold'), unit='',
+                                           min_value=0, max_value=255, integer=True)
+        self.slider_threshold.set_value(128)
+        self.slider_threshold.slider_changed.connect(self.action_options_changed)
+
+        self.objects_choice = ButtonSelectionWidget(parent=self,
+                                                    name=translate('label_watershed_objects'))
+        self.objects_choice.set_list_options([translate('watershed_bright'),
+                                              translate('watershed_dark')])
+        self.objects_choice.activate_index(1)
+        self.objects_choice.clicked.connect(self.action_options_changed)
+
+        # Markers
+        # -------
+        self.slider_distance = SliderBloc(translate('slider_watershed_distance'), unit='%',
+                                          min_value=5, max_value=95, integer=True)
+        self.slider_distance.set_value(50)
+        self.slider_distance.slider_changed.connect(self.action_options_changed)
+
+        # Results and latency
+        # -------------------
+        self.label_regions = QLabel('')
+        self.label_regions.setStyleSheet(styleH3)
+        self.label_latency = QLabel('')
+        self.label_latency.setStyleSheet(styleH3)
+        self.button_reset_latency = QPushButton(translate('button_reset_latency'))
+        self.button_reset_latency.setStyleSheet(unactived_button)
+        self.button_reset_latency.setFixedHeight(OPTIONS_BUTTON_HEIGHT)
+        self.button_reset_latency.clicked.connect(self.action_reset_latency)
+
+        self.layout.addWidget(self.label_title_watershed)
+        self.layout.addWidget(self.threshold_choice)
+        self.layout.addWidget(self.slider_threshold)
+        self.layout.addWidget(self.objects_choice)
+        self.layout.addWidget(self.slider_distance)
+        self.layout.addWidget(self.label_regions)
+        self.layout.addWidget(self.label_latency)
+        self.layout.addWidget(self.button_reset_latency)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+        self.slider_threshold.set_enabled(False)
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        self.slider_threshold.set_enabled(self.threshold_choice.get_selection_index() == 1)
+        self.watershed_changed.emit('watershed')
+
+    def action_reset_latency(self, event):
+        """Action performed when the reset button is clicked."""
+        self.watershed_changed.emit('reset_latency')
+
+    def get_params(self) -> dict:
+        """Return the parameters of the segmentation (see processing.segmentation)."""
+        threshold = None
+        if self.threshold_choice.get_selection_index() == 1:
+            threshold = int(self.slider_threshold.get_value())
+        return {'threshold': threshold,
+                'invert': self.objects_choice.get_selection_index() == 1,
+                'distance_ratio': self.slider_distance.get_value() / 100}
+
+    def set_regions(self, statistics: dict):
+        """
+        Display the number of regions and their mean area.
+        :param statistics: Statistics of the regions (see processing.segmentation).
+        """
+        nb_regions = len(statistics['area'])
+        text = f"{nb_regions} {translate('watershed_regions')}"
+        if nb_regions > 0:
+            text += f" / {translate('watershed_mean_area')} = {np.mean(statistics['area']):.0f} px"
+        self.label_regions.setText(text)
+
+    def set_latency(self, latency: dict):
+        """
+        Display the processing time of the segmentation.
+        :param latency: Statistics of the processing times (see processing.frame_timing).
+        """
+        if latency.get('nb_frames', 0) == 0:
+            self.label_latency.setText('')
+            return
+        text = f"{latency['last']:.1f} ms (p95 = {latency['p95']:.1f} ms)"
+        if 'max_pixels' in latency:
+            text += f"\n{translate('watershed_max_aoi')} : {latency['max_pixels'] / 1e6:.2f} MP"
+        self.label_latency.setText(text)
+
+
+class ParticlesOptionsWidget(QWidget):
+    """
+    Options widget of the particle analysis menu.
+    """
+
+    particles_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_particles = QLabel(translate('title_particles'))
+        self.label_title_particles.setStyleSheet(styleH1)
+
+        # Threshold (bits depth of the camera, as the threshold menu)
+        # -----------------------------------------------------------
+        max_value = (2**self.parent.parent.image_bits_depth - 1)
+        self.slider_threshold = SliderBloc(translate('slider_watershed_threshold'), unit='',
+                                           min_value=0, max_value=max_value, integer=True)
+        self.slider_threshold.set_value(max_value // 2)
+        self.slider_threshold.slider_changed.connect(self.action_options_changed)
+
+        self.objects_choice = ButtonSelectionWidget(parent=self,
+                                                    name=translate('label_watershed_objects'))
+        self.objects_choice.set_list_options([translate('watershed_bright'),
+                                              translate('watershed_dark')])
+        self.objects_choice.activate_index(1)
+        self.objects_choice.clicked.connect(self.action_options_changed)
+
+        self.slider_min_area = SliderBloc(translate('slider_particles_min_area'), unit='px',
+                                          min_value=1, max_value=500, integer=True)
+        self.slider_min_area.set_value(5)
+        self.slider_min_area.slider_changed.connect(self.action_options_changed)
+
+        # Tracking
+        # --------
+        self.track_choice = ButtonSelectionWidget(parent=self,
+                                                  name=translate('label_particles_track'))
+        self.track_choice.set_list_options([translate('corners_off'), translate('corners_on')])
+        self.track_choice.activate_index(2)
+        self.track_choice.clicked.connect(self.action_options_changed)
+
+        self.slider_max_distance = SliderBloc(translate('slider_particles_distance'), unit='px',
+                                              min_value=1, max_value=100, integer=True)
+        self.slider_max_distance.set_value(20)
+        self.slider_max_distance.slider_changed.connect(self.action_options_changed)
+
+        # CSV recording and results
+        # -------------------------
+        self.button_record = QPushButton(translate('button_particles_record'))
+        self.button_record.setStyleSheet(unactived_button)
+        self.button_record.setFixedHeight(OPTIONS_BUTTON_HEIGHT)
+        self.button_record.clicked.connect(self.action_record_clicked)
+        self.label_status = QLabel('')
+        self.label_status.setStyleSheet(styleH3)
+        self.label_record = QLabel('')
+        self.label_record.setStyleSheet(styleH3)
+
+        self.layout.addWidget(self.label_title_particles)
+        self.layout.addWidget(self.slider_threshold)
+        self.layout.addWidget(self.objects_choice)
+        self.layout.addWidget(self.slider_min_area)
+        self.layout.addWidget(self.track_choice)
+        self.layout.addWidget(self.slider_max_distance)
+        self.layout.addWidget(self.button_record)
+        self.layout.addWidget(self.label_status)
+        self.layout.addWidget(self.label_record)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def action_options_changed(self, event):
+        """Action performed when an option changed."""
+        self.slider_max_distance.set_enabled(self.track_choice.get_selection_index() == 1)
+        self.particles_changed.emit('particles')
+
+    def action_record_clicked(self, event):
+        """Action performed when the record button is clicked."""
+        self.particles_changed.emit('record')
+
+    def set_recording(self, file_path: str = None):
+        """
+        Display the state of the CSV recording.
+        :param file_path: Path of the CSV file, None if the recording is stopped.
+        """
+        if file_path is None:
+            self.button_record.setText(translate('button_particles_record'))
+            self.button_record.setStyleSheet(unactived_button)
+        else:
+            self.button_record.setText(translate('button_particles_stop'))
+            self.button_record.setStyleSheet(actived_button)
+            self.label_record.setText(file_path)
+
+    def set_record_error(self, message: str):
+        """
+        Display an error of the CSV recording (file not created).
+        :param message: Message of the error.
+        """
+        self.set_recording(None)
+        self.label_record.setText(f"{translate('particles_record_error')} : {message}")
+
+    def get_threshold_params(self) -> dict:
+        """Return the parameters of the threshold (see processing.operators)."""
+        invert = self.objects_choice.get_selection_index() == 1
+        return {'type': 'binary_inv' if invert else 'binary',
+                'value': int(self.slider_threshold.get_value())}
+
+    def get_params(self) -> dict:
+        """Return the parameters of the particle analysis (see processing.particles)."""
+        return {'min_area': int(self.slider_min_area.get_value()),
+                'max_distance': float(self.slider_max_distance.get_value()),
+                'track': self.track_choice.get_selection_index() == 1}
+
+    def set_status(self, nb_particles: int, processing_time: float, nb_rows: int = None):
+        """
+        Display the number of particles and the processing time.
+        :param nb_particles: Number of particles.
+        :param processing_time: Processing time in ms.
+        :param nb_rows: Number of rows in the CSV file. Default None (no recording).
+        """
+        self.label_status.setText(f"{nb_particles} {translate('particles')} / "
+                                  f"{processing_time:.1f} ms")
+        if nb_rows is not None:
+            self.label_record.setText(f"{nb_rows} {translate('particles_rows')}")
+
+
+class RegionsTableWidget(QTableWidget):
+    """
+    Table of the statistics of the largest regions.
+    """
+
+    columns = ['label', 'area', 'centroid_x', 'centroid_y', 'x_min', 'y_min', 'width', 'height',
+               'mean']
+
+    def __init__(self, parent=None, columns: list = None):
+        """
+        Default Constructor.
+        :param parent: Parent widget of this widget.
+        :param columns: Names of the displayed statistics. Default None (regions of
+            the watershed).
+        """
+        if columns is not None:
+            self.columns = list(columns)
+        super().__init__(0, len(self.columns), parent=None)
+        self.parent = parent
+        self.setHorizontalHeaderLabels([translate(f'region_{name}') for name in self.columns])
+        self.verticalHeader().setVisible(False)
+
+    def set_statistics(self, statistics: dict):
+        """
+        Display the statistics of the largest regions.
+        :param statistics: Statistics of the regions (see processing.segmentation).
+        """
+        order = np.argsort(statistics['area'])[::-1][:MAX_TABLE_ROWS]
+        self.setRowCount(len(order))
+        for row, index in enumerate(order):
+            for column, name in enumerate(self.columns):
+                value = statistics[name][index]
+                text = f'{value:.1f}' if isinstance(value, np.floating) else str(value)
+                self.setItem(row, column, QTableWidgetItem(text))
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = WatershedOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
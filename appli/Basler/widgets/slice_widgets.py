@@ -57,8 +57,21 @@ class SlicesOptionsWidget(QWidget):
         self.slider_vertical.set_value(1)
         self.slider_vertical.slider_changed.connect(self.action_slider_changed)
 
+        # Profiles averaged over a band, at any angle
+        self.slider_band_width = SliderBloc(name=translate('slider_slice_band_width'), unit='px',
+                                            min_value=1, max_value=51, integer=True)
+        self.slider_band_width.set_value(1)
+        self.slider_band_width.slider_changed.connect(self.action_slider_changed)
+
+        self.slider_angle = SliderBloc(name=translate('slider_slice_angle'), unit='°',
+                                       min_value=-90, max_value=90, integer=True)
+        self.slider_angle.set_value(0)
+        self.slider_angle.slider_changed.connect(self.action_slider_changed)
+
         self.layout.addWidget(self.slider_horizontal)
         self.layout.addWidget(self.slider_vertical)
+        self.layout.addWidget(self.slider_band_width)
+        self.layout.addWidget(self.slider_angle)
         self.layout.addStretch()
         self.setLayout(self.layout)
 
@@ -78,6 +91,14 @@ class SlicesOptionsWidget(QWidget):
         hor = int(self.slider_horizontal.get_value())
         return hor, vert
 
+    def get_band_width(self) -> int:
+        """Return the width of the band of the profiles in pixels."""
+        return int(self.slider_band_width.get_value())
+
+    def get_angle(self) -> float:
+        """Return the angle of the first profile in degrees (0 for a row)."""
+        return float(self.slider_angle.get_value())
+
     def get_selection(self, image: np.ndarray):
         k_size = self.kernel_choice.get_kernel_size()
         if self.filter == Smooth.BLUR:
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""*timing_widget.py* file.
+
+This file contains graphical elements to display the diagnostics of the frame
+timing (inter-frame intervals, jitter, dropped frames).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+from lensepy import translate
+from lensepy.css import *
+from lensepy.pyqt6.widget_xy_chart import *
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout,
+    QLabel, QPushButton, QMainWindow
+)
+from PyQt6.QtCore import pyqtSignal
+from processing.frame_timing import FrameTimingAnalyzer
+
+# Number of drops displayed in the log
+NB_DROPS_DISPLAYED = 10
+
+
+class FrameTimingOptionsWidget(QWidget):
+    """
+    Options widget of the frame timing diagnostics menu.
+    """
+
+    timing_changed = pyqtSignal(str)
+
+    def __init__(self, parent):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        """
+        super().__init__(parent=None)
+        self.parent = parent
+        self.layout = QVBoxLayout()
+
+        # Title
+        # -----
+        self.label_title_timing = QLabel(translate('title_frame_timing'))
+        self.label_title_timing.setStyleSheet(styleH1)
+
+        # Statistics
+        # ----------
+        self.label_frames = QLabel('')
+        self.label_frames.setStyleSheet(styleH2)
+        self.label_intervals = QLabel('')
+        self.label_intervals.setStyleSheet(styleH3)
+        self.label_jitter = QLabel('')
+        self.label_jitter.setStyleSheet(styleH3)
+
+        self.reset_button = QPushButton(translate('button_reset_timing'))
+        self.reset_button.setStyleSheet(unactived_button)
+        self.reset_button.setFixedHeight(BUTTON_HEIGHT)
+        self.reset_button.clicked.connect(self.clicked_action)
+
+        # Log of the dropped frames
+        # -------------------------
+        self.label_title_drops = QLabel(translate('label_drops_log'))
+        self.label_title_drops.setStyleSheet(styleH2)
+        self.label_drops = QLabel('')
+        self.label_drops.setStyleSheet(styleH3)
+
+        self.layout.addWidget(self.label_title_timing)
+        self.layout.addWidget(self.label_frames)
+        self.layout.addWidget(self.label_intervals)
+        self.layout.addWidget(self.label_jitter)
+        self.layout.addWidget(self.reset_button)
+        self.layout.addWidget(self.label_title_drops)
+        self.layout.addWidget(self.label_drops)
+        self.layout.addStretch()
+        self.setLayout(self.layout)
+
+    def clicked_action(self):
+        """Action performed when the reset button is clicked."""
+        self.timing_changed.emit('reset')
+
+    def set_statistics(self, stats: dict):
+        """
+        Display the statistics of the stream.
+        :param stats: Dictionary of statistics (see FrameTimingAnalyzer.get_statistics).
+        """
+        self.label_frames.setText(
+            f"{stats['nb_frames']} {translate('label_frames_received')} / "
+            f"{stats['nb_displayed']} {translate('label_frames_displayed')} / "
+            f"{stats['nb_dropped']} {translate('label_frames_dropped')} "
+            f"({stats['drop_rate']*100:.2f} %)")
+        if 'median' not in stats:
+            self.label_intervals.setText('')
+            self.label_jitter.setText('')
+            return
+        self.label_intervals.setText(
+            f"{stats['fps']:.1f} fps - {translate('label_interval')} : "
+            f"median = {stats['median']:.2f} ms / p90 = {stats['p90']:.2f} ms / "
+            f"p99 = {stats['p99']:.2f} ms / max = {stats['max']:.2f} ms")
+        self.label_jitter.setText(
+            f"{translate('label_jitter')} : p50 = {stats['jitter_p50']:.3f} ms / "
+            f"p90 = {stats['jitter_p90']:.3f} ms / p99 = {stats['jitter_p99']:.3f} ms")
+
+    def set_drops(self, drops: list):
+        """
+        Display the last dropped frames.
+        :param drops: Log of the dropped frames (see FrameTimingAnalyzer.get_drops).
+        """
+        lines = []
+        for drop in reversed(drops[-NB_DROPS_DISPLAYED:]):
+            frame_id = '-' if drop['frame_id'] is None else drop['frame_id']
+            lines.append(f"t = {drop['time']:.1f} s / # {frame_id} : "
+                         f"{drop['nb_dropped']} {translate('label_frames_dropped')} "
+                         f"({drop['interval_ms']:.1f} ms) - "
+                         f"{drop['mode']} : {drop['load_ms']:.1f} ms")
+        self.label_drops.setText('\n'.join(lines))
+
+
+class FrameTimingChartWidget(XYChartWidget):
+    """
+    Chart of the inter-frame intervals (time series or histogram).
+    The curve is updated, not rebuilt.
+    """
+
+    def __init__(self, parent, title: str = ''):
+        """
+        Default Constructor.
+        :param parent: Parent widget of the main widget.
+        :param title: Title of the chart.
+        """
+        super().__init__(parent=parent)
+        self.set_title(title)
+        self.set_background('white')
+        self.plot_chart_widget.showGrid(x=True, y=True)
+
+    def set_labels(self, x_label: str, y_label: str):
+        """Set the labels of the axis."""
+        self.plot_chart_widget.setLabel('bottom', x_label)
+        self.plot_chart_widget.setLabel('left', y_label)
+
+    def update_intervals(self, analyzer: FrameTimingAnalyzer):
+        """
+        Display the intervals as a function of the frame number.
+        :param analyzer: Timing analyzer of the stream.
+        """
+        x_view, y_view = analyzer.get_min_max_view()
+        if len(x_view) == 0:
+            return
+        self.plot_chart.setData(x_view, y_view)
+
+    def update_histogram(self, analyzer: FrameTimingAnalyzer, nb_bins: int = 50):
+        """
+        Display the histogram of the intervals.
+        :param analyzer: Timing analyzer of the stream.
+        :param nb_bins: Number of bins.
+        """
+        edges, hist = analyzer.get_histogram(nb_bins)
+        self.plot_chart.setData(edges, hist, stepMode='center',
+                                fillLevel=0, brush=self.brush)
+
+
+if __name__ == '__main__':
+    from PyQt6.QtWidgets import QApplication
+
+    class MyWindow(QMainWindow):
+        def __init__(self):
+            super().__init__()
+
+            self.setWindowTitle(translate("window_title_main_menu_widget"))
+            self.setGeometry(100, 200, 800, 600)
+
+            self.central_widget = FrameTimingOptionsWidget(self)
+            self.setCentralWidget(self.central_widget)
+
+
+    app = QApplication(sys.argv)
+    main = MyWindow()
+    main.show()
+    sys.exit(app.exec())
@@ -17,11 +17,14 @@ https://iogs-lense-ressources.github.io/camera-gui/contents/appli_CMOS_labwork.h
 Creation : sept/2023
 Modification : oct/2024
 """
-import cv2
+import sys
 import time
 import numpy as np
-from lensepy.images.conversion import quantize_image
 from matplotlib import pyplot as plt
+from pathlib import Path
+
+# Shared image processing package (appli/processing)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from widgets.main_widget import *
 from widgets.aoi_select_widget import get_aoi_array
@@ -29,7 +32,7 @@ from lensecam.camera_thread import CameraThread
 from lensecam.ids.camera_ids import get_bits_per_pixel
 from PyQt6.QtWidgets import QMainWindow, QApplication, QFileDialog
 from lensepy.images.processing import *
-from pathlib import Path
+from processing.operators import apply_operator, get_kernel, THRESHOLD_TYPES
 
 
 def save_file_path(default_file_path: str, file_name: str = "", dialog: bool = True) -> str:
@@ -505,7 +508,8 @@ class MainWindow(QMainWindow):
         aoi_array = get_aoi_array(self.image, self.aoi)
         if event == 'quantized':
             bit_depth = self.central_widget.options_widget.get_bits_depth()
-            quantized_image = quantize_image(aoi_array, bit_depth).squeeze()
+            quantized_image = apply_operator('quantization', aoi_array,
+                                             {'bit_depth': bit_depth}).squeeze()
             self.central_widget.top_right_widget.set_image_from_array(quantized_image << (8-bit_depth))
             self.central_widget.bot_right_widget.set_bit_depth(bit_depth, histo1=self.image_bits_depth)
             self.central_widget.bot_right_widget.set_images(aoi_array_raw.squeeze(), quantized_image)
@@ -515,7 +519,8 @@ class MainWindow(QMainWindow):
         aoi_array = get_aoi_array(self.image, self.aoi).squeeze()
         if event == 'resampled':
             sample_factor = self.central_widget.options_widget.get_sample_factor()
-            small_image, downsampled_image = downsample_and_upscale(aoi_array, sample_factor)
+            small_image, downsampled_image = apply_operator('sampling', aoi_array,
+                                                            {'factor': sample_factor})
             self.central_widget.top_right_widget.set_image_from_array(downsampled_image)
             self.central_widget.bot_right_widget.set_bit_depth(8)
             self.central_widget.bot_right_widget.set_images(aoi_array, small_image)
@@ -531,9 +536,9 @@ class MainWindow(QMainWindow):
 
         aoi_array = get_aoi_array(self.image, self.aoi)
         if self.central_widget.submode == 'contrast_brightness':
-            contrast_value = self.central_widget.options_widget.get_contrast()
-            brightness_value = self.central_widget.options_widget.get_brightness()
-            eroded = contrast_brightness_image(aoi_array, contrast_value, brightness_value)
+            params = {'contrast': self.central_widget.options_widget.get_contrast(),
+                      'brightness': self.central_widget.options_widget.get_brightness()}
+            eroded = apply_operator('contrast_brightness', aoi_array, params)
         else:
             eroded = aoi_array
         self.central_widget.bot_right_widget.set_bit_depth(8)
@@ -546,14 +551,9 @@ class MainWindow(QMainWindow):
         """Action performed when an event occurred in the erosion/dilation options widget."""
         aoi_array = get_aoi_array(self.image, self.aoi)
         delta_image_depth = (self.image_bits_depth - 8)  # Power of 2 for depth conversion
-        min_value = int(self.central_widget.options_widget.get_min() // 2**delta_image_depth)
-        max_value = int(self.central_widget.options_widget.get_max() // 2**delta_image_depth)
-        max_range = 255
-        gain = max_range/(max_value-min_value)
-        output_image = ((self.image.astype(np.int16)-min_value+1) * gain).astype(np.int16)
-        output_image[output_image > max_range] = 255
-        output_image[output_image <= 1] = 0
-        output_image = output_image.astype(np.uint8)
+        params = {'min': int(self.central_widget.options_widget.get_min() // 2**delta_image_depth),
+                  'max': int(self.central_widget.options_widget.get_max() // 2**delta_image_depth)}
+        output_image = apply_operator('enhance_contrast', aoi_array, params)
 
         self.central_widget.bot_right_widget.set_bit_depth(8)
         self.central_widget.bot_right_widget.set_images(aoi_array, output_image)
@@ -571,16 +571,11 @@ class MainWindow(QMainWindow):
         threshold_value = int(self.central_widget.options_widget.get_threshold_value())
         threshold_value_hat = int(self.central_widget.options_widget.get_threshold_hat_value())
 
-        if self.central_widget.submode == 1: # Normal threshold
-            ret, output_image = cv2.threshold(aoi_array_raw, threshold_value, 255, cv2.THRESH_BINARY)
-        elif self.central_widget.submode == 2: # Inverted threshold
-            ret, output_image = cv2.threshold(aoi_array_raw, threshold_value,
-                                              255, cv2.THRESH_BINARY_INV)
-        elif self.central_widget.submode == 3: # Hat threshold
-            output_image = cv2.inRange(aoi_array_raw, threshold_value, threshold_value_hat)
-        else:
-            delta_depth = self.image_bits_depth - 8
-            output_image = (aoi_array_raw >> delta_depth).astype(np.uint8)
+        submode = self.central_widget.submode
+        params = {'type': THRESHOLD_TYPES[submode] if submode in (1, 2, 3) else None,
+                  'value': threshold_value, 'value_hat': threshold_value_hat,
+                  'bit_depth': self.image_bits_depth}
+        output_image = apply_operator('threshold', aoi_array_raw, params)
 
         self.central_widget.bot_right_widget.set_bit_depth(self.image_bits_depth)
         self.central_widget.bot_right_widget.set_image(aoi_array_raw, fast_mode=True)
@@ -614,14 +609,8 @@ class MainWindow(QMainWindow):
             self.kernel_type = 'ellip'
 
         kernel = self.central_widget.options_widget.get_kernel().T
-        if self.kernel_type == 'cross':
-            kernel = get_cross_kernel(kernel.shape[0])
-            self.central_widget.options_widget.set_kernel(kernel)
-        elif self.kernel_type == 'rect':
-            kernel = get_rect_kernel(kernel.shape[0])
-            self.central_widget.options_widget.set_kernel(kernel)
-        elif self.kernel_type == 'ellip':
-            kernel = get_ellip_kernel(kernel.shape[0])
+        if self.kernel_type in ('cross', 'rect', 'ellip'):
+            kernel = get_kernel(self.kernel_type, kernel.shape[0])
             self.central_widget.options_widget.set_kernel(kernel)
         else:
             self.central_widget.options_widget.inactivate_kernel()
@@ -629,18 +618,8 @@ class MainWindow(QMainWindow):
         self.central_widget.options_widget.repaint()
 
         aoi_array = get_aoi_array(self.image, self.aoi)
-        if self.central_widget.submode == 'erosion':
-            eroded = erode_image(aoi_array, kernel)
-        elif self.central_widget.submode == 'dilation':
-            eroded = dilate_image(aoi_array, kernel)
-        elif self.central_widget.submode == 'opening':
-            eroded = opening_image(aoi_array, kernel)
-        elif self.central_widget.submode == 'closing':
-            eroded = closing_image(aoi_array, kernel)
-        elif self.central_widget.submode == 'gradient':
-            eroded = gradient_image(aoi_array, kernel)
-        else:
-            eroded = aoi_array
+        eroded = apply_operator('morphology', aoi_array,
+                                {'operation': self.central_widget.submode, 'kernel': kernel})
         self.central_widget.bot_right_widget.set_bit_depth(8)
         self.central_widget.bot_right_widget.set_images(aoi_array, eroded)
         if self.check_diff:
@@ -26,6 +26,7 @@ from matplotlib import pyplot as plt
 
 # TO MOVE TO LENSEPY.PYQT6
 from lensepy.images.processing import *
+from processing.operators import smooth
 from enum import Enum
 
 class Kernel(Enum):
@@ -40,6 +41,8 @@ class Smooth(Enum):
     GAUSS = 2
     MEDIAN = 3
 
+SMOOTH_FILTER_NAMES = {Smooth.BLUR: 'blur', Smooth.GAUSS: 'gaussian', Smooth.MEDIAN: 'median'}
+
 class KernelChoiceWidget(QWidget):
     """
     Widget containing the kernel choice options.
@@ -259,18 +262,14 @@ class SmoothFilterOptionsWidget(QWidget):
 
         self.options_changed.emit('smooth_filter')
 
+    def get_params(self) -> dict:
+        """Return the parameters of the selected filter (see processing.operators.smooth)."""
+        return {'filter': SMOOTH_FILTER_NAMES.get(self.filter),
+                'kernel_size': self.kernel_choice.get_kernel_size(),
+                'sigma': self.slider_sigma.get_value()}
+
     def get_selection(self, image: np.ndarray):
-        k_size = self.kernel_choice.get_kernel_size()
-        if self.filter == Smooth.BLUR:
-            output_image = cv2.blur(image, (k_size, k_size))
-        elif self.filter == Smooth.GAUSS:
-            sigma_x = self.slider_sigma.get_value()
-            output_image = cv2.GaussianBlur(image, (k_size, k_size), sigmaX=sigma_x)
-        elif self.filter == Smooth.MEDIAN:
-            output_image = cv2.medianBlur(image, k_size)
-        else:
-            return None
-        return output_image
+        return smooth(image, self.get_params())
 
 
 if __name__ == '__main__':
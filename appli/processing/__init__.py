@@ -0,0 +1,26 @@
+__all__ = [
+    "auto_exposure",
+    "averaging",
+    "batch",
+    "corners",
+    "drift",
+    "edges",
+    "focus",
+    "frame_timing",
+    "frequency",
+    "lut",
+    "matching",
+    "morphology",
+    "mtf",
+    "noise",
+    "operators",
+    "particles",
+    "pipeline",
+    "profiles",
+    "quantization",
+    "sampling",
+    "scheduler",
+    "segmentation",
+    "tiling",
+    "timeseries",
+]
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""*auto_exposure.py* file.
+
+This file contains a closed-loop auto-exposure controller.
+
+At each frame, statistics (mean and histogram percentile) are computed on a strided
+subsample of the AOI (1 pixel every 'stride' pixels in each direction) and cached.
+The exposure time is then multiplied by (target / measure) ** gain :
+- the response of the sensor is linear, so a gain of 1 converges in one step,
+  a gain < 1 damps the loop,
+- a deadband with hysteresis avoids oscillations between 2 close values : the loop
+  starts when the error is greater than 'tolerance' and stops when it is lower
+  than 'tolerance' / 4,
+- the correction ratio is limited, and halved when the measure is saturated,
+- after each change, the frames acquired with the old exposure time are ignored
+  (see processing.scheduler.SettleTracker).
+
+The controller only returns the new exposure time : the camera write is done
+by the acquisition thread, once per frame, with the last requested value.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import numpy as np
+from processing.scheduler import SettleTracker
+
+AUTO_EXPOSURE_METRICS = ['mean', 'percentile']
+
+
+def get_subsampled_statistics(image: np.ndarray, aoi: tuple = None, stride: int = 4,
+                              percentile: float = 99, bit_depth: int = 8) -> dict:
+    """
+    Return the statistics of a strided subsample of an image.
+    :param image: Image (unsigned integers). RGB images are converted to their maximum channel.
+    :param aoi: Area of interest (x, y, w, h). Default None for the whole image.
+    :param stride: Step between 2 pixels of the subsample.
+    :param percentile: Percentile of the histogram to compute (0 to 100).
+    :param bit_depth: Bit depth of the image.
+    :return: Dictionary with 'mean' and 'percentile' values, normalized to full scale (0 to 1).
+    """
+    if aoi is not None:
+        x, y, w, h = aoi
+        image = image[y:y+h, x:x+w]
+    subsample = image[::stride, ::stride]
+    if subsample.ndim > 2:
+        subsample = subsample.max(axis=2)
+    full_scale = 2 ** bit_depth - 1
+    hist = np.bincount(subsample.ravel(), minlength=full_scale + 1)
+    cumulative = np.cumsum(hist)
+    rank = percentile / 100 * (cumulative[-1] - 1)
+    value = int(np.searchsorted(cumulative, rank, side='right'))
+    mean = np.dot(hist, np.arange(len(hist))) / max(1, cumulative[-1])
+    return {'mean': float(mean) / full_scale,
+            'percentile': min(value, full_scale) / full_scale}
+
+
+class AutoExposureController:
+    """
+    Closed-loop control of the exposure time.
+    """
+
+    def __init__(self, target: float = 0.8, metric: str = 'percentile', percentile: float = 99,
+                 stride: int = 4, gain: float = 0.8, tolerance: float = 0.05,
+                 max_ratio: float = 4.0, settle_frames: int = 2):
+        """
+        Default Constructor.
+        :param target: Target value of the metric, normalized to full scale (0 to 1).
+        :param metric: 'mean' or 'percentile'.
+        :param percentile: Percentile of the histogram (0 to 100) for the 'percentile' metric.
+        :param stride: Step between 2 pixels of the subsample.
+        :param gain: Exponent of the correction ratio (1: one step for a linear sensor).
+        :param tolerance: Relative deadband around the target (the loop starts above it).
+        :param max_ratio: Maximum correction ratio of the exposure time per step.
+        :param settle_frames: Number of frames to ignore after a change.
+        """
+        self.enabled = False
+        self.target = 0.8
+        self.metric = 'percentile'
+        self.percentile = percentile
+        self.stride = max(1, int(stride))
+        self.gain = gain
+        self.tolerance = tolerance
+        self.max_ratio = max_ratio
+        self.min_exposure = 10
+        self.max_exposure = 2000000
+        self.bit_depth = 8
+        self.aoi = None
+        self.exposure = None
+        self.statistics = None      # Cached statistics of the last frame
+        self.converged = False
+        self.tracker = SettleTracker(settle_frames)
+        self.set_target(target)
+        self.set_metric(metric)
+
+    def set_enabled(self, value: bool = True):
+        """Enable or disable the controller."""
+        self.enabled = value
+        self.converged = False
+        self.tracker.arm()
+
+    def set_target(self, target: float):
+        """
+        Set the target value of the metric.
+        :param target: Target value, normalized to full scale (0 to 1).
+        """
+        self.target = float(np.clip(target, 0.01, 0.99))
+
+    def set_metric(self, metric: str):
+        """
+        Set the metric to control.
+        :param metric: 'mean' or 'percentile'.
+        """
+        if metric not in AUTO_EXPOSURE_METRICS:
+            raise ValueError(f'Metric must be in {AUTO_EXPOSURE_METRICS}')
+        self.metric = metric
+
+    def set_exposure_range(self, min_exposure: float, max_exposure: float):
+        """Set the range of the exposure time in microseconds."""
+        self.min_exposure = min_exposure
+        self.max_exposure = max_exposure
+
+    def set_exposure(self, exposure: float):
+        """
+        Set the actual exposure time of the camera (changed by the user).
+        :param exposure: Exposure time in microseconds.
+        """
+        self.exposure = exposure
+        self.tracker.arm()
+
+    def update(self, image: np.ndarray):
+        """
+        Process a new frame.
+        :param image: New frame (raw data).
+        :return: New exposure time in microseconds, or None if no change is required.
+        """
+        if not self.enabled or self.exposure is None:
+            return None
+        if not self.tracker.add_frame():
+            return None
+        self.statistics = get_subsampled_statistics(image, self.aoi, self.stride,
+                                                    self.percentile, self.bit_depth)
+        measure = self.statistics[self.metric]
+        error = abs(measure - self.target) / self.target
+        if error <= self.tolerance / 4 or (self.converged and error <= self.tolerance):
+            self.converged = True
+            return None
+        self.converged = False
+        if measure >= 0.99:     # Saturated : the measure is not proportional to the exposure
+            ratio = 0.5
+        elif measure <= 0:
+            ratio = self.max_ratio
+        else:
+            ratio = (self.target / measure) ** self.gain
+        ratio = float(np.clip(ratio, 1 / self.max_ratio, self.max_ratio))
+        exposure = float(np.clip(self.exposure * ratio, self.min_exposure, self.max_exposure))
+        if abs(exposure - self.exposure) < 0.01 * self.exposure:
+            return None     # Step too small or limit of the range reached
+        self.exposure = exposure
+        self.tracker.arm()
+        return exposure
+
+
+if __name__ == '__main__':
+    # Simulated linear sensor with a black level : signal = flux x exposure.
+    rng = np.random.default_rng(0)
+    flux = rng.uniform(0, 0.02, (1200, 1920))
+    controller = AutoExposureController(target=0.5, metric='mean', settle_frames=0)
+    controller.bit_depth = 12
+    controller.set_exposure(1000)
+    controller.set_enabled()
+    for k in range(10):
+        image = np.clip(flux * controller.exposure + 16, 0, 4095).astype(np.uint16)
+        new_exposure = controller.update(image)
+        print(f'{k} : mean = {controller.statistics["mean"]:.3f} / exposure = {new_exposure}')
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""*averaging.py* file.
+
+This file contains tools to average (stack) the last frames of a live stream,
+in order to reduce temporal noise for low-light inspection.
+
+Two modes are available :
+- 'mean' : mean of the last N frames, computed with a running sum on a ring buffer.
+  Each new frame costs one subtraction and one addition, whatever N is.
+- 'ema' : exponential moving average with a smoothing factor alpha.
+
+Frames are kept at their native bit depth (8 bits or 12/16 bits) and the sum
+is stored in a wider accumulator (uint32 or uint64).
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import numpy as np
+
+AVERAGE_MODES = ['none', 'mean', 'ema']
+
+
+def get_accumulator_type(dtype: np.dtype, nb_frames: int) -> np.dtype:
+    """
+    Return the smallest unsigned type able to store the sum of nb_frames frames.
+    :param dtype: Type of the frames.
+    :param nb_frames: Number of frames to sum.
+    :return: Type of the accumulator.
+    """
+    max_value = int(np.iinfo(dtype).max) * nb_frames
+    if max_value <= np.iinfo(np.uint32).max:
+        return np.dtype(np.uint32)
+    return np.dtype(np.uint64)
+
+
+class FrameAverager:
+    """
+    Average of the last frames of a live stream.
+    """
+
+    def __init__(self, mode: str = 'none', nb_frames: int = 8, alpha: float = 0.2):
+        """
+        Default Constructor.
+        :param mode: Averaging mode - 'none', 'mean' or 'ema'.
+        :param nb_frames: Number of frames to average in 'mean' mode.
+        :param alpha: Smoothing factor of the 'ema' mode (0 < alpha <= 1).
+        """
+        self.mode = 'none'
+        self.nb_frames = 1
+        self.alpha = 1.0
+        # Buffers
+        self.__buffer = None        # Ring buffer of the last frames (native type)
+        self.__accumulator = None   # Running sum (mean) or running average (ema)
+        self.__output = None        # Temporary array for the division
+        self.__index = 0            # Next position in the ring buffer
+        self.__counter = 0          # Number of frames in the ring buffer
+        self.set_mode(mode)
+        self.set_nb_frames(nb_frames)
+        self.set_alpha(alpha)
+
+    def is_enabled(self) -> bool:
+        """Return True if an averaging mode is selected."""
+        return self.mode != 'none'
+
+    def set_mode(self, mode: str):
+        """
+        Set the averaging mode.
+        :param mode: Averaging mode - 'none', 'mean' or 'ema'.
+        """
+        if mode not in AVERAGE_MODES:
+            raise ValueError(f'Averaging mode must be in {AVERAGE_MODES}')
+        if mode != self.mode:
+            self.mode = mode
+            self.reset()
+
+    def set_nb_frames(self, nb_frames: int):
+        """
+        Set the number of frames to average in 'mean' mode.
+        :param nb_frames: Number of frames (1 or more).
+        """
+        nb_frames = max(1, int(nb_frames))
+        if nb_frames != self.nb_frames:
+            self.nb_frames = nb_frames
+            self.reset()
+
+    def set_alpha(self, alpha: float):
+        """
+        Set the smoothing factor of the 'ema' mode.
+        :param alpha: Smoothing factor (0 < alpha <= 1). 1 means no averaging.
+        """
+        self.alpha = float(np.clip(alpha, 1e-3, 1.0))
+
+    def get_counter(self) -> int:
+        """Return the number of frames currently in the average."""
+        return self.__counter
+
+    def reset(self):
+        """Clear all the frames stored in the buffers."""
+        self.__buffer = None
+        self.__accumulator = None
+        self.__output = None
+        self.__index = 0
+        self.__counter = 0
+
+    def __check_buffers(self, frame: np.ndarray):
+        """Allocate buffers if frame shape or type changed."""
+        if self.__accumulator is not None:
+            if (self.__accumulator.shape == frame.shape and
+                    (self.__buffer is None or self.__buffer.dtype == frame.dtype)):
+                return
+        self.reset()
+        if self.mode == 'mean':
+            acc_type = get_accumulator_type(frame.dtype, self.nb_frames)
+            self.__buffer = np.zeros((self.nb_frames,) + frame.shape, dtype=frame.dtype)
+            self.__accumulator = np.zeros(frame.shape, dtype=acc_type)
+            self.__output = np.zeros(frame.shape, dtype=acc_type)
+        elif self.mode == 'ema':
+            self.__accumulator = frame.astype(np.float32)
+            self.__output = np.zeros(frame.shape, dtype=np.float32)
+
+    def add_frame(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Add a new frame and return the averaged frame.
+        :param frame: New frame (unsigned integers, 8 to 16 bits).
+        :return: Averaged frame, same shape and type as the input frame.
+        """
+        if self.mode == 'none':
+            return frame
+        self.__check_buffers(frame)
+        if self.mode == 'mean':
+            return self.__add_frame_mean(frame)
+        return self.__add_frame_ema(frame)
+
+    def __add_frame_mean(self, frame: np.ndarray) -> np.ndarray:
+        """Running sum on the ring buffer - O(pixels) per frame."""
+        old_frame = self.__buffer[self.__index]
+        if self.__counter == self.nb_frames:
+            np.subtract(self.__accumulator, old_frame, out=self.__accumulator)
+        else:
+            self.__counter += 1
+        np.add(self.__accumulator, frame, out=self.__accumulator)
+        old_frame[...] = frame
+        self.__index = (self.__index + 1) % self.nb_frames
+        # Rounded integer division
+        np.add(self.__accumulator, self.__counter // 2, out=self.__output)
+        np.floor_divide(self.__output, self.__counter, out=self.__output)
+        return self.__output.astype(frame.dtype)
+
+    def __add_frame_ema(self, frame: np.ndarray) -> np.ndarray:
+        """Exponential moving average - acc = acc + alpha * (frame - acc)."""
+        if self.__counter > 0:
+            np.subtract(frame, self.__accumulator, out=self.__output)
+            np.multiply(self.__output, self.alpha, out=self.__output)
+            np.add(self.__accumulator, self.__output, out=self.__accumulator)
+        self.__counter += 1
+        np.rint(self.__accumulator, out=self.__output)
+        return self.__output.astype(frame.dtype)
+
+
+if __name__ == '__main__':
+    import time
+
+    averager = FrameAverager('mean', nb_frames=16)
+    image = np.random.randint(0, 4096, (1200, 1920), dtype=np.uint16)
+    t1 = time.perf_counter()
+    for k in range(50):
+        averaged = averager.add_frame(image)
+    t2 = time.perf_counter()
+    print(f'Mean of {averager.get_counter()} frames : {(t2-t1)/50*1000:.2f} ms / frame')
+    print(f'Max error = {np.max(np.abs(averaged.astype(int) - image))}')
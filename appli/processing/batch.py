@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""*batch.py* file.
+
+This file contains a command-line tool to process a folder of images with the
+same operators as the applications (see processing.operators).
+
+The processing is described in a text file, one operator per line, applied in order :
+
+    # operator;parameter=value;parameter=value
+    threshold;type=binary;value=128
+    morphology;operation=opening;kernel=ellip,5
+
+Values are converted to int, float, None or tuples (comma separated values).
+A 'kernel' parameter is given as shape,size ('cross', 'rect' or 'ellip').
+
+Files are split in chunks processed in parallel by a pool of processes (one per core,
+OpenCV limited to 1 thread per process). In each process, the next images are read
+by a thread while the actual one is processed (bounded prefetch), and the results
+are written by another thread (asynchronous writes).
+
+Usage (from the appli directory) :
+
+    python -m processing.batch pipeline.txt "Basler/images/*.jpg" -o output
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import argparse
+import glob
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import cv2
+import numpy as np
+from processing.operators import OPERATORS, apply_operator, get_kernel
+
+IMAGE_EXTENSIONS = ['.bmp', '.jpg', '.jpeg', '.png', '.pbm', '.pgm', '.tif', '.tiff']
+# Operators that do not return an image
+NO_IMAGE_OPERATORS = ['slices']
+
+
+def parse_value(text: str):
+    """
+    Convert a parameter value from a text.
+    :param text: Value ('None', int, float, string or comma separated values).
+    :return: Converted value.
+    """
+    text = text.strip()
+    if ',' in text:
+        return tuple(parse_value(value) for value in text.split(','))
+    if text == 'None':
+        return None
+    for value_type in (int, float):
+        try:
+            return value_type(text)
+        except ValueError:
+            pass
+    return text
+
+
+def load_batch_config(file_path: str) -> list:
+    """
+    Load a processing description (one operator per line).
+    :param file_path: Path of the text file.
+    :return: List of (operator name, parameters dictionary).
+    """
+    steps = []
+    with open(file_path, encoding='UTF-8') as file:
+        for line in file:
+            line = line.strip()
+            if line == '' or line.startswith('#'):
+                continue
+            fields = line.split(';')
+            name = fields[0].strip()
+            if name not in OPERATORS or name in NO_IMAGE_OPERATORS:
+                raise ValueError(f'Operator {name} can not be used in a batch')
+            params = {}
+            for field in fields[1:]:
+                if '=' not in field:
+                    continue
+                key, value = field.split('=', 1)
+                params[key.strip()] = parse_value(value)
+            if isinstance(params.get('kernel'), tuple):
+                shape, size = params['kernel']
+                params['kernel'] = get_kernel(shape, size)
+            steps.append((name, params))
+    return steps
+
+
+def apply_steps(image: np.ndarray, steps: list) -> np.ndarray:
+    """
+    Apply a list of operators to an image.
+    :param image: Array containing the image.
+    :param steps: List of (operator name, parameters dictionary).
+    :return: Processed image.
+    """
+    for name, params in steps:
+        result = apply_operator(name, image, params)
+        if name == 'sampling':
+            result = result[1]      # Image upscaled to the initial size
+        if result is not None:
+            image = result
+    return image
+
+
+def get_files(paths: list) -> list:
+    """
+    Return the image files of a list of directories, files or glob patterns.
+    :param paths: List of paths.
+    :return: Sorted list of files.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            path = os.path.join(path, '*')
+        files.extend(glob.glob(path))
+    files = [file for file in files if os.path.splitext(file)[1].lower() in IMAGE_EXTENSIONS]
+    return sorted(set(files))
+
+
+def get_output_path(file_path: str, output_dir: str, extension: str = None) -> str:
+    """Return the path of the processed image (image.jpg -> image.jpg.png for a new extension)."""
+    name = os.path.basename(file_path)
+    if extension is not None and not name.lower().endswith(extension.lower()):
+        name += extension
+    return os.path.join(output_dir, name)
+
+
+def init_worker():
+    """Initialize a process of the pool (no OpenCV threads in each process)."""
+    cv2.setNumThreads(1)
+
+
+def process_files(files: list, steps: list, output_dir: str, extension: str = None,
+                  prefetch: int = 4) -> list:
+    """
+    Process a list of files (in a process of the pool).
+    :param files: List of image files.
+    :param steps: List of (operator name, parameters dictionary).
+    :param output_dir: Directory of the processed images.
+    :param extension: Extension of the processed images. Default None (same as the input).
+    :param prefetch: Maximum number of images read in advance.
+    :return: List of (file, bytes read, error message or None).
+    """
+    results = []
+    with ThreadPoolExecutor(1) as reader, ThreadPoolExecutor(1) as writer:
+        reading = deque(reader.submit(cv2.imread, file, cv2.IMREAD_ANYDEPTH)
+                        for file in files[:prefetch])
+        writing = []
+        for k, file in enumerate(files):
+            image = reading.popleft().result()
+            if k + prefetch < len(files):
+                reading.append(reader.submit(cv2.imread, files[k + prefetch],
+                                             cv2.IMREAD_ANYDEPTH))
+            if image is None:
+                results.append((file, 0, 'read error'))
+                continue
+            try:
+                output = apply_steps(image, steps)
+            except Exception as e:
+                results.append((file, image.nbytes, str(e)))
+                continue
+            output_path = get_output_path(file, output_dir, extension)
+            writing.append((file, image.nbytes, writer.submit(cv2.imwrite, output_path, output)))
+        for file, nb_bytes, future in writing:
+            results.append((file, nb_bytes, None if future.result() else 'write error'))
+    return results
+
+
+def run_batch(files: list, steps: list, output_dir: str, extension: str = None,
+              nb_workers: int = None, chunk_size: int = None, prefetch: int = 4,
+              verbose: bool = True) -> dict:
+    """
+    Process files in parallel.
+    :param files: List of image files.
+    :param steps: List of (operator name, parameters dictionary).
+    :param output_dir: Directory of the processed images (created if required).
+    :param extension: Extension of the processed images. Default None (same as the input).
+    :param nb_workers: Number of processes. Default None (number of cores).
+    :param chunk_size: Number of files sent to a process at once.
+        Default None (about 4 chunks per process, 16 files max).
+    :param prefetch: Maximum number of images read in advance in each process.
+    :param verbose: True to print the progress.
+    :return: Dictionary with 'nb_images', 'nb_errors', 'errors', 'time' (s),
+        'images_per_s' and 'mb_per_s' (decoded data).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    nb_workers = nb_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = int(np.clip(len(files) // (4 * nb_workers), 1, 16))
+    chunks = [files[k:k + chunk_size] for k in range(0, len(files), chunk_size)]
+    nb_images, nb_bytes, errors = 0, 0, []
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(nb_workers, initializer=init_worker) as pool:
+        futures = [pool.submit(process_files, chunk, steps, output_dir, extension, prefetch)
+                   for chunk in chunks]
+        for future in as_completed(futures):
+            for file, file_bytes, error in future.result():
+                if error is None:
+                    nb_images += 1
+                    nb_bytes += file_bytes
+                else:
+                    errors.append((file, error))
+            if verbose:
+                elapsed = time.perf_counter() - start_time
+                print(f'{nb_images + len(errors)}/{len(files)} images - '
+                      f'{nb_images / elapsed:.1f} images/s')
+    elapsed = time.perf_counter() - start_time
+    return {'nb_images': nb_images, 'nb_errors': len(errors), 'errors': errors,
+            'time': elapsed, 'images_per_s': nb_images / elapsed,
+            'mb_per_s': nb_bytes / elapsed / 1e6}
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Process a folder of images with the '
+                                                 'operators of the applications.')
+    parser.add_argument('config', help='Processing description (one operator per line)')
+    parser.add_argument('paths', nargs='+', help='Directories, files or glob patterns')
+    parser.add_argument('-o', '--output', default='output', help='Output directory')
+    parser.add_argument('-e', '--extension', default=None,
+                        help='Extension of the processed images (.png...)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Number of processes')
+    parser.add_argument('--chunk', type=int, default=None, help='Files per task')
+    parser.add_argument('--prefetch', type=int, default=4, help='Images read in advance')
+    args = parser.parse_args()
+
+    steps = load_batch_config(args.config)
+    files = get_files(args.paths)
+    if len(files) == 0:
+        print('No image to process')
+        return
+    report = run_batch(files, steps, args.output, args.extension, args.jobs,
+                       args.chunk, args.prefetch)
+    for file, error in report['errors']:
+        print(f'{file} : {error}')
+    print(f'{report["nb_images"]} images in {report["time"]:.2f} s - '
+          f'{report["images_per_s"]:.1f} images/s - {report["mb_per_s"]:.1f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""*corners.py* file.
+
+This file contains a corner detector (Harris or Shi-Tomasi) :
+- corner response of each pixel (cv2.cornerHarris or cv2.cornerMinEigenVal),
+- non-maximum suppression without loops : a pixel is a local maximum if it is equal
+  to the dilation of the response (maximum in a square window), only one pixel is
+  kept for plateaus of equal maxima,
+- selection of the K best corners with numpy.argpartition (O(N) instead of a sort),
+- sub-pixel refinement (cv2.cornerSubPix).
+
+Corners are returned as a compact (N, 2) float32 array of (x, y) coordinates.
+
+In budget mode, the corners of the previous frame are tracked with the pyramidal
+Lucas-Kanade optical flow instead of a full detection : a new detection is only done
+every 'redetect_period' frames or when too many corners were lost.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+from processing.edges import draw_points
+
+CORNER_METHODS = ['harris', 'shi_tomasi']
+# Stop criteria of the sub-pixel refinement
+SUBPIX_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_COUNT, 20, 0.01)
+
+
+def get_corner_response(image: np.ndarray, method: str = 'harris', block_size: int = 3,
+                        kernel_size: int = 3, k: float = 0.04) -> np.ndarray:
+    """
+    Return the corner response of each pixel.
+    :param image: Array containing the image (8 bits).
+    :param method: 'harris' or 'shi_tomasi' (minimum eigenvalue).
+    :param block_size: Size of the neighbourhood.
+    :param kernel_size: Size of the Sobel kernel.
+    :param k: Free parameter of the Harris detector.
+    :return: Response (float32), same shape as the image.
+    """
+    if method == 'shi_tomasi':
+        return cv2.cornerMinEigenVal(image, block_size, ksize=kernel_size)
+    return cv2.cornerHarris(image, block_size, kernel_size, k)
+
+
+def non_maximum_suppression(response: np.ndarray, min_distance: int = 5,
+                            quality: float = 0.01) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the local maxima of a response.
+    :param response: Corner response (float32).
+    :param min_distance: Radius of the window in pixels.
+    :param quality: Minimum response, ratio of the maximum response.
+    :return: Coordinates (x, y) of the maxima, shape (N, 2), and their response.
+    """
+    size = 2 * min_distance + 1
+    dilated = cv2.dilate(response, cv2.getStructuringElement(cv2.MORPH_RECT, (size, size)))
+    maxima = (response == dilated) & (response > quality * float(response.max()))
+    points = cv2.findNonZero(maxima.view(np.uint8))
+    if points is None:
+        return np.zeros((0, 2), dtype=np.int32), np.zeros(0, dtype=np.float32)
+    points = points.reshape(-1, 2)
+    # Plateaus (neighbour pixels with the same response) : a maximum is removed if a
+    # previous neighbour in the raster order is also a maximum
+    width = response.shape[1]
+    index = points[:, 1].astype(np.int64) * width + points[:, 0]
+    previous = index - np.array([[1], [width - 1], [width], [width + 1]])
+    # Left, upper-right, upper, upper-left : no neighbour across the row boundaries
+    x = points[:, 0]
+    valid = np.array([x > 0, x < width - 1, np.ones(len(x), dtype=bool), x > 0])
+    points = points[~(np.isin(previous, index) & valid).any(axis=0)]
+    return points, response[points[:, 1], points[:, 0]]
+
+
+def select_best(points: np.ndarray, scores: np.ndarray, max_number: int) -> np.ndarray:
+    """
+    Return the points with the highest scores.
+    :param points: Array of points, shape (N, 2).
+    :param scores: Scores of the points.
+    :param max_number: Maximum number of points.
+    :return: Selected points (sorted by decreasing score).
+    """
+    if len(points) > max_number:
+        best = np.argpartition(scores, -max_number)[-max_number:]
+        points, scores = points[best], scores[best]
+    return points[np.argsort(scores)[::-1]]
+
+
+def detect_corners(image: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Corner detection (same interface as the operators).
+    :param image: Array containing the image (8 bits).
+    :param params: 'method' - 'harris' or 'shi_tomasi', 'max_corners' - maximum number of
+        corners, 'min_distance' - minimum distance between corners, 'quality' - minimum
+        response (ratio of the maximum), 'block_size', 'subpix' - True for the sub-pixel
+        refinement.
+    :return: Corners (x, y), float32 array of shape (N, 2).
+    """
+    response = get_corner_response(image, params.get('method', 'harris'),
+                                   params.get('block_size', 3))
+    points, scores = non_maximum_suppression(response, params.get('min_distance', 5),
+                                             params.get('quality', 0.01))
+    corners = select_best(points, scores, params.get('max_corners', 100)).astype(np.float32)
+    if params.get('subpix', True) and len(corners) > 0:
+        corners = cv2.cornerSubPix(image, corners.reshape(-1, 1, 2), (5, 5), (-1, -1),
+                                   SUBPIX_CRITERIA).reshape(-1, 2)
+    return corners
+
+
+def get_marker_points(corners: np.ndarray, shape: tuple, size: int = 4) -> np.ndarray:
+    """
+    Return the pixels of cross markers centered on points.
+    :param corners: Points (x, y), shape (N, 2).
+    :param shape: Shape of the image (height, width).
+    :param size: Half size of the markers.
+    :return: Pixels (x, y) of the markers, inside the image, shape (M, 2).
+    """
+    offsets = np.arange(-size, size + 1)
+    zeros = np.zeros_like(offsets)
+    cross = np.concatenate((np.stack((offsets, zeros), axis=1), np.stack((zeros, offsets), axis=1)))
+    points = (np.round(corners).astype(np.int32)[:, np.newaxis, :] + cross).reshape(-1, 2)
+    inside = ((points[:, 0] >= 0) & (points[:, 0] < shape[1]) &
+              (points[:, 1] >= 0) & (points[:, 1] < shape[0]))
+    return points[inside]
+
+
+def draw_corners(image: np.ndarray, corners: np.ndarray, color: tuple = (0, 255, 0),
+                 size: int = 4) -> np.ndarray:
+    """
+    Draw cross markers over an image.
+    :param image: Array containing the image (8 bits, gray or RGB).
+    :param corners: Corners (x, y), shape (N, 2).
+    :param color: RGB color of the markers.
+    :param size: Half size of the markers.
+    :return: RGB image.
+    """
+    return draw_points(image, get_marker_points(corners, image.shape, size), color)
+
+
+class CornerTracker:
+    """
+    Corner detection with an optional tracking budget : corners of the previous frame
+    are tracked (Lucas-Kanade optical flow) instead of being detected again.
+    """
+
+    def __init__(self, redetect_period: int = 10, min_tracked_ratio: float = 0.7):
+        """
+        Default Constructor.
+        :param redetect_period: Maximum number of frames between 2 detections.
+        :param min_tracked_ratio: A new detection is done if less than this ratio
+            of the detected corners are still tracked.
+        """
+        self.redetect_period = redetect_period
+        self.min_tracked_ratio = min_tracked_ratio
+        self.reset()
+
+    def reset(self):
+        """Force a new detection on the next frame."""
+        self.previous_image = None
+        self.corners = np.zeros((0, 2), dtype=np.float32)
+        self.nb_detected = 0
+        self.nb_frames = 0
+        self.tracked = False    # True if the last corners were tracked
+
+    def __call__(self, image: np.ndarray, params: dict) -> np.ndarray:
+        """
+        Detect or track the corners (same interface as the operators).
+        :param image: Array containing the image (8 bits).
+        :param params: See detect_corners, and 'track' - True for the budget mode.
+        :return: Corners (x, y), float32 array of shape (N, 2).
+        """
+        self.tracked = False
+        if (params.get('track', False) and self.previous_image is not None
+                and self.previous_image.shape == image.shape
+                and self.nb_frames < self.redetect_period and len(self.corners) > 0):
+            corners, status, _ = cv2.calcOpticalFlowPyrLK(self.previous_image, image,
+                                                          self.corners.reshape(-1, 1, 2), None)
+            corners = corners.reshape(-1, 2)[status.ravel() == 1]
+            if len(corners) >= self.min_tracked_ratio * self.nb_detected:
+                self.corners = corners
+                self.tracked = True
+        if not self.tracked:
+            self.corners = detect_corners(image, params)
+            self.nb_detected = len(self.corners)
+            self.nb_frames = 0
+        self.nb_frames += 1
+        self.previous_image = image.copy()
+        return self.corners
+
+
+if __name__ == '__main__':
+    import time
+
+    # Maxima at the borders of the rows are not neighbours of the previous row
+    response = np.zeros((5, 6), dtype=np.float32)
+    response[2, 0] = response[1, 5] = response[0, 5] = 1
+    maxima, _ = non_maximum_suppression(response, min_distance=1)
+    assert sorted(maxima.tolist()) == [[0, 2], [5, 0]], maxima
+
+    # Shifted checkerboard
+    board = (np.indices((20, 20)).sum(axis=0) % 2 * 200 + 30).astype(np.uint8)
+    image = cv2.GaussianBlur(cv2.resize(board, (1000, 1000), interpolation=cv2.INTER_NEAREST),
+                             (5, 5), 1)
+    image = cv2.add(image, np.random.default_rng(0).integers(0, 10, image.shape, dtype=np.uint8))
+    params = {'method': 'harris', 'max_corners': 500, 'min_distance': 10, 'quality': 0.05}
+    t1 = time.perf_counter()
+    for k in range(10):
+        corners = detect_corners(image, params)
+    t2 = time.perf_counter()
+    tracker = CornerTracker()
+    for k in range(10):
+        tracked = tracker(np.roll(image, k, axis=1), {**params, 'track': True})
+    t3 = time.perf_counter()
+    for k in range(10):
+        overlay = draw_corners(image, corners)
+    t4 = time.perf_counter()
+    print(f'Detection (1 MP) : {(t2-t1)*100:.2f} ms - {len(corners)} corners')
+    print(f'Detection + tracking (1 MP) : {(t3-t2)*100:.2f} ms - {len(tracked)} corners')
+    print(f'Overlay : {(t4-t3)*100:.2f} ms')
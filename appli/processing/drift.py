@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""*drift.py* file.
+
+This file contains the measurement of the drift and of the vibrations of a setup :
+each frame (or its AOI) is registered against a reference frame by phase correlation,
+with a sub-pixel position of the correlation peak.
+
+- The image is centered (mean removed) and multiplied by a Hanning window, to
+  remove the discontinuities at the borders of the image.
+- The cross-power spectrum of the image and of the reference is normalized (only
+  the phase is kept) and multiplied by a gaussian profile of the frequencies : the
+  correlation peak is a gaussian of PEAK_SIGMA pixels, instead of a noisy Dirac
+  peak, and its position is given by a parabola through the logarithm of the best
+  value and of its 2 neighbours (exact for a gaussian peak).
+- The window, the gaussian profile and the buffers are allocated once per shape.
+  Large AOI are cropped (centered) to a size of at most DRIFT_MAX_SIZE pixels, with
+  small prime factors (faster FFT).
+
+The shifts (dx, dy) are stored in a time series with a constant memory (ring buffer
+of the last samples and min/max view of the whole history, see processing.timeseries),
+with the time of each frame : the drift can be monitored over hours. The spectrum
+of the last samples gives the frequencies of the vibrations.
+
+Shifts are in pixels : positive dx when the image moves to the right, positive dy
+when the image moves to the bottom.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import time
+import cv2
+import numpy as np
+from processing.frequency import rfft, rfft2, irfft2
+from processing.timeseries import TimeSeriesBuffer
+
+# Maximum size of the registered image (centered crop of the AOI)
+DRIFT_MAX_SIZE = 512
+# Width of the correlation peak in pixels (gaussian profile of the frequencies)
+PEAK_SIGMA = 2.0
+# Number of samples stored at full resolution (trace and spectrum)
+DRIFT_CAPACITY = 8192
+# Maximum number of points of the min/max view of the whole history
+DRIFT_MAX_POINTS = 2000
+# Number of samples of the spectrum of the vibrations
+DRIFT_SPECTRUM_SAMPLES = 2048
+
+
+def get_fft_size(size: int) -> int:
+    """
+    Return the largest size lower or equal to size with only 2, 3 and 5 as prime factors.
+    :param size: Maximum size.
+    """
+    for n in range(int(size), 1, -1):
+        value = n
+        for factor in (2, 3, 5):
+            while value % factor == 0:
+                value //= factor
+        if value == 1:
+            return n
+    return max(1, int(size))
+
+
+def get_gaussian_peak(left: float, center: float, right: float) -> float:
+    """
+    Sub-pixel position of a gaussian peak, from the best value and its 2 neighbours.
+    :return: Offset from the best position, in [-0.5, 0.5].
+    """
+    if min(left, center, right) <= 0:
+        # Not a gaussian peak (noise) : parabola through the values
+        denominator = left - 2 * center + right
+        if denominator >= 0:
+            return 0.0
+        return float(np.clip(0.5 * (left - right) / denominator, -0.5, 0.5))
+    left, center, right = np.log(left), np.log(center), np.log(right)
+    denominator = left - 2 * center + right
+    if denominator >= 0:
+        return 0.0
+    return float(np.clip(0.5 * (left - right) / denominator, -0.5, 0.5))
+
+
+class PhaseCorrelator:
+    """
+    Sub-pixel registration of images against a reference, by phase correlation.
+    """
+
+    def __init__(self, max_size: int = DRIFT_MAX_SIZE, sigma: float = PEAK_SIGMA):
+        """
+        Default Constructor.
+        :param max_size: Maximum size of the registered images (centered crop).
+        :param sigma: Width of the correlation peak in pixels.
+        """
+        self.max_size = max_size
+        self.sigma = sigma
+        self.image_shape = None
+        self.shape = None
+        self.reference = None
+
+    def allocate(self, image_shape: tuple):
+        """
+        Allocate the window, the gaussian profile and the buffers (only for a new shape).
+        :param image_shape: Shape of the images (height, width).
+        """
+        if image_shape == self.image_shape:
+            return
+        self.image_shape = image_shape
+        height, width = [get_fft_size(min(size, self.max_size)) for size in image_shape]
+        self.shape = (height, width)
+        self.top = (image_shape[0] - height) // 2
+        self.left = (image_shape[1] - width) // 2
+        self.window = cv2.createHanningWindow((width, height), cv2.CV_32F)
+        self.input = np.empty(self.shape, dtype=np.float32)
+        fx = np.fft.rfftfreq(width).astype(np.float32)[np.newaxis, :]
+        fy = np.fft.fftfreq(height).astype(np.float32)[:, np.newaxis]
+        self.profile = np.exp(-2 * np.pi ** 2 * self.sigma ** 2 * (fx * fx + fy * fy))
+        # Value of the correlation peak for identical images (response of 1)
+        self.peak_value = float(irfft2(self.profile, self.shape)[0, 0])
+        self.reference = None
+
+    def transform(self, image: np.ndarray) -> np.ndarray:
+        """
+        Spectrum of the windowed image.
+        :param image: Array containing the image (gray or RGB).
+        :return: Half plane of the spectrum.
+        """
+        if image.ndim == 3:
+            image = image.mean(axis=2)
+        self.allocate(image.shape[:2])
+        height, width = self.shape
+        np.copyto(self.input, image[self.top:self.top + height, self.left:self.left + width],
+                  casting='unsafe')
+        self.input -= self.input.mean()
+        self.input *= self.window
+        return rfft2(self.input)
+
+    def set_reference(self, image: np.ndarray):
+        """
+        Set the reference image.
+        :param image: Array containing the image (gray).
+        """
+        self.reference = np.conj(self.transform(image))
+
+    def register(self, image: np.ndarray) -> tuple[float, float, float]:
+        """
+        Shift of an image relative to the reference image.
+        :param image: Array containing the image (gray, same shape as the reference).
+        :return: Horizontal and vertical shifts in pixels, and response of the correlation
+            (1 for identical images, close to 0 if the images are not correlated).
+        """
+        spectrum = self.transform(image)
+        if self.reference is None:
+            raise ValueError('No reference image for this shape')
+        spectrum *= self.reference
+        spectrum /= np.abs(spectrum) + 1e-12
+        spectrum *= self.profile
+        correlation = irfft2(spectrum, self.shape)
+        height, width = self.shape
+        y, x = np.unravel_index(int(np.argmax(correlation)), self.shape)
+        value = correlation[y, x]
+        dx = get_gaussian_peak(correlation[y, x - 1], value, correlation[y, (x + 1) % width])
+        dy = get_gaussian_peak(correlation[y - 1, x], value, correlation[(y + 1) % height, x])
+        # Positions after the half of the image are negative shifts (circular correlation)
+        x = x - width if x > width // 2 else x
+        y = y - height if y > height // 2 else y
+        return x + dx, y + dy, float(value / self.peak_value)
+
+
+class DriftMonitor:
+    """
+    Shifts of the frames relative to a reference, logged with a constant memory.
+    """
+
+    def __init__(self, capacity: int = DRIFT_CAPACITY, max_points: int = DRIFT_MAX_POINTS,
+                 max_size: int = DRIFT_MAX_SIZE):
+        """
+        Default Constructor.
+        :param capacity: Number of samples stored at full resolution.
+        :param max_points: Maximum number of points of the view of the whole history.
+        :param max_size: Maximum size of the registered images.
+        """
+        self.correlator = PhaseCorrelator(max_size)
+        self.shifts = TimeSeriesBuffer(capacity, shape=(2,), dtype=np.float32,
+                                       max_points=max_points)
+        self.times = TimeSeriesBuffer(capacity, max_points=max_points)
+        self.enabled = False
+        self.aoi = None
+        self.reset_requested = False
+        self.reset()
+
+    def reset(self):
+        """Clear the time series - the next frame is the new reference."""
+        self.shifts.clear()
+        self.times.clear()
+        self.correlator.reference = None
+        self.start_time = None
+        self.last = None
+        self.processing_time = 0.0
+        self.reset_requested = False
+
+    def request_reset(self):
+        """Request a new reference, taken by the thread calling update (next frame)."""
+        self.reset_requested = True
+
+    def add(self, image: np.ndarray, timestamp: float) -> tuple:
+        """
+        Register an image and add its shift to the time series.
+        :param image: Array containing the image (gray).
+        :param timestamp: Time of the image in s.
+        :return: Last sample (dx, dy, response), or None for a new reference.
+        """
+        if self.reset_requested:
+            self.reset()
+        start = time.perf_counter()
+        if self.correlator.reference is None or image.shape[:2] != self.correlator.image_shape:
+            self.reset()
+            self.correlator.set_reference(image)
+            self.start_time = timestamp
+            return None
+        dx, dy, response = self.correlator.register(image)
+        self.shifts.append((dx, dy))
+        self.times.append(timestamp - self.start_time)
+        self.last = (dx, dy, response)
+        self.processing_time = (time.perf_counter() - start) * 1000
+        return self.last
+
+    def update(self, image: np.ndarray, metadata: dict = None) -> tuple:
+        """
+        Process a new frame (all the frames of the camera thread).
+        :param image: New frame (raw data).
+        :param metadata: Metadata of the frame (see processing.frame_timing). The
+            timestamp of the camera is used when available. Default None.
+        :return: See add, or None if the monitor is disabled.
+        """
+        if not self.enabled:
+            return None
+        if self.aoi is not None:
+            x, y, w, h = self.aoi
+            image = image[y:y + h, x:x + w]
+        metadata = metadata or {}
+        if metadata.get('device_timestamp') is not None:
+            timestamp = metadata['device_timestamp'] * 1e-9
+        else:
+            timestamp = metadata.get('host_time', time.perf_counter())
+        return self.add(image, timestamp)
+
+    def __call__(self, frame: np.ndarray, params: dict) -> tuple:
+        """
+        Shift of a frame, as a node of a pipeline (see processing.pipeline).
+        :param frame: Array containing the image (gray).
+        :param params: 'time' - time of the frame in s. Default : reception time.
+        """
+        return self.add(frame, params.get('time', time.perf_counter()))
+
+    def get_history(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the min/max view of the whole history (constant size).
+        :return: Times in s from the reference and shifts (N, 2).
+        """
+        times, shifts = self.times.get_min_max_view()[1], self.shifts.get_min_max_view()[1]
+        # The 2 series have the same buckets (a sample can be appended between the 2 views)
+        number = min(len(times), len(shifts))
+        return times[:number], shifts[:number]
+
+    def get_statistics(self) -> dict:
+        """
+        Statistics of the samples stored at full resolution.
+        :return: Dictionary with 'mean', 'rms' (standard deviation) and 'peak_to_peak'
+            values (dx, dy) in pixels, 'rate' - sampling frequency in Hz and 'number' -
+            total number of samples. None if there is no sample.
+        """
+        shifts = self.shifts.get_data()
+        if len(shifts) == 0:
+            return None
+        period = np.median(np.diff(self.times.get_data())) if len(shifts) > 1 else 0
+        rate = 1 / period if period > 0 else 0
+        return {'mean': shifts.mean(axis=0), 'rms': shifts.std(axis=0),
+                'peak_to_peak': np.ptp(shifts, axis=0), 'rate': float(rate),
+                'number': self.shifts.get_counter()}
+
+    def get_spectrum(self, number: int = DRIFT_SPECTRUM_SAMPLES) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Amplitude spectrum of the last samples (vibrations).
+        The linear drift is removed and the samples are windowed (Hann). The sampling
+        is supposed to be regular (median interval between 2 samples).
+        :param number: Number of samples.
+        :return: Frequencies in Hz (without 0) and amplitudes (N, 2) in pixels (amplitude
+            of a sine), or empty arrays if there are not enough samples.
+        """
+        shifts = self.shifts.get_last(number).astype(np.float64)
+        times = self.times.get_last(number)
+        if len(shifts) < 8:
+            return np.zeros(0), np.zeros((0, 2))
+        period = np.median(np.diff(times))
+        if period <= 0:
+            return np.zeros(0), np.zeros((0, 2))
+        index = np.arange(len(shifts))
+        slope, offset = np.polyfit(index, shifts, 1)
+        shifts -= index[:, np.newaxis] * slope + offset
+        window = np.hanning(len(shifts))
+        spectrum = rfft(shifts.T * window).T
+        amplitudes = 2 * np.abs(spectrum) / window.sum()
+        frequencies = np.fft.rfftfreq(len(shifts), period)
+        return frequencies[1:], amplitudes[1:]
+
+
+if __name__ == '__main__':
+    # Frames of a textured scene, shifted by a slow drift and a vibration at 12 Hz
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur(rng.random((576, 576)).astype(np.float32), (0, 0), 2) * 3000
+    scene_spectrum = np.fft.rfft2(scene)
+    fx = np.fft.rfftfreq(576)[np.newaxis, :]
+    fy = np.fft.fftfreq(576)[:, np.newaxis]
+
+    def grab(dx, dy, size=256, noise=0.0):
+        """Exact sub-pixel shift of the scene (Fourier), cropped and quantized (12 bits)."""
+        shifted = np.fft.irfft2(scene_spectrum * np.exp(-2j * np.pi * (fx * dx + fy * dy)),
+                                s=scene.shape)[32:32 + size, 32:32 + size]
+        shifted = shifted - shifted.min() + 100 + rng.normal(0, noise, shifted.shape)
+        return np.clip(shifted, 0, 4095).astype(np.uint16)
+
+    for size in (128, 256, 512):
+        correlator = PhaseCorrelator()
+        correlator.set_reference(grab(0, 0, size, noise=5))
+        errors = []
+        for dx, dy in rng.uniform(-3, 3, (20, 2)):
+            x, y, response = correlator.register(grab(dx, dy, size, noise=5))
+            errors.append(max(abs(x - dx), abs(y - dy)))
+        image = grab(0.3, 0.2, size)
+        t1 = time.perf_counter()
+        for k in range(50):
+            correlator.register(image)
+        t2 = time.perf_counter()
+        print(f'{size}x{size} : {(t2-t1)*20:.2f} ms / frame - error mean {np.mean(errors):.4f} '
+              f'px, max {np.max(errors):.4f} px - response {response:.2f}')
+
+    monitor = DriftMonitor(capacity=1024, max_points=200)
+    frequency, rate = 12.0, 100.0
+    for k in range(1201):
+        t = k / rate
+        monitor.add(grab(0.0005 * k, 0.25 * np.sin(2 * np.pi * frequency * t), 128), t)
+    frequencies, amplitudes = monitor.get_spectrum(1024)
+    stats = monitor.get_statistics()
+    times, shifts = monitor.get_history()
+    print(f'Vibration : {frequencies[np.argmax(amplitudes[:, 1])]:.2f} Hz (12), '
+          f'amplitude {amplitudes[:, 1].max():.3f} px (0.25) - drift {monitor.last[0]:.3f} px '
+          f'(0.6) - rate {stats["rate"]:.0f} Hz - history {len(times)} points for '
+          f'{stats["number"]} samples')
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""*edges.py* file.
+
+This file contains the edge detection tools :
+- gradient (Sobel or Scharr) : the 2 derivatives are computed in float32 buffers
+  reused from one frame to the next, then the magnitude and the orientation are
+  computed in one pass (cv2.cartToPolar),
+- Canny detector : the hysteresis thresholds can be computed from the histogram
+  of the image (median rule), already computed for the display,
+- edges are returned as sparse lists of points (x, y), to draw overlays only on
+  the edge pixels.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+
+GRADIENT_OPERATORS = ['sobel', 'scharr']
+
+
+def get_canny_thresholds(histogram: np.ndarray, sigma: float = 0.33) -> tuple[int, int]:
+    """
+    Return the hysteresis thresholds of the Canny detector from the histogram of an image
+    (low = (1-sigma) x median, high = (1+sigma) x median).
+    :param histogram: Histogram of the 8 bits image (256 values).
+    :param sigma: Relative width around the median.
+    :return: Low and high thresholds.
+    """
+    cumulative = np.cumsum(histogram)
+    median = int(np.searchsorted(cumulative, cumulative[-1] / 2))
+    low = int(max(0, (1 - sigma) * median))
+    high = int(min(255, (1 + sigma) * median))
+    return low, max(high, low + 1)
+
+
+def get_edge_points(edges: np.ndarray) -> np.ndarray:
+    """
+    Return the list of the edge pixels.
+    :param edges: Binary image (non-zero values for the edges).
+    :return: Array of (x, y) coordinates, shape (N, 2).
+    """
+    points = cv2.findNonZero(edges)
+    if points is None:
+        return np.zeros((0, 2), dtype=np.int32)
+    return points.reshape(-1, 2)
+
+
+def draw_points(image: np.ndarray, points: np.ndarray, color: tuple = (255, 0, 0)) -> np.ndarray:
+    """
+    Draw a list of points over an image.
+    :param image: Array containing the image (8 bits, gray or RGB).
+    :param points: Array of (x, y) coordinates.
+    :param color: RGB color of the points.
+    :return: RGB image.
+    """
+    if image.ndim == 2:
+        output_image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+    else:
+        output_image = image.copy()
+    output_image[points[:, 1], points[:, 0]] = color
+    return output_image
+
+
+def gradient_to_image(magnitude: np.ndarray, angle: np.ndarray = None) -> np.ndarray:
+    """
+    Convert a gradient to an 8 bits image for the display.
+    :param magnitude: Magnitude of the gradient (float32).
+    :param angle: Orientation of the gradient in degrees. Default None.
+    :return: Magnitude normalized to its maximum (gray image) or, if the orientation is given,
+        RGB image with the orientation as hue and the magnitude as value.
+    """
+    max_value = float(magnitude.max())
+    value = cv2.convertScaleAbs(magnitude, alpha=255 / max_value if max_value > 0 else 0)
+    if angle is None:
+        return value
+    hue = cv2.convertScaleAbs(angle, alpha=0.5)     # 0 to 180 in OpenCV
+    saturation = np.full_like(value, 255)
+    return cv2.cvtColor(cv2.merge([hue, saturation, value]), cv2.COLOR_HSV2RGB)
+
+
+class GradientComputer:
+    """
+    Gradient of an image (magnitude and orientation) with reused buffers.
+    """
+
+    def __init__(self):
+        """Default Constructor."""
+        self.dx = None
+        self.dy = None
+        self.magnitude = None
+        self.angle = None
+
+    def __alloc(self, shape: tuple):
+        """Allocate the buffers if the size of the image changed."""
+        if self.dx is None or self.dx.shape != shape:
+            self.dx = np.empty(shape, dtype=np.float32)
+            self.dy = np.empty(shape, dtype=np.float32)
+            self.magnitude = np.empty(shape, dtype=np.float32)
+            self.angle = np.empty(shape, dtype=np.float32)
+
+    def compute(self, image: np.ndarray, operator: str = 'sobel',
+                kernel_size: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the gradient of an image.
+        :param image: Array containing the image.
+        :param operator: 'sobel' or 'scharr'.
+        :param kernel_size: Size of the Sobel kernel (1, 3, 5 or 7). The Scharr kernel is 3x3.
+        :return: Magnitude and orientation (degrees, 0 to 360) - buffers reused by the next call.
+        """
+        self.__alloc(image.shape)
+        if operator == 'scharr':
+            cv2.Scharr(image, cv2.CV_32F, 1, 0, dst=self.dx)
+            cv2.Scharr(image, cv2.CV_32F, 0, 1, dst=self.dy)
+        else:
+            cv2.Sobel(image, cv2.CV_32F, 1, 0, dst=self.dx, ksize=kernel_size)
+            cv2.Sobel(image, cv2.CV_32F, 0, 1, dst=self.dy, ksize=kernel_size)
+        cv2.cartToPolar(self.dx, self.dy, magnitude=self.magnitude, angle=self.angle,
+                        angleInDegrees=True)
+        return self.magnitude, self.angle
+
+    def __call__(self, frame: np.ndarray, params: dict) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Same interface as the operators (see processing.operators).
+        :param params: 'operator' - 'sobel' or 'scharr', 'kernel_size' - size of the kernel.
+        """
+        return self.compute(frame, params.get('operator', 'sobel'), params.get('kernel_size', 3))
+
+
+if __name__ == '__main__':
+    import time
+
+    image = cv2.GaussianBlur(np.random.randint(0, 256, (1000, 1000), dtype=np.uint8), (7, 7), 2)
+    gradient = GradientComputer()
+    histogram = np.bincount(image.ravel(), minlength=256)
+    t1 = time.perf_counter()
+    for k in range(20):
+        magnitude, angle = gradient.compute(image)
+        display = gradient_to_image(magnitude, angle)
+    t2 = time.perf_counter()
+    for k in range(20):
+        low, high = get_canny_thresholds(histogram)
+        points = get_edge_points(cv2.Canny(image, low, high))
+    t3 = time.perf_counter()
+    print(f'Gradient and display (1 MP) : {(t2-t1)/20*1000:.2f} ms')
+    print(f'Canny (1 MP, {low}/{high}) : {(t3-t2)/20*1000:.2f} ms - {len(points)} points')
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""*focus.py* file.
+
+This file contains focus (sharpness) metrics of an image, for manual focusing with a
+live indicator and for scripted focus sweeps (motorized lens or stage) :
+- laplacian : variance of the Laplacian,
+- tenengrad : mean of the squared magnitude of the Sobel gradient,
+- gradient_energy : mean of the squared differences between neighbour pixels,
+  normalized by the squared mean of the image (independent of the exposure).
+
+The metrics are computed on a sparse grid : 1 pixel every 'stride' pixels in each
+direction, with its neighbours at full resolution (shifted strided views of the
+image, no copy of the image and no convolution of the whole AOI). A downsampled
+level of a pyramid would remove the highest frequencies, which are the most
+sensitive to the focus. The stride is chosen to keep about MAX_GRID_SAMPLES pixels,
+so the cost does not depend on the size of the AOI.
+
+Values are given for 8 bits gray levels, whatever the bits depth of the image.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import numpy as np
+from processing.timeseries import TimeSeriesBuffer
+
+FOCUS_METRICS = ['laplacian', 'tenengrad', 'gradient_energy']
+# Number of pixels of the sparse grid (automatic stride)
+MAX_GRID_SAMPLES = 16384
+# Number of values of the rolling trace
+FOCUS_TRACE_LENGTH = 500
+
+
+def get_grid_stride(shape: tuple, max_samples: int = MAX_GRID_SAMPLES) -> int:
+    """
+    Return the stride of the sparse grid for an image.
+    :param shape: Shape of the image.
+    :param max_samples: Maximum number of pixels of the grid.
+    """
+    return max(1, int(np.ceil(np.sqrt(shape[0] * shape[1] / max_samples))))
+
+
+def get_shifted_view(image: np.ndarray, stride: int, dy: int, dx: int) -> np.ndarray:
+    """
+    Return the neighbours (dy, dx) of the pixels of the sparse grid, in float32.
+    :param image: Array containing the image (gray).
+    :param stride: Step between 2 pixels of the grid.
+    :param dy: Vertical shift (-1, 0 or 1).
+    :param dx: Horizontal shift (-1, 0 or 1).
+    """
+    height, width = image.shape[:2]
+    return image[1 + dy:height - 1 + dy:stride, 1 + dx:width - 1 + dx:stride].astype(np.float32)
+
+
+def focus_metric(image: np.ndarray, params: dict) -> float:
+    """
+    Focus metric of an image on a sparse grid (same interface as the operators).
+    :param image: Array containing the image (gray, at least 3x3 pixels).
+    :param params: 'metric' - see FOCUS_METRICS, 'stride' - step of the grid (0 or
+        missing for an automatic stride), 'bit_depth' - bits depth of a uint16 image.
+    :return: Value of the metric (higher is sharper).
+    """
+    metric = params.get('metric', 'laplacian')
+    stride = params.get('stride') or get_grid_stride(image.shape)
+    bit_depth = 8 if image.dtype == np.uint8 else params.get('bit_depth', 16)
+
+    def view(dy, dx):
+        return get_shifted_view(image, stride, dy, dx)
+
+    center = view(0, 0)
+    if metric == 'tenengrad':
+        up_left, up, up_right = view(-1, -1), view(-1, 0), view(-1, 1)
+        down_left, down, down_right = view(1, -1), view(1, 0), view(1, 1)
+        left, right = view(0, -1), view(0, 1)
+        gx = (up_right + 2 * right + down_right) - (up_left + 2 * left + down_left)
+        gy = (down_left + 2 * down + down_right) - (up_left + 2 * up + up_right)
+        value = np.mean(gx * gx + gy * gy)
+    elif metric == 'gradient_energy':
+        dx = view(0, 1) - center
+        dy = view(1, 0) - center
+        mean = max(float(np.mean(center)), 1e-6)
+        # Normalized : independent of the exposure and of the bits depth
+        return float(np.mean(dx * dx + dy * dy) / (mean * mean))
+    else:
+        laplacian = view(-1, 0) + view(1, 0) + view(0, -1) + view(0, 1) - 4 * center
+        value = np.var(laplacian)
+    scale = 255 / (2 ** bit_depth - 1)
+    return float(value * scale * scale)
+
+
+def get_peak_position(positions: np.ndarray, values: np.ndarray) -> float:
+    """
+    Position of the maximum of a focus curve, refined by a parabola through the best
+    sample and its 2 neighbours.
+    :param positions: Positions of the samples (increasing).
+    :param values: Focus metric of the samples.
+    :return: Position of the maximum, or None if there is no sample.
+    """
+    if len(values) == 0:
+        return None
+    k = int(np.argmax(values))
+    if k == 0 or k == len(values) - 1:
+        return float(positions[k])
+    a, b, c = np.polyfit(positions[k - 1:k + 2], values[k - 1:k + 2], 2)
+    if a >= 0:
+        return float(positions[k])
+    return float(np.clip(-b / (2 * a), positions[k - 1], positions[k + 1]))
+
+
+class FocusMeter:
+    """
+    Focus metric of the frames, with a rolling trace, a peak-hold value, and the
+    samples of a focus sweep.
+    """
+
+    def __init__(self, capacity: int = FOCUS_TRACE_LENGTH):
+        """
+        Default Constructor.
+        :param capacity: Number of values of the rolling trace.
+        """
+        self.trace = TimeSeriesBuffer(capacity)
+        self.reset()
+
+    def reset(self):
+        """Clear the trace, the peak-hold value and the samples of the sweep."""
+        self.trace.clear()
+        self.value = None
+        self.peak = None
+        self.peak_counter = None    # Sample number of the peak in the trace
+        self.sweep_positions = []
+        self.sweep_values = []
+
+    def add(self, value: float, position: float = None):
+        """
+        Add a value of the metric.
+        :param value: Value of the focus metric.
+        :param position: Position of the focus (sweep), or None for the live trace only.
+        """
+        self.value = value
+        self.trace.append(value)
+        if self.peak is None or value > self.peak:
+            self.peak = value
+            self.peak_counter = self.trace.get_counter()
+        if position is not None:
+            self.sweep_positions.append(position)
+            self.sweep_values.append(value)
+
+    def measure(self, frame: np.ndarray, params: dict = None, position: float = None) -> float:
+        """
+        Compute the metric of a frame and add it to the trace (and to the sweep).
+        :param frame: Array containing the image (gray).
+        :param params: See focus_metric. Default None (variance of the Laplacian).
+        :param position: Position of the focus, see add.
+        :return: Value of the metric.
+        """
+        value = focus_metric(frame, params or {})
+        self.add(value, position)
+        return value
+
+    def __call__(self, frame: np.ndarray, params: dict) -> float:
+        """
+        Focus metric of a frame, as a node of a pipeline (see processing.pipeline).
+        :param frame: Array containing the image (gray).
+        :param params: See focus_metric.
+        """
+        return self.measure(frame, params)
+
+    def get_peak_ratio(self) -> float:
+        """Return the last value relative to the peak-hold value (1 at the best focus)."""
+        if self.peak is None or self.peak <= 0:
+            return None
+        return self.value / self.peak
+
+    def get_best_position(self) -> float:
+        """Return the best position of the sweep (see get_peak_position), or None."""
+        positions = np.asarray(self.sweep_positions, dtype=np.float64)
+        values = np.asarray(self.sweep_values, dtype=np.float64)
+        order = np.argsort(positions)
+        return get_peak_position(positions[order], values[order])
+
+
+def focus_sweep(positions, move, grab, params: dict = None, meter: FocusMeter = None) -> float:
+    """
+    Scripted focus sweep.
+    :param positions: Positions of the focus to measure.
+    :param move: Function moving the focus to a position - move(position).
+    :param grab: Function returning a frame at the current position - grab().
+    :param params: See focus_metric. Default None.
+    :param meter: Focus meter to fill. Default None (new meter).
+    :return: Best position (see get_peak_position).
+    """
+    meter = meter or FocusMeter()
+    for position in positions:
+        move(position)
+        meter.measure(grab(), params, position)
+    return meter.get_best_position()
+
+
+if __name__ == '__main__':
+    import time
+    import cv2
+
+    # Focus sweep of a simulated lens : blur proportional to the defocus
+    rng = np.random.default_rng(0)
+    scene = cv2.resize(rng.integers(0, 4096, (250, 250)).astype(np.float32), (1000, 1000),
+                       interpolation=cv2.INTER_CUBIC)
+    focus = {'position': 0.0}
+
+    def grab():
+        sigma = 0.3 + abs(focus['position'] - 1.37) * 2
+        frame = cv2.GaussianBlur(scene, (0, 0), sigma)
+        return np.clip(frame, 0, 4095).astype(np.uint16)
+
+    def move(position):
+        focus['position'] = position
+
+    frame = grab()
+    for metric in FOCUS_METRICS:
+        params = {'metric': metric, 'bit_depth': 12}
+        t1 = time.perf_counter()
+        for k in range(100):
+            value = focus_metric(frame, params)
+        t2 = time.perf_counter()
+        best = focus_sweep(np.arange(0, 3.01, 0.25), move, grab, params)
+        print(f'{metric} (1 MP, stride {get_grid_stride(frame.shape)}) : '
+              f'{(t2-t1)*10:.3f} ms - best position = {best:.2f} (1.37)')
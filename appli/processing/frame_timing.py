@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""*frame_timing.py* file.
+
+This file contains tools to analyze the timing of the frames of a live stream
+(inter-frame interval, jitter, dropped frames).
+
+Each frame is described by a metadata dictionary :
+- 'frame_id' : frame number given by the camera (BlockID for Basler cameras) or None,
+- 'device_timestamp' : timestamp of the camera in ns or None,
+- 'host_time' : time when the frame was received by the computer, in s (time.perf_counter).
+
+Dropped frames are detected with gaps in the frame numbers. If the camera does not
+give frame numbers, a gap is detected when an interval is longer than
+'gap_factor' times the nominal period (median of the last intervals).
+
+Each drop is logged with the pipeline load at this time (processing time of the
+last displayed frame and processing mode), to correlate drops and expensive modes.
+
+The latency of an expensive mode (segmentation...) can be tracked with a
+LatencyTracker : from the processing times and the number of pixels processed, it
+estimates the largest AOI that can be processed at the frame rate of the stream.
+
+Frames are added from the acquisition thread and statistics are read from the GUI.
+All the methods are protected by a lock.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import time
+import threading
+from collections import deque
+import numpy as np
+from processing.timeseries import TimeSeriesBuffer
+
+# Number of intervals used to estimate the nominal period of the stream
+PERIOD_WINDOW = 64
+
+
+def get_frame_metadata(frame_id: int = None, device_timestamp: int = None,
+                       exposure: float = None) -> dict:
+    """
+    Return the metadata of a frame just received.
+    :param frame_id: Frame number given by the camera. Default None.
+    :param device_timestamp: Timestamp of the camera in ns. Default None.
+    :param exposure: Exposure time of the frame in us, given by the camera. Default None
+        (no 'exposure' key).
+    :return: Dictionary of metadata.
+    """
+    metadata = {'frame_id': frame_id,
+                'device_timestamp': device_timestamp,
+                'host_time': time.perf_counter()}
+    if exposure is not None:
+        metadata['exposure'] = exposure
+    return metadata
+
+
+class FrameTimingAnalyzer:
+    """
+    Statistics of the inter-frame intervals and log of the dropped frames.
+    """
+
+    def __init__(self, capacity: int = 10000, max_log: int = 100, gap_factor: float = 1.5):
+        """
+        Default Constructor.
+        :param capacity: Number of intervals to keep for the statistics.
+        :param max_log: Maximum number of drops in the log.
+        :param gap_factor: An interval longer than gap_factor x nominal period is a gap
+            (only if the camera does not give frame numbers).
+        """
+        self.gap_factor = gap_factor
+        self.intervals = TimeSeriesBuffer(capacity)     # Intervals in ms
+        self.drops = deque(maxlen=max_log)
+        self.__lock = threading.Lock()
+        # Pipeline load
+        self.load_ms = 0.0
+        self.mode = ''
+        self.reset()
+
+    def reset(self):
+        """Clear all the statistics."""
+        with self.__lock:
+            self.intervals.clear()
+            self.drops.clear()
+            self.nb_frames = 0
+            self.nb_dropped = 0
+            self.nb_displayed = 0
+            self.__last = None
+            self.__first_host_time = None
+
+    def set_load(self, load_ms: float, mode: str = ''):
+        """
+        Set the actual load of the processing pipeline.
+        :param load_ms: Processing time of the last displayed frame, in ms.
+        :param mode: Actual processing mode.
+        """
+        self.load_ms = load_ms
+        self.mode = mode
+
+    def add_frame(self, metadata: dict, displayed: bool = True):
+        """
+        Add a new frame.
+        :param metadata: Metadata of the frame (see get_frame_metadata).
+        :param displayed: False if the frame was received but not sent to the GUI.
+        """
+        with self.__lock:
+            self.nb_frames += 1
+            if displayed:
+                self.nb_displayed += 1
+            if self.__first_host_time is None:
+                self.__first_host_time = metadata['host_time']
+            last, self.__last = self.__last, metadata
+            if last is None:
+                return
+            interval_ms = self.__get_interval(last, metadata)
+            if interval_ms is None:
+                return
+            nb_dropped = self.__get_nb_dropped(last, metadata, interval_ms)
+            self.intervals.append(interval_ms)
+            if nb_dropped > 0:
+                self.nb_dropped += nb_dropped
+                self.drops.append({'frame_id': metadata.get('frame_id'),
+                                   'time': metadata['host_time'] - self.__first_host_time,
+                                   'nb_dropped': nb_dropped,
+                                   'interval_ms': interval_ms,
+                                   'load_ms': self.load_ms,
+                                   'mode': self.mode})
+
+    @staticmethod
+    def __get_interval(last: dict, metadata: dict):
+        """Return the interval between 2 frames in ms - device timestamps if available."""
+        t1, t2 = last.get('device_timestamp'), metadata.get('device_timestamp')
+        if t1 is not None and t2 is not None:
+            if t2 <= t1:    # Camera restarted
+                return None
+            return (t2 - t1) * 1e-6
+        return (metadata['host_time'] - last['host_time']) * 1e3
+
+    def __get_nb_dropped(self, last: dict, metadata: dict, interval_ms: float) -> int:
+        """Return the number of frames missing between 2 frames."""
+        id1, id2 = last.get('frame_id'), metadata.get('frame_id')
+        if id1 is not None and id2 is not None:
+            return max(0, int(id2) - int(id1) - 1)
+        if len(self.intervals) < PERIOD_WINDOW // 4:
+            return 0
+        period = float(np.median(self.intervals.get_last(PERIOD_WINDOW)))
+        if period > 0 and interval_ms > self.gap_factor * period:
+            return int(round(interval_ms / period)) - 1
+        return 0
+
+    def get_intervals(self) -> np.ndarray:
+        """Return the last inter-frame intervals in ms."""
+        with self.__lock:
+            return self.intervals.get_data().copy()
+
+    def get_min_max_view(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return a copy of the min/max view of all the intervals (see TimeSeriesBuffer)."""
+        with self.__lock:
+            x_view, y_view = self.intervals.get_min_max_view()
+            return x_view.copy(), y_view.copy()
+
+    def get_histogram(self, nb_bins: int = 50) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the histogram of the inter-frame intervals.
+        :param nb_bins: Number of bins.
+        :return: Tuple of arrays: bin edges (ms), number of intervals in each bin.
+        """
+        intervals = self.get_intervals()
+        if len(intervals) == 0:
+            return np.zeros(nb_bins + 1), np.zeros(nb_bins, dtype=int)
+        hist, edges = np.histogram(intervals, bins=nb_bins)
+        return edges, hist
+
+    def get_statistics(self) -> dict:
+        """
+        Return the statistics of the stream.
+        Jitter is the absolute deviation of the intervals from the median interval.
+        :return: Dictionary of statistics (times in ms).
+        """
+        intervals = self.get_intervals()
+        stats = {'nb_frames': self.nb_frames, 'nb_displayed': self.nb_displayed,
+                 'nb_dropped': self.nb_dropped,
+                 'drop_rate': self.nb_dropped / max(1, self.nb_frames + self.nb_dropped)}
+        if len(intervals) == 0:
+            return stats
+        median = float(np.median(intervals))
+        p90, p99 = np.percentile(intervals, [90, 99])
+        jitter = np.abs(intervals - median)
+        j50, j90, j99 = np.percentile(jitter, [50, 90, 99])
+        stats.update({'fps': 1000 / median if median > 0 else 0.0,
+                      'mean': float(np.mean(intervals)), 'median': median,
+                      'p90': float(p90), 'p99': float(p99), 'max': float(np.max(intervals)),
+                      'jitter_p50': float(j50), 'jitter_p90': float(j90),
+                      'jitter_p99': float(j99)})
+        return stats
+
+    def get_drops(self) -> list:
+        """Return the log of the dropped frames, from the oldest to the newest."""
+        with self.__lock:
+            return list(self.drops)
+
+
+class LatencyTracker:
+    """
+    Processing times of a mode and throughput in pixels per second.
+    """
+
+    def __init__(self, capacity: int = 200):
+        """
+        Default Constructor.
+        :param capacity: Number of frames to keep for the statistics.
+        """
+        self.latencies = TimeSeriesBuffer(capacity)    # Processing times in ms
+        self.pixels = TimeSeriesBuffer(capacity)       # Number of pixels processed
+
+    def reset(self):
+        """Clear all the statistics."""
+        self.latencies.clear()
+        self.pixels.clear()
+
+    def add(self, latency_ms: float, nb_pixels: int):
+        """
+        Add the processing time of a frame.
+        :param latency_ms: Processing time in ms.
+        :param nb_pixels: Number of pixels processed (size of the AOI).
+        """
+        self.latencies.append(latency_ms)
+        self.pixels.append(nb_pixels)
+
+    def get_statistics(self, period_ms: float = None) -> dict:
+        """
+        Return the statistics of the processing times.
+        :param period_ms: Period of the stream in ms. Default None.
+        :return: Dictionary of statistics (times in ms, throughput in pixels per second).
+            'max_pixels' is the largest AOI processed within the period (95 % of the frames),
+            only if the period is given.
+        """
+        latencies = self.latencies.get_data()
+        if len(latencies) == 0:
+            return {'nb_frames': 0}
+        p50, p95 = np.percentile(latencies, [50, 95])
+        pixels = self.pixels.get_data()
+        # Time per pixel of the slowest frames : the processing time is about linear in the size
+        time_per_pixel = float(np.percentile(latencies / np.maximum(pixels, 1), 95))
+        stats = {'nb_frames': len(latencies), 'last': float(latencies[-1]),
+                 'median': float(p50), 'p95': float(p95), 'max': float(np.max(latencies)),
+                 'throughput': 1000 / time_per_pixel if time_per_pixel > 0 else 0.0}
+        if period_ms is not None and time_per_pixel > 0:
+            stats['max_pixels'] = int(period_ms / time_per_pixel)
+        return stats
+
+
+if __name__ == '__main__':
+    # Simulated stream at 50 fps, with one frame dropped every 100 frames.
+    analyzer = FrameTimingAnalyzer()
+    rng = np.random.default_rng(0)
+    timestamp = 0
+    for k in range(1000):
+        if k % 100 == 99:
+            continue
+        timestamp = int(k * 20e6 + rng.normal(0, 0.2e6))
+        analyzer.add_frame({'frame_id': k, 'device_timestamp': timestamp,
+                            'host_time': timestamp * 1e-9})
+    print(analyzer.get_statistics())
+    print(analyzer.get_drops()[:2])
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""*frequency.py* file.
+
+This file contains the frequency analysis of an image and the frequency-domain
+filters :
+- real FFT of the image (rfft2 : only the half plane of the positive horizontal
+  frequencies is computed, the other half is the complex conjugate),
+- log-magnitude spectrum, centered, for the display (8 bits),
+- low-pass, high-pass and band-pass filters (Butterworth profile of the radial
+  frequency) and notch filter (to remove a periodic noise at a given frequency).
+
+scipy.fft is used when it is installed (several threads, 'workers'), numpy.fft
+otherwise. Neither of them exposes reusable FFT plans : the buffers (input,
+spectrum, magnitude) are allocated once per AOI shape and reused for all the frames,
+and the filter masks are cached per AOI shape and parameters.
+
+Frequencies are normalized : 1 is the Nyquist frequency (0.5 cycle per pixel).
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import os
+import cv2
+import numpy as np
+
+try:
+    import scipy.fft as scipy_fft
+except ImportError:
+    scipy_fft = None
+
+FILTER_TYPES = ['lowpass', 'highpass', 'bandpass', 'notch']
+# Number of threads of the FFT (scipy.fft only)
+FFT_WORKERS = os.cpu_count() or 1
+# Minimum interval between 2 displays of the spectrum, in s
+SPECTRUM_DISPLAY_INTERVAL = 0.2
+# numpy >= 2.0 can write the FFT in a preallocated array
+NUMPY_FFT_OUT = np.lib.NumpyVersion(np.__version__) >= '2.0.0'
+
+# Filter masks of the last AOI shapes and parameters
+_masks_cache = {}
+
+
+def rfft(signal: np.ndarray, n: int = None) -> np.ndarray:
+    """
+    Real 1D FFT of a signal.
+    :param signal: Array containing the signal.
+    :param n: Length of the FFT (zero-padding). Default None (length of the signal).
+    :return: Positive frequencies of the spectrum, n // 2 + 1 values.
+    """
+    if scipy_fft is not None:
+        return scipy_fft.rfft(signal, n=n)
+    return np.fft.rfft(signal, n=n)
+
+
+def rfft2(image: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Real 2D FFT of an image.
+    :param image: Array containing the image (float32).
+    :param out: Preallocated complex64 array for the result (numpy only). Default None.
+    :return: Half plane of the spectrum, shape (height, width // 2 + 1).
+    """
+    if scipy_fft is not None:
+        return scipy_fft.rfft2(image, workers=FFT_WORKERS)
+    if out is not None and NUMPY_FFT_OUT:
+        return np.fft.rfft2(image, out=out)
+    return np.fft.rfft2(image)
+
+
+def irfft2(spectrum: np.ndarray, shape: tuple) -> np.ndarray:
+    """
+    Inverse real 2D FFT.
+    :param spectrum: Half plane of the spectrum.
+    :param shape: Shape of the image (height, width).
+    :return: Image (float).
+    """
+    if scipy_fft is not None:
+        return scipy_fft.irfft2(spectrum, s=shape, workers=FFT_WORKERS)
+    return np.fft.irfft2(spectrum, s=shape)
+
+
+def get_frequencies(shape: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the normalized frequencies of the half plane of a spectrum.
+    :param shape: Shape of the image (height, width).
+    :return: Horizontal frequencies (1, width // 2 + 1) and vertical frequencies
+        (height, 1), 1 for the Nyquist frequency.
+    """
+    fx = (np.fft.rfftfreq(shape[1]) * 2).astype(np.float32)[np.newaxis, :]
+    fy = (np.fft.fftfreq(shape[0]) * 2).astype(np.float32)[:, np.newaxis]
+    return fx, fy
+
+
+def butterworth(radius: np.ndarray, cutoff: float, order: int) -> np.ndarray:
+    """
+    Butterworth low-pass profile.
+    :param radius: Normalized frequencies.
+    :param cutoff: Cutoff frequency (gain 1 / sqrt(2)).
+    :param order: Order of the filter (sharper transition for high orders).
+    """
+    return 1 / (1 + (radius / max(cutoff, 1e-6)) ** (2 * order))
+
+
+def get_filter_mask(shape: tuple, params: dict) -> np.ndarray:
+    """
+    Return the mask of a filter for the half plane of a spectrum (cached).
+    :param shape: Shape of the image (height, width).
+    :param params: 'type' - see FILTER_TYPES, 'low' and 'high' - cutoff frequencies,
+        'order' - order of the Butterworth profile, 'notch_x' and 'notch_y' - frequency
+        of the periodic noise, 'notch_radius' - radius of the notch.
+    :return: Gain of each frequency (float32), shape (height, width // 2 + 1).
+    """
+    filter_type = params.get('type')
+    names = ['low', 'high', 'order', 'notch_x', 'notch_y', 'notch_radius']
+    key = (tuple(shape[:2]), filter_type) + tuple(params.get(name) for name in names)
+    if key in _masks_cache:
+        return _masks_cache[key]
+    if len(_masks_cache) > 8:
+        _masks_cache.clear()
+    fx, fy = get_frequencies(shape)
+    order = params.get('order', 2)
+    if filter_type == 'notch':
+        # The peak and its symmetric (conjugate) peak are removed
+        notch_x, notch_y = params.get('notch_x', 0.5), params.get('notch_y', 0)
+        notch_radius = params.get('notch_radius', 0.02)
+        mask = np.ones(np.broadcast_shapes(fx.shape, fy.shape), dtype=np.float32)
+        for sign in (1, -1):
+            distance = np.hypot(fx - sign * notch_x, fy - sign * notch_y)
+            mask *= 1 - butterworth(distance, notch_radius, order)
+    else:
+        radius = np.hypot(fx, fy)
+        low_pass = butterworth(radius, params.get('high', 0.5), order)
+        high_pass = 1 - butterworth(radius, params.get('low', 0.1), order)
+        if filter_type == 'lowpass':
+            mask = low_pass
+        elif filter_type == 'highpass':
+            mask = high_pass
+        else:
+            mask = low_pass * high_pass
+    _masks_cache[key] = mask.astype(np.float32)
+    return _masks_cache[key]
+
+
+class SpectrumAnalyzer:
+    """
+    FFT of the frames, frequency-domain filters and display of the spectrum, with
+    buffers allocated once per AOI shape.
+    """
+
+    def __init__(self):
+        """Default Constructor."""
+        self.shape = None
+
+    def allocate(self, shape: tuple):
+        """
+        Allocate the buffers (only for a new AOI shape).
+        :param shape: Shape of the image (height, width).
+        """
+        if shape == self.shape:
+            return
+        self.shape = shape
+        height, width = shape
+        half_shape = (height, width // 2 + 1)
+        self.input = np.empty(shape, dtype=np.float32)
+        self.spectrum = np.empty(half_shape, dtype=np.complex64)
+        self.product = np.empty(half_shape, dtype=np.complex64)
+        self.magnitude = np.empty(half_shape, dtype=np.float32)
+        self.display = np.empty(shape, dtype=np.uint8)
+        # Rows of the centered display (vertical frequencies from -height/2), for the
+        # positive and the negative (symmetric) horizontal frequencies
+        rows = np.arange(height) - height // 2
+        self.rows_positive = rows % height
+        self.rows_negative = -rows % height
+
+    def transform(self, frame: np.ndarray, params: dict) -> tuple:
+        """
+        FFT of an image (same interface as the operators).
+        :param frame: Array containing the image (gray).
+        :param params: 'bit_depth' - bits depth of a uint16 image.
+        :return: Half plane of the spectrum, shape of the image and maximum value.
+        """
+        self.allocate(frame.shape[:2])
+        np.copyto(self.input, frame, casting='unsafe')
+        spectrum = rfft2(self.input, out=self.spectrum)
+        bit_depth = 8 if frame.dtype == np.uint8 else params.get('bit_depth', 16)
+        return spectrum, frame.dtype, 2 ** bit_depth - 1
+
+    def filter(self, transformed: tuple, params: dict) -> np.ndarray:
+        """
+        Frequency-domain filter (same interface as the operators).
+        :param transformed: Output of transform.
+        :param params: See get_filter_mask. The result of the filters without the mean
+            value (high-pass, band-pass) is centered on the middle of the scale.
+        :return: Filtered image (same type as the initial image), or None if no filter
+            is selected.
+        """
+        spectrum, dtype, max_value = transformed
+        if params.get('type') not in FILTER_TYPES:
+            return None
+        mask = get_filter_mask(self.shape, params)
+        np.multiply(spectrum, mask, out=self.product)
+        output_image = irfft2(self.product, self.shape)
+        if params['type'] in ('highpass', 'bandpass'):
+            output_image += (max_value + 1) / 2
+        np.clip(output_image, 0, max_value, out=output_image)
+        # Rounded to the nearest value (a cast alone is biased low)
+        return np.rint(output_image, out=output_image).astype(dtype)
+
+    def to_centered(self, half: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Return the full plane of a spectrum, zero frequency at the center.
+        :param half: Half plane (magnitude of the spectrum or mask), shape (height, width // 2 + 1).
+        :param out: Preallocated array for the result. Default None.
+        """
+        height, width = self.shape
+        if out is None:
+            out = np.empty(self.shape, dtype=half.dtype)
+        # Positive horizontal frequencies on the right, symmetric ones on the left
+        out[:, width // 2:] = half[self.rows_positive, :width - width // 2]
+        out[:, :width // 2] = half[self.rows_negative, width // 2:0:-1]
+        return out
+
+    def get_log_magnitude(self, transformed: tuple, mask: np.ndarray = None) -> np.ndarray:
+        """
+        Log-magnitude of the spectrum for the display.
+        :param transformed: Output of transform.
+        :param mask: Filter mask, the rejected frequencies are darkened. Default None.
+        :return: 8 bits image, zero frequency at the center.
+        """
+        spectrum = transformed[0]
+        np.abs(spectrum, out=self.magnitude)
+        np.log1p(self.magnitude, out=self.magnitude)
+        if mask is not None:
+            cv2.multiply(self.magnitude, 0.3 + 0.7 * mask, dst=self.magnitude)
+        half = cv2.normalize(self.magnitude, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        return self.to_centered(half, self.display)
+
+
+if __name__ == '__main__':
+    import time
+
+    # Image with a periodic noise (horizontal frequency 0.25, vertical 0.1)
+    rng = np.random.default_rng(0)
+    y, x = np.indices((1024, 1024))
+    image = cv2.GaussianBlur(rng.integers(0, 4096, (1024, 1024)).astype(np.float32), (0, 0), 8)
+    periodic = 200 * np.cos(np.pi * (0.25 * x + 0.1 * y))
+    image = np.clip(image + periodic, 0, 4095).astype(np.uint16)
+    analyzer = SpectrumAnalyzer()
+    # Low-pass above all the frequencies : same image (rounded, not truncated)
+    unity = analyzer.filter(analyzer.transform(image, {'bit_depth': 12}),
+                            {'type': 'lowpass', 'high': 100, 'order': 8})
+    assert np.array_equal(unity, image)
+    params = {'type': 'notch', 'notch_x': 0.25, 'notch_y': 0.1, 'notch_radius': 0.02,
+              'order': 2, 'bit_depth': 12}
+    t1 = time.perf_counter()
+    for k in range(10):
+        transformed = analyzer.transform(image, params)
+    t2 = time.perf_counter()
+    for k in range(10):
+        filtered = analyzer.filter(transformed, params)
+    t3 = time.perf_counter()
+    for k in range(10):
+        display = analyzer.get_log_magnitude(transformed, get_filter_mask(image.shape, params))
+    t4 = time.perf_counter()
+    backend = 'scipy.fft' if scipy_fft is not None else 'numpy.fft'
+    residual = np.std(filtered.astype(np.float32) - (image - periodic))
+    print(f'FFT {backend} (1024x1024) : {(t2-t1)*100:.2f} ms')
+    print(f'Notch filter : {(t3-t2)*100:.2f} ms - periodic noise 141 -> {residual:.1f} (std)')
+    print(f'Spectrum display : {(t4-t3)*100:.2f} ms')
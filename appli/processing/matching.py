@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""*matching.py* file.
+
+This file contains a template matching (teach and find) to locate a pattern in the
+frames of a live stream, for alignment and presence checks.
+
+Teach : the template (pattern taught from the AOI) is stored as a pyramid (cv2.pyrDown),
+and optionally as a set of rotated templates (only the central square of the template
+is kept, so the rotated pattern stays inside the template).
+
+Find (coarse to fine normalized cross-correlation, cv2.TM_CCOEFF_NORMED) :
+- the search region is the whole image, or a window around the last position of the
+  pattern (tracking) - a full search is done if the pattern is lost in the window,
+- the pyramid of the search region is built, the template is searched in the whole
+  coarsest level (for all the angles),
+- at each finer level, only a small window around the position given by the coarser
+  level is searched (+/- REFINE_RADIUS pixels, best angle and its 2 neighbours),
+- the angle is refined at full resolution by bisection of the angle step (template
+  rotated for 2 angles per step, searched in a small window only),
+- the position is refined to a fraction of pixel with a parabola through the maximum
+  of the correlation and its neighbours.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+
+# Minimum size of the template at the coarsest level of the pyramid
+TEMPLATE_MIN_SIZE = 10
+MAX_PYRAMID_LEVELS = 5
+# Search window at the finer levels (pixels around the coarser position)
+REFINE_RADIUS = 2
+# Number of bisections of the angle step at full resolution (rotation only)
+ANGLE_REFINE_STEPS = 4
+MATCH_METHOD = cv2.TM_CCOEFF_NORMED
+# Minimum standard deviation of a template (8 bits) : the normalized correlation of
+# a uniform template is undefined (score of 1 everywhere)
+TEMPLATE_MIN_STD = 2.0
+
+
+def build_pyramid(image: np.ndarray, nb_levels: int) -> list:
+    """
+    Return a pyramid of an image (cv2.pyrDown).
+    :param image: Array containing the image.
+    :param nb_levels: Number of levels, including the image.
+    :return: List of images, from the full resolution to the coarsest level.
+    """
+    pyramid = [image]
+    for k in range(nb_levels - 1):
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def get_parabola_peak(left: float, center: float, right: float) -> float:
+    """
+    Return the offset of the maximum of a parabola through 3 equally spaced values.
+    :return: Offset from the center, between -0.5 and 0.5.
+    """
+    denominator = left - 2 * center + right
+    if denominator >= 0:
+        return 0.0
+    return float(np.clip(0.5 * (left - right) / denominator, -0.5, 0.5))
+
+
+def match_window(image: np.ndarray, template: np.ndarray, x: int, y: int,
+                 radius: int) -> tuple[float, int, int, np.ndarray, tuple]:
+    """
+    Search a template around a position only.
+    :param image: Array containing the image.
+    :param template: Array containing the template.
+    :param x: Expected position of the template (left) in the image.
+    :param y: Expected position of the template (top) in the image.
+    :param radius: Maximum shift from the expected position.
+    :return: Best score, position (left, top), map of the scores of the window (None
+        if the template is larger than the image) and position of the best score in the map.
+    """
+    height, width = template.shape[:2]
+    left = int(np.clip(x - radius, 0, max(image.shape[1] - width, 0)))
+    top = int(np.clip(y - radius, 0, max(image.shape[0] - height, 0)))
+    window = image[top:top + height + 2 * radius, left:left + width + 2 * radius]
+    if window.shape[0] < height or window.shape[1] < width:
+        return -1.0, x, y, None, (0, 0)
+    scores = cv2.matchTemplate(window, template, MATCH_METHOD)
+    _, best, _, (best_x, best_y) = cv2.minMaxLoc(scores)
+    return best, left + best_x, top + best_y, scores, (best_x, best_y)
+
+
+class TemplateMatcher:
+    """
+    Teach a template, then find it in the frames (coarse to fine, with tracking).
+    """
+
+    def __init__(self):
+        """Default Constructor."""
+        self.template = None    # Taught pattern
+        self.templates = None   # Pyramids of the templates, for each angle
+        self.angles = np.zeros(1)
+        self.teach_id = 0       # Incremented for each new template
+        self.reset()
+
+    def reset(self):
+        """Forget the last position : the next search is done in the whole image."""
+        self.last_match = None
+
+    def teach(self, template: np.ndarray, angle_range: float = 0, angle_step: float = None):
+        """
+        Store a new template.
+        :param template: Array containing the pattern (8 bits).
+        :param angle_range: Maximum rotation of the pattern in degrees (0 : no rotation).
+        :param angle_step: Step between 2 angles. Default None (about 1 pixel at the
+            border of the template at the coarsest level).
+        :raise ValueError: If the template is uniform (the previous template is forgotten).
+        """
+        crop = (slice(None), slice(None))
+        if angle_range > 0:
+            # Central square : the rotated pattern stays inside the template
+            size = int(min(template.shape[:2]) / np.sqrt(2))
+            top = (template.shape[0] - size) // 2
+            left = (template.shape[1] - size) // 2
+            crop = (slice(top, top + size), slice(left, left + size))
+        else:
+            size = min(template.shape[:2])
+        if size == 0 or float(np.std(template[crop])) < TEMPLATE_MIN_STD:
+            self.template = None
+            self.templates = None
+            raise ValueError('Uniform template : no pattern to find')
+        self.template = np.ascontiguousarray(template)
+        self.crop = crop
+        nb_levels = 1
+        while (nb_levels < MAX_PYRAMID_LEVELS
+               and (size >> nb_levels) >= TEMPLATE_MIN_SIZE):
+            nb_levels += 1
+        if angle_range > 0:
+            if angle_step is None:
+                angle_step = np.degrees(2 / max(size >> (nb_levels - 1), 1))
+            nb_steps = int(np.ceil(angle_range / angle_step))
+            self.angles = np.linspace(-angle_range, angle_range, 2 * nb_steps + 1)
+            templates = [self.get_rotated_template(angle) for angle in self.angles]
+        else:
+            self.angles = np.zeros(1)
+            templates = [template]
+        self.templates = [build_pyramid(np.ascontiguousarray(t), nb_levels) for t in templates]
+        self.nb_levels = nb_levels
+        self.teach_id += 1
+        self.reset()
+
+    def get_rotated_template(self, angle: float) -> np.ndarray:
+        """
+        Return the central square of the template rotated by an angle.
+        :param angle: Angle in degrees (counterclockwise).
+        """
+        center = ((self.template.shape[1] - 1) / 2, (self.template.shape[0] - 1) / 2)
+        rotation = cv2.getRotationMatrix2D(center, angle, 1)
+        rotated = cv2.warpAffine(self.template, rotation, self.template.shape[1::-1],
+                                 flags=cv2.INTER_LINEAR)
+        return np.ascontiguousarray(rotated[self.crop])
+
+    def get_search_region(self, shape: tuple, track: bool) -> tuple[int, int, int, int]:
+        """
+        Return the search region : whole image, or window around the last position.
+        :return: Left, top, right, bottom of the region.
+        """
+        if not track or self.last_match is None:
+            return 0, 0, shape[1], shape[0]
+        height, width = self.templates[0][0].shape[:2]
+        margin = max(16, max(width, height) // 2)
+        left = int(self.last_match['left']) - margin
+        top = int(self.last_match['top']) - margin
+        return (max(left, 0), max(top, 0), min(left + width + 2 * margin, shape[1]),
+                min(top + height + 2 * margin, shape[0]))
+
+    def search(self, image: np.ndarray, region: tuple) -> dict:
+        """
+        Coarse to fine search in a region of an image.
+        :param image: Array containing the image (8 bits).
+        :param region: Left, top, right, bottom of the search region.
+        :return: Best match (see find).
+        """
+        left, top, right, bottom = region
+        height, width = self.templates[0][0].shape[:2]
+        if right - left < width or bottom - top < height:
+            return None
+        pyramid = build_pyramid(image[top:bottom, left:right], self.nb_levels)
+        # Coarsest level : whole region, all the angles
+        coarse = self.nb_levels - 1
+        best = (-2.0, 0, 0, 0)
+        for k, templates in enumerate(self.templates):
+            template = templates[coarse]
+            if (pyramid[coarse].shape[0] < template.shape[0]
+                    or pyramid[coarse].shape[1] < template.shape[1]):
+                return None
+            _, score, _, (x, y) = cv2.minMaxLoc(cv2.matchTemplate(pyramid[coarse], template,
+                                                                  MATCH_METHOD))
+            if score > best[0]:
+                best = (score, x, y, k)
+        score, x, y, k = best
+        # Finer levels : small window around the coarser position
+        for level in range(coarse - 1, -1, -1):
+            x, y = 2 * x, 2 * y
+            results = {}
+            for j in range(max(k - 1, 0), min(k + 2, len(self.angles))):
+                results[j] = match_window(pyramid[level], self.templates[j][level], x, y,
+                                          REFINE_RADIUS)
+            k = max(results, key=lambda j: results[j][0])
+            score, x, y, scores, (window_x, window_y) = results[k]
+        angle = float(self.angles[k])
+        if len(self.angles) > 1 and coarse > 0:
+            # Bisection of the angle step at full resolution
+            step = (self.angles[1] - self.angles[0]) / 2
+            for j in range(ANGLE_REFINE_STEPS):
+                candidates = {}
+                for candidate in (angle - step, angle + step):
+                    candidates[candidate] = match_window(
+                        pyramid[0], self.get_rotated_template(candidate), x, y, REFINE_RADIUS)
+                candidate = max(candidates, key=lambda a: candidates[a][0])
+                if candidates[candidate][0] > score:
+                    angle = candidate
+                    score, x, y, scores, (window_x, window_y) = candidates[candidate]
+                step /= 2
+        # Sub-pixel position : parabola through the maximum and its neighbours
+        sub_x, sub_y = float(x), float(y)
+        if coarse > 0 and scores is not None:
+            if 0 < window_x < scores.shape[1] - 1:
+                sub_x += get_parabola_peak(*scores[window_y, window_x - 1:window_x + 2])
+            if 0 < window_y < scores.shape[0] - 1:
+                sub_y += get_parabola_peak(*scores[window_y - 1:window_y + 2, window_x])
+        return {'x': left + sub_x + (width - 1) / 2, 'y': top + sub_y + (height - 1) / 2,
+                'left': left + x, 'top': top + y, 'width': width, 'height': height,
+                'score': float(score), 'angle': angle}
+
+    def find(self, image: np.ndarray, min_score: float = 0.6, track: bool = True) -> dict:
+        """
+        Find the template in an image.
+        :param image: Array containing the image (8 bits).
+        :param min_score: Minimum correlation score (-1 to 1) of a found pattern.
+        :param track: True to search around the last position first.
+        :return: Dictionary : 'x' and 'y' (center of the pattern, sub-pixel), 'left' and
+            'top' (position of the template), 'width' and 'height' (size of the template),
+            'score', 'angle' (degrees, counterclockwise), 'found' (score >= min_score),
+            'tracked' (found in the window of the last position) - or None if no
+            template is taught or if the image is smaller than the template.
+        """
+        if self.templates is None:
+            return None
+        tracked = track and self.last_match is not None
+        match = self.search(image, self.get_search_region(image.shape, track))
+        if tracked and (match is None or match['score'] < min_score):
+            # Pattern lost around the last position : search in the whole image
+            tracked = False
+            match = self.search(image, self.get_search_region(image.shape, False))
+        if match is None:
+            self.last_match = None
+            return None
+        match['found'] = match['score'] >= min_score
+        match['tracked'] = tracked
+        self.last_match = match if match['found'] else None
+        return match
+
+    def __call__(self, image: np.ndarray, params: dict) -> dict:
+        """
+        Find the template (same interface as the operators).
+        :param image: Array containing the image (8 bits).
+        :param params: 'min_score' and 'track' - see find. 'teach_id' can be given to
+            compute the node again after a new teach.
+        :return: See find.
+        """
+        return self.find(image, params.get('min_score', 0.6), params.get('track', True))
+
+
+def draw_match(image: np.ndarray, match: dict, color: tuple = (0, 255, 0)) -> np.ndarray:
+    """
+    Draw the rotated box and the center of a match over an image.
+    :param image: Array containing the image (8 bits, gray or RGB).
+    :param match: Result of TemplateMatcher.find, or None (image only).
+    :param color: RGB color of a found pattern (red if the score is too low).
+    :return: RGB image.
+    """
+    if image.ndim == 2:
+        output_image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+    else:
+        output_image = image.copy()
+    if match is None:
+        return output_image
+    color = color if match['found'] else (255, 0, 0)
+    box = cv2.boxPoints(((match['x'], match['y']), (match['width'], match['height']),
+                         -match['angle']))
+    cv2.polylines(output_image, [np.round(box).astype(np.int32)], True, color, 2)
+    cv2.drawMarker(output_image, (int(round(match['x'])), int(round(match['y']))), color,
+                   cv2.MARKER_CROSS, 12, 2)
+    return output_image
+
+
+if __name__ == '__main__':
+    import time
+
+    # Full frame (1920 x 1200) with a pattern moving by sub-pixel steps
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur(rng.integers(0, 256, (1200, 1920)).astype(np.float32), (0, 0), 3)
+    scene = cv2.normalize(scene, None, 0, 255, cv2.NORM_MINMAX)
+    x0, y0 = 800.0, 500.0
+
+    def get_frame(dx: float, dy: float, angle: float = 0) -> np.ndarray:
+        transform = cv2.getRotationMatrix2D((x0 + 63.5, y0 + 63.5), angle, 1)
+        transform[:, 2] += (dx, dy)
+        return cv2.warpAffine(scene, transform, (1920, 1200)).astype(np.uint8)
+
+    matcher = TemplateMatcher()
+    matcher.teach(scene[int(y0):int(y0) + 128, int(x0):int(x0) + 128].astype(np.uint8))
+    for track in [False, True]:
+        matcher.reset()
+        errors = []
+        t1 = time.perf_counter()
+        for k in range(20):
+            dx, dy = 3.3 * k, -1.7 * k
+            match = matcher.find(get_frame(dx, dy), track=track)
+            errors.append(np.hypot(match['x'] - (x0 + 63.5 + dx), match['y'] - (y0 + 63.5 + dy)))
+        t2 = time.perf_counter()
+        print(f'Track {track} : {(t2-t1)*50:.2f} ms / frame (with warpAffine of the frame) - '
+              f'max error {max(errors):.3f} px - levels {matcher.nb_levels}')
+    frame = get_frame(25.4, -12.2)
+    matcher.reset()
+    t1 = time.perf_counter()
+    for k in range(20):
+        matcher.find(frame, track=False)
+    t2 = time.perf_counter()
+    for k in range(20):
+        matcher.find(frame, track=True)
+    t3 = time.perf_counter()
+    print(f'Full search : {(t2-t1)*50:.2f} ms - tracked : {(t3-t2)*50:.2f} ms')
+    # Rotation
+    matcher.teach(scene[int(y0):int(y0) + 128, int(x0):int(x0) + 128].astype(np.uint8),
+                  angle_range=30)
+    for angle in [-20, 7.5, 18]:
+        frame = get_frame(10, 5, angle)
+        t1 = time.perf_counter()
+        match = matcher.find(frame, track=False)
+        t2 = time.perf_counter()
+        print(f'Rotation {angle} deg : found {match["angle"]:.1f} deg - score {match["score"]:.2f} '
+              f'- error {np.hypot(match["x"] - x0 - 73.5, match["y"] - y0 - 68.5):.2f} px - '
+              f'{(t2-t1)*1000:.2f} ms ({len(matcher.angles)} angles)')
+    # Uniform template (dark or saturated AOI) : rejected, it would match everywhere
+    try:
+        matcher.teach(np.full((64, 64), 255, dtype=np.uint8))
+        raise AssertionError('Uniform template accepted')
+    except ValueError as error:
+        assert matcher.template is None
+        print(f'Uniform template : {error}')
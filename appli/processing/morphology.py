@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""*morphology.py* file.
+
+This file contains a morphology engine whose cost grows with the radius of the
+structuring element, not with its area.
+
+A structuring element made of one run per line (rectangle, cross, ellipse...) is
+decomposed in rectangles R1...Rn : the erosion (dilation) by the union is the minimum
+(maximum) of the erosions (dilations) by each rectangle, and a rectangle is separable
+in a horizontal line and a vertical line. When the rectangles are nested (widths
+increasing, heights decreasing, as for a cross or an ellipse), they are processed
+in cascade : each line is obtained from the previous one with a short line of
+the size difference, so the total length of the lines is about the size of the
+structuring element, instead of its area for OpenCV.
+
+Lines are processed by OpenCV (SIMD). A running minimum (maximum) in numpy, as the
+van Herk / Gil-Werman algorithm, is only faster for lines of more than 500 pixels,
+far longer than the kernels of the application.
+
+Borders are processed as OpenCV (pixels out of the image are ignored), so the results
+are the same as cv2.erode / cv2.dilate / cv2.morphologyEx with the default anchor
+(see test/morphology_check.py).
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+
+# Decompositions of the last structuring elements
+_rectangles_cache = {}
+
+
+def get_kernel_rectangles(kernel: np.ndarray) -> list:
+    """
+    Decompose a structuring element in rectangles.
+    :param kernel: Structuring element (the anchor is the center).
+    :return: List of (row_start, row_stop, col_start, col_stop) offsets from the anchor,
+        or None if a line of the structuring element has more than one run.
+    """
+    kernel = np.asarray(kernel) != 0
+    key = (kernel.shape, kernel.tobytes())
+    if key not in _rectangles_cache:
+        if len(_rectangles_cache) > 32:
+            _rectangles_cache.clear()
+        _rectangles_cache[key] = decompose_kernel(kernel)
+    return _rectangles_cache[key]
+
+
+def decompose_kernel(kernel: np.ndarray) -> list:
+    """
+    Decompose a structuring element in rectangles (see get_kernel_rectangles).
+    :param kernel: Array of booleans.
+    """
+    anchor_y, anchor_x = kernel.shape[0] // 2, kernel.shape[1] // 2
+    runs = {}
+    for row in range(kernel.shape[0]):
+        columns = np.flatnonzero(kernel[row])
+        if len(columns) == 0:
+            continue
+        if columns[-1] - columns[0] + 1 != len(columns):
+            return None     # More than one run on a line
+        runs[row] = (columns[0], columns[-1])
+    if len(runs) == 0:
+        return None
+    rectangles = []
+    for run in sorted(set(runs.values())):
+        # Bands of consecutive lines containing this run
+        rows = sorted(row for row, (first, last) in runs.items()
+                      if first <= run[0] and run[1] <= last)
+        band_start = rows[0]
+        for k, row in enumerate(rows):
+            if k == len(rows) - 1 or rows[k + 1] != row + 1:
+                rectangles.append((band_start - anchor_y, row - anchor_y,
+                                   run[0] - anchor_x, run[1] - anchor_x))
+                if k < len(rows) - 1:
+                    band_start = rows[k + 1]
+    # Remove the rectangles included in another one
+    rectangles = [r for r in rectangles
+                  if not any(o != r and o[0] <= r[0] and r[1] <= o[1] and o[2] <= r[2]
+                             and r[3] <= o[3] for o in rectangles)]
+    # Check that the union is exactly the structuring element
+    union = np.zeros_like(kernel)
+    for row_start, row_stop, col_start, col_stop in rectangles:
+        union[row_start + anchor_y:row_stop + anchor_y + 1,
+              col_start + anchor_x:col_stop + anchor_x + 1] = True
+    if not np.array_equal(union, kernel):
+        return None
+    return rectangles
+
+
+def line_extremum(image: np.ndarray, start: int, stop: int, axis: int,
+                  erosion: bool) -> np.ndarray:
+    """
+    Erosion or dilation by a line : output[i] = min or max(image[i+start], ..., image[i+stop]).
+    :param image: Array containing the image (2D).
+    :param start: First offset of the line (<= 0).
+    :param stop: Last offset of the line (>= 0).
+    :param axis: 0 for a vertical line, 1 for a horizontal line.
+    :param erosion: True for an erosion, False for a dilation.
+    """
+    size = stop - start + 1
+    if size == 1:
+        return image
+    if axis == 1:
+        kernel, anchor = np.ones((1, size), np.uint8), (-start, 0)
+    else:
+        kernel, anchor = np.ones((size, 1), np.uint8), (0, -start)
+    if erosion:
+        return cv2.erode(image, kernel, anchor=anchor)
+    return cv2.dilate(image, kernel, anchor=anchor)
+
+
+def is_nested(rectangles: list) -> bool:
+    """
+    Return True if the rectangles, sorted by width, have increasing widths and decreasing
+    heights (each one contains the anchor and the columns of the previous one).
+    """
+    for k, (row_start, row_stop, col_start, col_stop) in enumerate(rectangles):
+        if not (row_start <= 0 <= row_stop and col_start <= 0 <= col_stop):
+            return False
+        if k > 0:
+            previous = rectangles[k - 1]
+            if not (previous[0] <= row_start and row_stop <= previous[1] and
+                    col_start <= previous[2] and previous[3] <= col_stop):
+                return False
+    return True
+
+
+def rectangles_extremum(image: np.ndarray, rectangles: list, erosion: bool) -> np.ndarray:
+    """
+    Erosion or dilation of an image by a union of rectangles.
+    :param image: Array containing the image (2D).
+    :param rectangles: List of (row_start, row_stop, col_start, col_stop) offsets.
+    :param erosion: True for an erosion, False for a dilation.
+    """
+    function = np.minimum if erosion else np.maximum
+    rectangles = sorted(rectangles, key=lambda r: (r[3] - r[2], r[0] - r[1]))
+    if not is_nested(rectangles):
+        output = None
+        for row_start, row_stop, col_start, col_stop in rectangles:
+            result = line_extremum(line_extremum(image, col_start, col_stop, 1, erosion),
+                                   row_start, row_stop, 0, erosion)
+            output = result if output is None else function(output, result)
+        return output
+    # Cascade : X = min(H_k, V(X)), H_k from H_k-1 and V with the size differences
+    row_start, row_stop, col_start, col_stop = rectangles[0]
+    lines = line_extremum(image, col_start, col_stop, 1, erosion)
+    output = lines
+    for previous, rectangle in zip(rectangles[:-1], rectangles[1:]):
+        lines = line_extremum(lines, rectangle[2] - previous[2], rectangle[3] - previous[3],
+                              1, erosion)
+        output = line_extremum(output, previous[0] - rectangle[0], previous[1] - rectangle[1],
+                               0, erosion)
+        output = function(output, lines)
+    return line_extremum(output, rectangles[-1][0], rectangles[-1][1], 0, erosion)
+
+
+def erode(image: np.ndarray, kernel: np.ndarray, rectangles: list = None) -> np.ndarray:
+    """
+    Erosion of an image (same result as cv2.erode).
+    :param image: Array containing the image (2D).
+    :param kernel: Structuring element.
+    :param rectangles: Decomposition of the structuring element. Default None (computed).
+    """
+    if rectangles is None:
+        rectangles = get_kernel_rectangles(kernel)
+    return rectangles_extremum(image, rectangles, True)
+
+
+def dilate(image: np.ndarray, kernel: np.ndarray, rectangles: list = None) -> np.ndarray:
+    """
+    Dilation of an image (same result as cv2.dilate).
+    :param image: Array containing the image (2D).
+    :param kernel: Structuring element.
+    :param rectangles: Decomposition of the structuring element. Default None (computed).
+    """
+    if rectangles is None:
+        rectangles = get_kernel_rectangles(kernel)
+    return rectangles_extremum(image, rectangles, False)
+
+
+def morphology_ex(image: np.ndarray, operation: str, kernel: np.ndarray) -> np.ndarray:
+    """
+    Morphological operation (same result as OpenCV).
+    :param image: Array containing the image (2D).
+    :param operation: 'erosion', 'dilation', 'opening', 'closing' or 'gradient'.
+    :param kernel: Structuring element (must be decomposable, see get_kernel_rectangles).
+    """
+    rectangles = get_kernel_rectangles(kernel)
+    if rectangles is None:
+        raise ValueError('The structuring element is not a union of rectangles')
+    if operation == 'erosion':
+        return erode(image, kernel, rectangles)
+    elif operation == 'dilation':
+        return dilate(image, kernel, rectangles)
+    elif operation == 'opening':
+        return dilate(erode(image, kernel, rectangles), kernel, rectangles)
+    elif operation == 'closing':
+        return erode(dilate(image, kernel, rectangles), kernel, rectangles)
+    elif operation == 'gradient':
+        return dilate(image, kernel, rectangles) - erode(image, kernel, rectangles)
+    raise ValueError(f'Unknown operation {operation}')
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""*mtf.py* file.
+
+This file contains the measurement of the MTF (modulation transfer function) of an
+optical system with a slanted edge (ISO 12233 method) :
+
+    edge location -> edge spread function (ESF) -> line spread function (LSF) -> MTF
+
+- the edge is located in each row (or column) of the AOI by the centroid of the
+  derivative, then fitted by a line : the slant of the edge gives the sub-pixel
+  position of each pixel relative to the edge,
+- all the pixels are projected on the normal of the edge and averaged in bins of
+  1 / oversampling pixel (numpy.bincount : no loop), this is the oversampled ESF,
+- the derivative of the ESF is the LSF, windowed (Hamming) around its peak,
+- the modulus of the FFT of the LSF is the MTF, normalized at the zero frequency and
+  corrected for the transfer function of the derivative.
+
+The measurement is only valid for a slanted edge (at least MIN_EDGE_ANGLE degrees :
+an edge aligned with the pixels gives no sub-pixel sampling, and an MTF above the
+Nyquist frequency) with a contrast well above the noise (MIN_EDGE_SNR).
+
+The MTF50 is the frequency where the MTF falls to 50 %. The contrast of a bar target
+(Foucault target, square waves) is computed from the MTF (sine waves) with the series
+of Coltman :
+
+    CTF(f) = 4 / pi * (MTF(f) - MTF(3f) / 3 + MTF(5f) / 5 - MTF(7f) / 7 + ...)
+
+Frequencies are in cycles per pixel (0.5 is the Nyquist frequency).
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+from processing.frequency import rfft
+from processing.segmentation import get_coordinates
+
+MTF_OVERSAMPLING = 4
+# Half width of the LSF window in pixels
+LSF_HALF_WIDTH = 16
+# Length of the FFT of the LSF (zero-padding for a smooth curve)
+MTF_FFT_LENGTH = 512
+# Number of odd harmonics of the series of Coltman
+COLTMAN_TERMS = 8
+# Minimum slant of the edge in degrees (oversampling of the ESF)
+MIN_EDGE_ANGLE = 2.0
+# Minimum ratio of the contrast of the edge to the noise of the flat areas
+MIN_EDGE_SNR = 10.0
+# Distance to the edge of the flat areas, in pixels
+EDGE_MARGIN = 4
+
+
+def locate_edge(image: np.ndarray, threshold: float = 0.2) -> tuple[float, float]:
+    """
+    Locate a near vertical edge in an image.
+    :param image: Array containing the image (float).
+    :param threshold: Minimum derivative in each row, ratio of the maximum of the row.
+    :return: Slope and intercept of the edge (x = slope * y + intercept), or None if
+        no edge is found.
+    """
+    derivative = np.diff(image, axis=1)
+    # Rising or falling edge : the derivative is made positive
+    derivative *= np.sign(derivative.sum())
+    # Centroid in a window around the maximum of each row (the noise of the flat areas
+    # would pull it to the center of the row)
+    columns = np.arange(derivative.shape[1])
+    peaks = np.argmax(derivative, axis=1)[:, np.newaxis]
+    window = np.abs(columns - peaks) <= LSF_HALF_WIDTH // 2
+    weights = np.where(window & (derivative > threshold * derivative.max(axis=1, keepdims=True)),
+                       derivative, 0)
+    total = weights.sum(axis=1)
+    rows = np.flatnonzero(total > 0)
+    if len(rows) < 3:
+        return None
+    # Centroid of the derivative in each row (the derivative is between 2 pixels)
+    centers = weights[rows] @ (columns + 0.5) / total[rows]
+    slope, intercept = np.polyfit(rows, centers, 1)
+    # Rows far from the line (noise, other structures) are removed
+    inliers = np.abs(centers - (slope * rows + intercept)) < 2
+    if np.count_nonzero(inliers) < 3:
+        return None
+    slope, intercept = np.polyfit(rows[inliers], centers[inliers], 1)
+    return float(slope), float(intercept)
+
+
+def get_esf(image: np.ndarray, slope: float, intercept: float,
+            oversampling: int = MTF_OVERSAMPLING) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Oversampled edge spread function : pixels averaged by distance to the edge.
+    :param image: Array containing the image (float).
+    :param slope: Slope of the edge (see locate_edge).
+    :param intercept: Intercept of the edge (see locate_edge).
+    :param oversampling: Number of bins per pixel.
+    :return: Distance to the edge of each bin in pixels, and ESF.
+    """
+    x, y = get_coordinates(image.shape)
+    # Distance to the edge, along the normal of the edge
+    distance = (x - (slope * y + intercept)) / np.hypot(1, slope)
+    index = np.floor(distance * oversampling).astype(np.int64)
+    offset = index.min()
+    index -= offset
+    counts = np.bincount(index)
+    sums = np.bincount(index, weights=image.ravel())
+    filled = counts > 0
+    positions = (np.arange(len(counts)) + offset + 0.5) / oversampling
+    # Empty bins (large slopes) are interpolated
+    esf = np.interp(positions, positions[filled], sums[filled] / counts[filled])
+    return positions, esf
+
+
+def get_edge_snr(image: np.ndarray, slope: float, intercept: float,
+                 margin: float = EDGE_MARGIN) -> float:
+    """
+    Ratio of the contrast of the edge to the noise of the flat areas on each side.
+    :param image: Array containing the image (float).
+    :param slope: Slope of the edge (see locate_edge).
+    :param intercept: Intercept of the edge (see locate_edge).
+    :param margin: Minimum distance of the pixels of the flat areas to the edge.
+    :return: Difference of the means of the 2 sides divided by the standard deviation
+        of the pixels (0 if a side has too few pixels).
+    """
+    x, y = get_coordinates(image.shape)
+    distance = (x - (slope * y + intercept)) / np.hypot(1, slope)
+    pixels = image.ravel()
+    dark, bright = pixels[distance < -margin], pixels[distance > margin]
+    if len(dark) < 16 or len(bright) < 16:
+        return 0.0
+    noise = np.sqrt((dark.var() + bright.var()) / 2)
+    return float(abs(bright.mean() - dark.mean()) / max(noise, 1e-6))
+
+
+def get_mtf_from_esf(esf: np.ndarray, oversampling: int = MTF_OVERSAMPLING) -> tuple:
+    """
+    MTF from an oversampled edge spread function.
+    :param esf: Edge spread function.
+    :param oversampling: Number of bins per pixel.
+    :return: Frequencies (cycles per pixel), MTF and windowed LSF.
+    """
+    lsf = np.diff(esf)
+    lsf *= np.sign(lsf.sum())
+    peak = int(np.argmax(lsf))
+    half_width = min(LSF_HALF_WIDTH * oversampling, peak, len(lsf) - 1 - peak)
+    lsf = lsf[peak - half_width:peak + half_width + 1] * np.hamming(2 * half_width + 1)
+    spectrum = np.abs(rfft(lsf, n=max(MTF_FFT_LENGTH, len(lsf))))
+    frequencies = np.fft.rfftfreq(max(MTF_FFT_LENGTH, len(lsf)), d=1 / oversampling)
+    mtf = spectrum / max(spectrum[0], 1e-12)
+    # Transfer function of the derivative (difference of 2 bins)
+    mtf /= np.maximum(np.sinc(frequencies / oversampling), 0.1)
+    # Up to twice the Nyquist frequency
+    keep = frequencies <= 1
+    return frequencies[keep], mtf[keep], lsf
+
+
+def get_mtf50(frequencies: np.ndarray, mtf: np.ndarray, level: float = 0.5) -> float:
+    """
+    Return the first frequency where the MTF falls below a level.
+    :param frequencies: Frequencies.
+    :param mtf: MTF.
+    :param level: Level of the MTF. Default 0.5.
+    :return: Frequency (linear interpolation), or None if the MTF stays above the level.
+    """
+    below = np.flatnonzero(mtf < level)
+    if len(below) == 0 or below[0] == 0:
+        return None
+    k = below[0]
+    return float(np.interp(level, [mtf[k], mtf[k - 1]], [frequencies[k], frequencies[k - 1]]))
+
+
+def get_bar_contrast(frequencies: np.ndarray, mtf: np.ndarray) -> np.ndarray:
+    """
+    Contrast of a bar target (square waves) from the MTF (series of Coltman).
+    :param frequencies: Frequencies of the MTF.
+    :param mtf: MTF.
+    :return: Contrast of bars at the same frequencies (0 beyond the last frequency).
+    """
+    contrast = np.zeros_like(mtf)
+    for k in range(COLTMAN_TERMS):
+        harmonic = 2 * k + 1
+        sign = -1 if k % 2 else 1
+        contrast += sign * np.interp(harmonic * frequencies, frequencies, mtf, right=0) / harmonic
+    return np.clip(4 / np.pi * contrast, 0, None)
+
+
+def measure_mtf(image: np.ndarray, params: dict) -> dict:
+    """
+    Slanted-edge MTF measurement (same interface as the operators).
+    :param image: Array containing the image (AOI around a slanted edge).
+    :param params: 'oversampling' - number of bins per pixel of the ESF.
+    :return: Dictionary : 'frequencies', 'mtf', 'bar_contrast', 'mtf50', 'mtf_nyquist',
+        'angle' (slant of the edge in degrees), 'vertical' (orientation of the edge),
+        'slope' and 'intercept' (see locate_edge, in the image coordinates),
+        'esf_positions', 'esf', 'lsf', 'snr' (see get_edge_snr), 'error' (None for a
+        valid measurement, 'angle' for an edge not slanted enough, 'contrast' for a
+        low contrast edge : 'mtf50' is then None) - or None if no edge is found.
+    """
+    oversampling = params.get('oversampling', MTF_OVERSAMPLING)
+    image = image.astype(np.float32)
+    # Near horizontal edges are processed in the transposed image
+    vertical = (np.abs(np.diff(image, axis=1)).sum() >= np.abs(np.diff(image, axis=0)).sum())
+    if not vertical:
+        image = image.T
+    edge = locate_edge(image)
+    if edge is None:
+        return None
+    slope, intercept = edge
+    angle = float(np.degrees(np.arctan(slope)))
+    snr = get_edge_snr(image, slope, intercept)
+    error = None
+    if snr < MIN_EDGE_SNR:
+        error = 'contrast'
+    elif abs(angle) < MIN_EDGE_ANGLE:
+        error = 'angle'
+    positions, esf = get_esf(image, slope, intercept, oversampling)
+    frequencies, mtf, lsf = get_mtf_from_esf(esf, oversampling)
+    return {'frequencies': frequencies, 'mtf': mtf,
+            'bar_contrast': get_bar_contrast(frequencies, mtf),
+            'mtf50': get_mtf50(frequencies, mtf) if error is None else None,
+            'mtf_nyquist': float(np.interp(0.5, frequencies, mtf)),
+            'angle': angle, 'vertical': bool(vertical),
+            'slope': slope, 'intercept': intercept,
+            'esf_positions': positions, 'esf': esf, 'lsf': lsf,
+            'snr': snr, 'error': error}
+
+
+def draw_edge(image: np.ndarray, result: dict, color: tuple = (255, 0, 0)) -> np.ndarray:
+    """
+    Draw the fitted edge over an image.
+    :param image: Array containing the image (8 bits, gray or RGB).
+    :param result: Result of measure_mtf, or None (image only).
+    :param color: RGB color of the edge.
+    :return: RGB image.
+    """
+    if image.ndim == 2:
+        output_image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+    else:
+        output_image = image.copy()
+    if result is None:
+        return output_image
+    length = image.shape[0] if result['vertical'] else image.shape[1]
+    # Ends of the edge (x = slope * y + intercept in the transposed image if horizontal)
+    ends = [(result['slope'] * t + result['intercept'], t) for t in (0, length - 1)]
+    if not result['vertical']:
+        ends = [(t, position) for position, t in ends]
+    cv2.line(output_image, tuple(int(round(v)) for v in ends[0]),
+             tuple(int(round(v)) for v in ends[1]), color, 1)
+    return output_image
+
+
+if __name__ == '__main__':
+    import math
+    import time
+
+    # Slanted edge (5 degrees) blurred by a gaussian PSF : MTF(f) = exp(-2 (pi sigma f)^2)
+    sigma = 1.0
+    size = 400
+    y, x = np.indices((size, size))
+    angle = np.radians(5)
+    distance = (x - size / 2 - np.tan(angle) * (y - size / 2)) * np.cos(angle)
+    erf = np.frompyfunc(math.erf, 1, 1)
+    edge = 0.5 * (1 + erf(distance / (sigma * np.sqrt(2))).astype(np.float64))
+    image = (edge * 3000 + 500).astype(np.uint16)
+    t1 = time.perf_counter()
+    for k in range(10):
+        result = measure_mtf(image, {})
+    t2 = time.perf_counter()
+    theory = np.sqrt(np.log(2) / 2) / (np.pi * sigma)
+    print(f'MTF (400x400) : {(t2-t1)*100:.2f} ms - angle = {result["angle"]:.2f} deg')
+    print(f'MTF50 = {result["mtf50"]:.4f} c/px (theory {theory:.4f}) - '
+          f'MTF(Nyquist) = {result["mtf_nyquist"]:.3f} '
+          f'(theory {np.exp(-2 * (np.pi * sigma * 0.5) ** 2):.3f})')
+    k = np.argmin(np.abs(result['frequencies'] - 0.1))
+    print(f'Bar contrast at 0.1 c/px = {result["bar_contrast"][k]:.3f} - '
+          f'MTF = {result["mtf"][k]:.3f}')
+    result_h = measure_mtf(image.T.copy(), {})
+    print(f'Horizontal edge : MTF50 = {result_h["mtf50"]:.4f} - vertical = {result_h["vertical"]}')
+    # Invalid measurements : edge aligned with the pixels, pure noise
+    rng = np.random.default_rng(0)
+    aligned = np.where(x < size / 2, 500, 3500) + rng.normal(0, 20, (size, size))
+    noise = rng.normal(2000, 100, (size, size))
+    noisy_edge = image + rng.normal(0, 100, (size, size))
+    for name, test_image in [('Aligned edge', aligned), ('Noise', noise),
+                             ('Noisy edge', noisy_edge)]:
+        test = measure_mtf(test_image, {})
+        if test is None:
+            print(f'{name} : no edge')
+        else:
+            print(f'{name} : angle {test["angle"]:.2f} deg - SNR {test["snr"]:.1f} - '
+                  f'error {test["error"]} - MTF50 {test["mtf50"]}')
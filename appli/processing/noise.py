@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""*noise.py* file.
+
+This file contains a noise injection stage for the live comparison of the smoothing
+filters on noisy images :
+- gaussian : additive noise, standard deviation 'level' (in 8 bits gray levels),
+- poisson : shot noise, approximated by a gaussian noise of variance proportional to
+  the value of the pixel ('level' is the standard deviation at the full scale),
+- salt_pepper : 'level' % of the pixels set to the minimum or the maximum value,
+- fixed_pattern : offset of each pixel and of each column (same pattern for all the
+  frames, as the dark signal non-uniformity of a sensor), standard deviation 'level'.
+
+Random numbers are not generated for each frame : a noise bank slightly larger than
+the image is generated once (numpy.random.Generator) for each set of parameters, and
+each frame uses a view of the bank at a random offset. The injection only costs one
+or two saturated operations per frame (cv2.add / cv2.subtract, cv2.min / cv2.max), and
+a square root and a product for the shot noise.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+
+NOISE_TYPES = ['gaussian', 'poisson', 'salt_pepper', 'fixed_pattern']
+# Maximum offset of the view in the bank (rows and columns)
+BANK_MARGIN = 64
+
+
+def split_signed(noise: np.ndarray, dtype: type) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split a signed noise into its positive and negative parts (for saturated additions).
+    :param noise: Array of noise values.
+    :param dtype: Type of the images.
+    :return: Positive part, opposite of the negative part (same type as the images).
+    """
+    max_value = np.iinfo(dtype).max
+    noise = np.rint(noise)
+    positive = np.clip(noise, 0, max_value).astype(dtype)
+    negative = np.clip(-noise, 0, max_value).astype(dtype)
+    return positive, negative
+
+
+class NoiseInjector:
+    """
+    Noise injection from pre-generated noise banks.
+    """
+
+    def __init__(self, seed: int = None, margin: int = BANK_MARGIN):
+        """
+        Default Constructor.
+        :param seed: Seed of the random generator. Default None (random).
+        :param margin: Maximum offset of the view in the banks.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.margin = margin
+        self.bank_key = None
+        self.banks = ()
+
+    def generate_banks(self, shape: tuple, dtype: type, noise_type: str, level: float,
+                       bit_depth: int):
+        """
+        Generate the noise banks (only when the parameters or the images changed).
+        :param shape: Shape of the images.
+        :param dtype: Type of the images.
+        :param noise_type: Type of noise, see NOISE_TYPES.
+        :param level: Level of the noise, see the description of the file.
+        :param bit_depth: Bits depth of the images.
+        """
+        key = (shape, dtype, noise_type, level, bit_depth)
+        if key == self.bank_key:
+            return
+        self.bank_key = key
+        scale = 2 ** (bit_depth - 8)    # 8 bits gray levels to the bits depth of the images
+        margin = 0 if noise_type == 'fixed_pattern' else self.margin
+        bank_shape = (shape[0] + margin, shape[1] + margin) + tuple(shape[2:])
+        max_value = 2 ** bit_depth - 1
+        if noise_type == 'gaussian':
+            noise = self.rng.standard_normal(bank_shape, dtype=np.float32) * (level * scale)
+            self.banks = split_signed(noise, dtype)
+        elif noise_type == 'poisson':
+            # Standard deviation proportional to the square root of the value
+            self.poisson_gain = level * scale / np.sqrt(max_value)
+            self.banks = (self.rng.standard_normal(bank_shape, dtype=np.float32),)
+        elif noise_type == 'salt_pepper':
+            draw = self.rng.random(bank_shape, dtype=np.float32)
+            density = level / 100
+            salt = np.where(draw < density / 2, max_value, 0).astype(dtype)
+            pepper = np.where(draw > 1 - density / 2, 0, max_value).astype(dtype)
+            self.banks = (salt, pepper)
+        elif noise_type == 'fixed_pattern':
+            # Pixel offsets and column offsets, same pattern for all the frames
+            noise = self.rng.standard_normal(bank_shape, dtype=np.float32)
+            columns = self.rng.standard_normal((1, bank_shape[1]) + tuple(shape[2:]),
+                                               dtype=np.float32)
+            noise = (noise + 2 * columns) * (level * scale / np.sqrt(5))
+            self.banks = split_signed(noise, dtype)
+        else:
+            self.banks = ()
+
+    def get_views(self, shape: tuple) -> list:
+        """
+        Return views of the banks at a random offset.
+        :param shape: Shape of the images.
+        """
+        height, width = shape[:2]
+        bank_height, bank_width = self.banks[0].shape[:2]
+        y = self.rng.integers(0, bank_height - height + 1)
+        x = self.rng.integers(0, bank_width - width + 1)
+        return [bank[y:y + height, x:x + width] for bank in self.banks]
+
+    def __call__(self, frame: np.ndarray, params: dict) -> np.ndarray:
+        """
+        Add noise to an image (same interface as the operators).
+        :param frame: Array containing the image (uint8 or uint16).
+        :param params: 'type' - type of noise (see NOISE_TYPES) or None, 'level' - level
+            of the noise, 'bit_depth' - bits depth of a uint16 image.
+        :return: Noisy image, or the image itself if no noise is selected.
+        """
+        noise_type = params.get('type')
+        level = params.get('level', 0)
+        if noise_type not in NOISE_TYPES or level <= 0:
+            return frame
+        bit_depth = 8 if frame.dtype == np.uint8 else params.get('bit_depth', 16)
+        self.generate_banks(frame.shape, frame.dtype, noise_type, level, bit_depth)
+        views = self.get_views(frame.shape)
+        if noise_type == 'salt_pepper':
+            return cv2.min(cv2.max(frame, views[0]), views[1])
+        if noise_type == 'poisson':
+            noise = cv2.multiply(cv2.sqrt(frame.astype(np.float32)), views[0],
+                                 scale=self.poisson_gain)
+            output_image = cv2.add(frame, noise, dtype=cv2.CV_8U if frame.dtype == np.uint8
+                                   else cv2.CV_16U)
+        else:
+            output_image = cv2.subtract(cv2.add(frame, views[0]), views[1])
+        if frame.dtype != np.uint8 and bit_depth < 16:
+            np.minimum(output_image, 2 ** bit_depth - 1, out=output_image)
+        return output_image
+
+
+if __name__ == '__main__':
+    import time
+
+    injector = NoiseInjector(seed=0)
+    for bit_depth, dtype in [(8, np.uint8), (12, np.uint16)]:
+        image = np.full((1000, 1000), 2 ** (bit_depth - 1), dtype=dtype)
+        for noise_type in NOISE_TYPES:
+            params = {'type': noise_type, 'level': 10, 'bit_depth': bit_depth}
+            injector(image, params)     # Generation of the banks
+            t1 = time.perf_counter()
+            for k in range(10):
+                noisy = injector(image, params)
+            t2 = time.perf_counter()
+            print(f'{bit_depth} bits - {noise_type} (1 MP) : {(t2-t1)*100:.2f} ms - '
+                  f'std = {np.std(noisy.astype(np.float32)):.1f}')
+    # Fresh gaussian noise for each frame, for comparison
+    t1 = time.perf_counter()
+    for k in range(10):
+        noise = np.random.default_rng().normal(0, 10, image.shape)
+        noisy = np.clip(image + noise, 0, 4095).astype(np.uint16)
+    t2 = time.perf_counter()
+    print(f'Fresh gaussian noise (1 MP) : {(t2-t1)*100:.2f} ms')
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""*operators.py* file.
+
+This file contains the image operators of the applications (AOI, bits depth,
+quantization, sampling, threshold, contrast, morphology, smoothing filters, slices,
+histogram, Canny edge detector).
+
+All the operators have the same interface :
+
+    result = operator(frame, params)
+
+- frame : array containing the image (AOI),
+- params : dictionary of parameters (see the docstring of each operator),
+- result : array containing the processed image, or a tuple of arrays for the
+  operators with several outputs (sampling, slices).
+
+Operators are registered by name in OPERATORS and can be called with
+apply_operator(name, frame, params). The applications (Basler and IDS) only read the
+parameters in the options widgets and display the results.
+
+All the operators accept 8 bits images and 12/16 bits images (uint16) natively :
+the 'bit_depth' parameter gives the full scale of uint16 images (default 16).
+
+This file is GUI-free and can be used without PyQt6 (benchmarks, batch processing,
+threads...).
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+from typing import Callable
+import cv2
+import numpy as np
+from processing.morphology import morphology_ex
+from processing.sampling import downsample, upscale_nearest
+
+OPERATORS = {}
+
+THRESHOLD_TYPES = [None, 'binary', 'binary_inv', 'hat']
+MORPHOLOGY_OPERATIONS = ['erosion', 'dilation', 'opening', 'closing', 'gradient']
+SMOOTH_FILTERS = ['blur', 'gaussian', 'median']
+# Operators not slower at the bits depth of the camera than after a conversion to 8 bits
+# (see test/bit_depth_benchmark.py) - the point operators also give the 8 bits display
+# in the same pass ('display' parameter). Morphology and smoothing filters are 2 to 3
+# times slower on uint16 images (OpenCV) : they process the 8 bits image.
+NATIVE_OPERATORS = ['threshold', 'quantization', 'sampling', 'contrast_brightness',
+                    'enhance_contrast', 'regions']
+# Minimum size of an ellipse processed by processing.morphology (faster than OpenCV
+# above 19 x 19 in 8 and 16 bits - OpenCV is always faster for crosses and rectangles)
+MORPHOLOGY_ENGINE_MIN_SIZE = 21
+# Minimum size of a gaussian kernel filtered in float32 for uint16 images
+# (OpenCV has no fast path for 16 bits : 13 ms -> 4 ms for 5 x 5 on 1920 x 1200)
+GAUSSIAN_FLOAT_MIN_SIZE = 5
+# Maximum size of the median filter for uint16 images (OpenCV : 8 bits only above)
+MEDIAN_16BITS_MAX_SIZE = 5
+
+KERNEL_SHAPES = {'cross': cv2.MORPH_CROSS,
+                 'rect': cv2.MORPH_RECT,
+                 'ellip': cv2.MORPH_ELLIPSE}
+
+
+def register_operator(name: str) -> Callable:
+    """
+    Decorator to register an operator.
+    :param name: Name of the operator.
+    """
+    def decorator(function: Callable) -> Callable:
+        OPERATORS[name] = function
+        return function
+    return decorator
+
+
+def apply_operator(name: str, frame: np.ndarray, params: dict = None):
+    """
+    Apply an operator to a frame.
+    :param name: Name of the operator.
+    :param frame: Array containing the image.
+    :param params: Dictionary of parameters of the operator.
+    :return: Result of the operator.
+    """
+    if name not in OPERATORS:
+        raise KeyError(f'Unknown operator {name} - available : {list(OPERATORS)}')
+    return OPERATORS[name](frame, params or {})
+
+
+def get_full_scale(frame: np.ndarray, params: dict) -> int:
+    """
+    Return the maximum value of an image (255 for 8 bits, 2**bit_depth-1 for uint16).
+    :param params: 'bit_depth' - bits depth of a uint16 image (default 16).
+    """
+    if frame.dtype == np.uint8:
+        return 255
+    return 2 ** params.get('bit_depth', 16) - 1
+
+
+def get_kernel(kernel_type: str, size: int) -> np.ndarray:
+    """
+    Return a structuring element.
+    :param kernel_type: Shape of the kernel - 'cross', 'rect' or 'ellip'.
+    :param size: Size of the kernel.
+    :return: Array of uint8 containing the kernel.
+    """
+    return cv2.getStructuringElement(KERNEL_SHAPES[kernel_type], (size, size))
+
+
+@register_operator('aoi')
+def crop_aoi(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Area of interest of an image (a view, not a copy).
+    :param params: 'aoi' - (x, y, w, h) or None for the whole image.
+    """
+    aoi = params.get('aoi')
+    if aoi is None:
+        return frame
+    x, y, w, h = aoi
+    return frame[y:y+h, x:x+w]
+
+
+@register_operator('to_8bits')
+def to_8bits(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Convert an image to 8 bits.
+    :param params: 'bit_depth' - bits depth of the image.
+    """
+    delta_depth = params.get('bit_depth', 8) - 8
+    if delta_depth <= 0:
+        return frame
+    # Shift written in the 8 bits output (no 16 bits intermediate image)
+    output_image = np.empty(frame.shape, np.uint8)
+    return np.right_shift(frame, delta_depth, out=output_image, casting='unsafe')
+
+
+@register_operator('quantization')
+def quantize(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Change the quantization of an image.
+    :param params: 'bit_depth' - final bits depth, 'init_depth' - initial bits depth (8).
+    """
+    return frame >> (params.get('init_depth', 8) - params['bit_depth'])
+
+
+@register_operator('sampling')
+def sample(frame: np.ndarray, params: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample an image, then upscale it to its initial size (see processing.sampling).
+    :param params: 'factor' - downsampling factor, 'method' - 'mean' (block mean,
+        default) or 'pick' (first pixel of each block).
+    :return: Small image, image upscaled to the initial size.
+    """
+    factor = params['factor']
+    small_image = downsample(frame, factor, params.get('method', 'mean'))
+    return small_image, upscale_nearest(small_image, factor, frame.shape)
+
+
+@register_operator('threshold')
+def threshold(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Threshold an image.
+    :param params: 'type' - None, 'binary', 'binary_inv' or 'hat',
+        'value' - threshold value, 'value_hat' - high threshold value ('hat' type),
+        'bit_depth' - bits depth of the image (for the None type, converted to 8 bits).
+    """
+    threshold_type = params.get('type')
+    value = params.get('value', 0)
+    if threshold_type == 'binary':
+        _, output_image = cv2.threshold(frame, value, 255, cv2.THRESH_BINARY)
+    elif threshold_type == 'binary_inv':
+        _, output_image = cv2.threshold(frame, value, 255, cv2.THRESH_BINARY_INV)
+    elif threshold_type == 'hat':
+        output_image = cv2.inRange(frame, value, params.get('value_hat', value))
+    else:
+        output_image = to_8bits(frame, params)
+    return output_image
+
+
+@register_operator('contrast_brightness')
+def contrast_brightness(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Change the contrast and the brightness of an image.
+    :param params: 'contrast' - gain, 'brightness' - offset (in 8 bits units),
+        'bit_depth' - bits depth of a uint16 image, 'display' - True to convert a uint16
+        image to 8 bits in the same pass (one rounding, at the end). Default False.
+    """
+    if frame.dtype == np.uint8 or params.get('display', False):
+        # Gain applied at the bits depth of the image, then rounded to 8 bits (SIMD)
+        scale = 1 if frame.dtype == np.uint8 else 2 ** (8 - params.get('bit_depth', 16))
+        return cv2.convertScaleAbs(frame, alpha=params.get('contrast', 1) * scale,
+                                   beta=params.get('brightness', 0))
+    full_scale = get_full_scale(frame, params)
+    beta = params.get('brightness', 0) * (full_scale + 1) / 256
+    output_image = np.abs(frame.astype(np.float32) * params.get('contrast', 1) + beta)
+    return np.rint(np.minimum(output_image, full_scale)).astype(frame.dtype)
+
+
+@register_operator('enhance_contrast')
+def enhance_contrast(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Stretch the [min, max] range of an image to the full scale.
+    :param params: 'min' and 'max' - range to stretch, in the bits depth of the image,
+        'bit_depth' - bits depth of a uint16 image, 'display' - True to convert a uint16
+        image to 8 bits in the same pass (one rounding, at the end). Default False.
+    """
+    min_value, max_value = params['min'], params['max']
+    max_range = get_full_scale(frame, params)
+    gain = max_range / (max_value - min_value)
+    if frame.dtype != np.uint8 and params.get('display', False):
+        # Values under min - 1 saturated to 0, then gain and rounding to 8 bits (SIMD)
+        output_image = cv2.subtract(frame, min_value - 1)
+        return cv2.convertScaleAbs(output_image, alpha=gain * 256 / (max_range + 1))
+    output_image = ((frame.astype(np.int32) - min_value + 1) * gain).astype(np.int32)
+    output_image[output_image > max_range] = max_range
+    output_image[output_image <= 1] = 0
+    return output_image.astype(frame.dtype)
+
+
+@register_operator('morphology')
+def morphology(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Morphological operation.
+    :param params: 'operation' - 'erosion', 'dilation', 'opening', 'closing', 'gradient'
+        or None, 'kernel' - structuring element.
+    """
+    operation = params.get('operation')
+    kernel = params.get('kernel')
+    if operation in MORPHOLOGY_OPERATIONS and is_large_ellipse(kernel):
+        # Large ellipse : decomposed in lines (same result, faster)
+        return morphology_ex(frame, operation, kernel)
+    if operation == 'erosion':
+        return cv2.erode(frame, kernel, iterations=1)
+    elif operation == 'dilation':
+        return cv2.dilate(frame, kernel, iterations=1)
+    elif operation == 'opening':
+        return cv2.morphologyEx(frame, cv2.MORPH_OPEN, kernel)
+    elif operation == 'closing':
+        return cv2.morphologyEx(frame, cv2.MORPH_CLOSE, kernel)
+    elif operation == 'gradient':
+        return cv2.morphologyEx(frame, cv2.MORPH_GRADIENT, kernel)
+    return frame
+
+
+def is_large_ellipse(kernel: np.ndarray) -> bool:
+    """
+    Return True if a structuring element is an ellipse of at least
+    MORPHOLOGY_ENGINE_MIN_SIZE pixels (processed by processing.morphology).
+    """
+    if kernel is None or kernel.ndim != 2 or kernel.shape[0] != kernel.shape[1]:
+        return False
+    size = kernel.shape[0]
+    return (size >= MORPHOLOGY_ENGINE_MIN_SIZE and
+            np.array_equal(kernel != 0, get_kernel('ellip', size) != 0))
+
+
+@register_operator('smooth')
+def smooth(frame: np.ndarray, params: dict):
+    """
+    Smoothing filter.
+    :param params: 'filter' - 'blur', 'gaussian', 'median' or None,
+        'kernel_size' - size of the kernel, 'sigma' - standard deviation ('gaussian'),
+        'bit_depth' - bits depth of a uint16 image.
+    :return: Filtered image, or None if no filter is selected.
+
+    For uint16 images, the median filter is only exact up to MEDIAN_16BITS_MAX_SIZE :
+    larger kernels are processed in 8 bits (see is_median_8bits).
+    """
+    k_size = params.get('kernel_size', 3)
+    filter_type = params.get('filter')
+    if filter_type == 'blur':
+        return cv2.blur(frame, (k_size, k_size))
+    elif filter_type == 'gaussian':
+        sigma = params.get('sigma', 0)
+        if frame.dtype == np.uint8 or k_size < GAUSSIAN_FLOAT_MIN_SIZE:
+            return cv2.GaussianBlur(frame, (k_size, k_size), sigmaX=sigma)
+        # Rounded to the nearest value (+/- 1 LSB from the 16 bits path of OpenCV)
+        output_image = cv2.GaussianBlur(frame.astype(np.float32), (k_size, k_size),
+                                        sigmaX=sigma)
+        return np.rint(output_image, out=output_image).astype(frame.dtype)
+    elif filter_type == 'median':
+        if not is_median_8bits(frame, params):
+            return cv2.medianBlur(frame, k_size)
+        # OpenCV : only 8 bits images for sizes > 5 - the 8 least significant bits are lost
+        delta_depth = params.get('bit_depth', 16) - 8
+        output_image = cv2.medianBlur((frame >> delta_depth).astype(np.uint8), k_size)
+        return output_image.astype(frame.dtype) << delta_depth
+    return None
+
+
+def is_median_8bits(frame: np.ndarray, params: dict) -> bool:
+    """
+    Return True if the median filter of a uint16 image is processed in 8 bits.
+    :param params: 'filter' and 'kernel_size' - parameters of the smoothing filter.
+    """
+    return (frame.dtype != np.uint8 and params.get('filter') == 'median' and
+            params.get('kernel_size', 3) > MEDIAN_16BITS_MAX_SIZE)
+
+
+@register_operator('slices')
+def slices(frame: np.ndarray, params: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Horizontal and vertical slices of an image.
+    :param params: 'row' and 'column' - position of the slices (from 1).
+    :return: Values of the row, values of the column.
+    """
+    return frame[params['row'] - 1, :], frame[:, params['column'] - 1]
+
+
+@register_operator('histogram')
+def histogram(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Histogram of an image (one bin per value).
+    :param params: 'bit_depth' - bits depth of a uint16 image.
+    :return: Number of pixels for each value (2**bit_depth values).
+    """
+    if frame.dtype == np.uint8:
+        # calcHist is about 4 times faster than bincount for 8 bits images
+        return cv2.calcHist([frame], [0], None, [256], [0, 256]).ravel().astype(np.int64)
+    nb_values = 2 ** params.get('bit_depth', 16)
+    return np.bincount(frame.ravel(), minlength=nb_values)[:nb_values]
+
+
+@register_operator('canny')
+def canny(frame: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Canny edge detector (OpenCV only processes 8 bits images).
+    :param params: 'low' and 'high' - thresholds of the hysteresis (8 bits scale),
+        'l2_gradient' - True for the euclidean norm of the gradient,
+        'bit_depth' - bits depth of a uint16 image.
+    :return: Binary image (255 for the edges).
+    """
+    if frame.dtype != np.uint8:
+        frame = to_8bits(frame, params)
+    return cv2.Canny(frame, params.get('low', 50), params.get('high', 150),
+                     L2gradient=params.get('l2_gradient', False))
+
+
+if __name__ == '__main__':
+    import time
+
+    image = np.random.randint(0, 256, (1200, 1920), dtype=np.uint8)
+    kernel = get_kernel('ellip', 7)
+    tests = {'quantization': {'bit_depth': 3},
+             'sampling': {'factor': 4},
+             'threshold': {'type': 'binary', 'value': 128},
+             'contrast_brightness': {'contrast': 1.5, 'brightness': 10},
+             'enhance_contrast': {'min': 20, 'max': 200},
+             'morphology': {'operation': 'opening', 'kernel': kernel},
+             'smooth': {'filter': 'gaussian', 'kernel_size': 5, 'sigma': 1.5},
+             'slices': {'row': 10, 'column': 20},
+             'histogram': {},
+             'canny': {'low': 50, 'high': 150}}
+    for name, params in tests.items():
+        t1 = time.perf_counter()
+        for k in range(10):
+            result = apply_operator(name, image, params)
+        t2 = time.perf_counter()
+        print(f'{name} : {(t2-t1)/10*1000:.2f} ms')
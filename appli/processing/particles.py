@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""*particles.py* file.
+
+This file contains a particle analysis of binary images (output of a threshold) :
+- connected components labeling (cv2.connectedComponentsWithStats : area, bounding
+  box and centroid of each particle),
+- perimeter, equivalent diameter and orientation of all the particles, computed
+  without loops from the label image : numpy.bincount of the second order moments
+  (orientation) over the particle pixels, and of the boundary cracks between 2
+  pixels with different labels (perimeter, corrected by pi/4 for the staircase
+  effect of the pixels : exact on average for all the orientations of a boundary,
+  but 21 % too small for boundaries along the rows or the columns),
+- tracking of the particles from frame to frame : each particle is assigned to the
+  nearest particle of the previous frame if they are mutual nearest neighbours
+  (distance matrix, no loops), and keeps its track number,
+- CSV sink : the results are appended to a CSV file, frame after frame.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+
+PARTICLE_COLUMNS = ['track_id', 'area', 'perimeter', 'centroid_x', 'centroid_y', 'diameter',
+                    'orientation']
+# Formats of the columns of the CSV file (default : measurements, 4 significant digits)
+CSV_FORMATS = {'frame': '%d', 'time': '%.6f', 'track_id': '%d', 'area': '%d',
+               'centroid_x': '%.3f', 'centroid_y': '%.3f'}
+
+
+def get_boundary_length(labels: np.ndarray, nb_labels: int) -> np.ndarray:
+    """
+    Return the number of pixel sides between each region and its neighbours.
+    :param labels: Labels of the pixels (0 for the background).
+    :param nb_labels: Number of labels (background included).
+    :return: Number of sides for each label.
+    """
+    # Pixels out of the image are background
+    padded = cv2.copyMakeBorder(labels, 1, 1, 1, 1, cv2.BORDER_CONSTANT, value=0)
+    length = np.zeros(nb_labels, dtype=np.int64)
+    for first, second in ((padded[:, 1:], padded[:, :-1]), (padded[1:, :], padded[:-1, :])):
+        cracks = first != second
+        length += np.bincount(first[cracks], minlength=nb_labels)
+        length += np.bincount(second[cracks], minlength=nb_labels)
+    return length
+
+
+def analyze_particles(binary: np.ndarray, min_area: int = 1) -> dict:
+    """
+    Measure all the particles of a binary image.
+    :param binary: Binary image (non-zero values for the particles).
+    :param min_area: Minimum area of a particle in pixels.
+    :return: Dictionary of arrays (one value per particle) : 'area', 'perimeter',
+        'centroid_x', 'centroid_y', 'diameter' (equivalent diameter), 'orientation'
+        (angle of the major axis in degrees, -90 to 90), 'x_min', 'y_min', 'width', 'height'.
+    """
+    if binary.dtype != np.uint8:
+        binary = (binary > 0).view(np.uint8)
+    # Block-based algorithm (Grana), about 3 times faster than the default one here
+    nb_labels, labels, stats, centroids = cv2.connectedComponentsWithStatsWithAlgorithm(
+        binary, 8, cv2.CV_32S, cv2.CCL_GRANA)
+    area = stats[:, cv2.CC_STAT_AREA].astype(np.float64)
+    # Second order moments over the pixels of the particles only
+    pixels = cv2.findNonZero(binary)
+    if pixels is None:
+        pixels = np.zeros((0, 2), dtype=np.int32)
+    x, y = pixels.reshape(-1, 2).T
+    index = labels[y, x]
+    dx = x - centroids[index, 0]
+    dy = y - centroids[index, 1]
+    safe_area = np.maximum(area, 1)
+    mu20 = np.bincount(index, weights=dx * dx, minlength=nb_labels) / safe_area
+    mu02 = np.bincount(index, weights=dy * dy, minlength=nb_labels) / safe_area
+    mu11 = np.bincount(index, weights=dx * dy, minlength=nb_labels) / safe_area
+    orientation = np.degrees(0.5 * np.arctan2(2 * mu11, mu20 - mu02))
+    perimeter = get_boundary_length(labels, nb_labels) * np.pi / 4
+    valid = np.flatnonzero(area[1:] >= min_area) + 1
+    return {'area': stats[valid, cv2.CC_STAT_AREA],
+            'perimeter': perimeter[valid],
+            'centroid_x': centroids[valid, 0], 'centroid_y': centroids[valid, 1],
+            'diameter': np.sqrt(4 * area[valid] / np.pi),
+            'orientation': orientation[valid],
+            'x_min': stats[valid, cv2.CC_STAT_LEFT], 'y_min': stats[valid, cv2.CC_STAT_TOP],
+            'width': stats[valid, cv2.CC_STAT_WIDTH], 'height': stats[valid, cv2.CC_STAT_HEIGHT]}
+
+
+def match_points(previous: np.ndarray, points: np.ndarray, max_distance: float) -> np.ndarray:
+    """
+    Assign points to the points of the previous frame (mutual nearest neighbours).
+    :param previous: Points of the previous frame, shape (M, 2).
+    :param points: Points of the actual frame, shape (N, 2).
+    :param max_distance: Maximum displacement between 2 frames.
+    :return: Index of the previous point of each point, -1 if no match (N values).
+    """
+    matches = np.full(len(points), -1, dtype=np.int64)
+    if len(previous) == 0 or len(points) == 0:
+        return matches
+    # Squared distances : |p|^2 + |q|^2 - 2 p.q (matrix product, no (N, M, 2) array)
+    distances = ((points ** 2).sum(axis=1)[:, np.newaxis] + (previous ** 2).sum(axis=1)
+                 - 2 * points @ previous.T)
+    nearest = np.argmin(distances, axis=1)
+    nearest_previous = np.argmin(distances, axis=0)
+    index = np.arange(len(points))
+    mutual = ((nearest_previous[nearest] == index) &
+              (distances[index, nearest] <= max_distance ** 2))
+    matches[mutual] = nearest[mutual]
+    return matches
+
+
+class ParticleTracker:
+    """
+    Particle analysis and tracking from frame to frame.
+    """
+
+    def __init__(self):
+        """Default Constructor."""
+        self.reset()
+
+    def reset(self):
+        """Forget the particles of the previous frames."""
+        self.previous = np.zeros((0, 2))
+        self.previous_ids = np.zeros(0, dtype=np.int64)
+        self.next_id = 1
+
+    def __call__(self, binary: np.ndarray, params: dict) -> dict:
+        """
+        Measure and track the particles (same interface as the operators).
+        :param binary: Binary image (non-zero values for the particles).
+        :param params: 'min_area' - minimum area in pixels,
+            'max_distance' - maximum displacement between 2 frames in pixels,
+            'track' - False to number the particles from 1 at each frame.
+        :return: Dictionary of arrays (see analyze_particles), with the 'track_id' of
+            each particle.
+        """
+        particles = analyze_particles(binary, params.get('min_area', 1))
+        points = np.column_stack((particles['centroid_x'], particles['centroid_y']))
+        if not params.get('track', True):
+            self.reset()
+        matches = match_points(self.previous, points, params.get('max_distance', 20))
+        new = matches < 0
+        track_ids = np.zeros(len(points), dtype=np.int64)
+        track_ids[~new] = self.previous_ids[matches[~new]]
+        track_ids[new] = np.arange(self.next_id, self.next_id + np.count_nonzero(new))
+        self.next_id += np.count_nonzero(new)
+        self.previous, self.previous_ids = points, track_ids
+        particles['track_id'] = track_ids
+        return particles
+
+
+class CsvSink:
+    """
+    Results of the particle analysis appended to a CSV file, frame after frame.
+    """
+
+    def __init__(self, file_path: str, columns: list = None):
+        """
+        Default Constructor - the file is created with a header line.
+        :param file_path: Path of the CSV file.
+        :param columns: Names of the columns. Default PARTICLE_COLUMNS.
+        """
+        self.columns = list(columns or PARTICLE_COLUMNS)
+        self.file_path = file_path
+        self.file = open(file_path, 'w', encoding='utf-8', buffering=1 << 20)
+        self.file.write(';'.join(['frame', 'time'] + self.columns) + '\n')
+        # Exact frame numbers, timestamps and positions (large values)
+        self.formats = [CSV_FORMATS.get(name, '%.4g') for name in ['frame', 'time'] + self.columns]
+        self.nb_rows = 0
+
+    def write(self, frame_id: int, timestamp: float, particles: dict):
+        """
+        Append the particles of a frame.
+        :param frame_id: Number of the frame.
+        :param timestamp: Time of the frame in s.
+        :param particles: Dictionary of arrays (see ParticleTracker).
+        """
+        nb_particles = len(particles[self.columns[0]])
+        if nb_particles == 0 or self.file is None:
+            return
+        table = np.column_stack([np.full(nb_particles, frame_id), np.full(nb_particles, timestamp)]
+                                + [particles[name] for name in self.columns])
+        np.savetxt(self.file, table, fmt=self.formats, delimiter=';')
+        self.nb_rows += nb_particles
+
+    def close(self):
+        """Close the file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+if __name__ == '__main__':
+    import time
+    import tempfile
+    from pathlib import Path
+
+    # 500 moving disks
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(20, 980, (500, 2))
+    tracker = ParticleTracker()
+    sink = CsvSink(str(Path(tempfile.gettempdir()) / 'particles.csv'))
+    times = []
+    for k in range(20):
+        image = np.zeros((1000, 1000), dtype=np.uint8)
+        for x, y in positions + k * np.array([1.5, 0.5]):
+            cv2.ellipse(image, (int(x), int(y)), (6, 3), 30, 0, 360, 255, -1)
+        t1 = time.perf_counter()
+        particles = tracker(image, {'min_area': 5, 'max_distance': 5})
+        sink.write(k, k * 0.02, particles)
+        times.append(time.perf_counter() - t1)
+    sink.write(1234567, 1792440000.123456, particles)
+    sink.close()
+    with open(sink.file_path, encoding='utf-8') as file:
+        last_row = file.readlines()[-1].split(';')
+    assert last_row[:2] == ['1234567', '1792440000.123456'], last_row
+    print(f'Particles (1 MP) : {np.mean(times)*1000:.2f} ms - {len(particles["area"])} particles'
+          f' - {tracker.next_id - 1} tracks')
+    print(f'Orientation : {np.median(particles["orientation"]):.1f} deg - '
+          f'{sink.nb_rows} rows in {sink.file_path}')
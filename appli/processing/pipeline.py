@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""*pipeline.py* file.
+
+This file contains a small dataflow graph to process frames
+(source -> AOI -> correction -> operator -> statistics -> displays).
+
+Each node caches its last output with a key made of the keys of its inputs and of
+its parameters. A source node is keyed by the frame id. A node is only evaluated
+when its output is requested, and only recomputed if its key changed :
+changing the threshold on a frozen frame only recomputes the threshold node,
+the AOI and its histogram are taken from the cache.
+
+Consumers (displays, widgets) can check if the output of a node changed since
+their last update with has_changed, to avoid redrawing unchanged data.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+from typing import Callable
+import numpy as np
+
+
+def get_params_key(params) -> tuple:
+    """
+    Return a hashable key of a set of parameters.
+    :param params: Dictionary of parameters. Values can be numbers, strings, tuples or arrays.
+    :return: Hashable key.
+    """
+    if isinstance(params, dict):
+        return tuple((name, get_params_key(value)) for name, value in sorted(params.items()))
+    if isinstance(params, np.ndarray):
+        return params.shape, str(params.dtype), params.tobytes()
+    if isinstance(params, (list, tuple)):
+        return tuple(get_params_key(value) for value in params)
+    return params
+
+
+class PipelineNode:
+    """
+    Node of a pipeline - function of the outputs of other nodes and of parameters.
+    """
+
+    def __init__(self, name: str, function: Callable = None, inputs: list = None,
+                 params: dict = None):
+        """
+        Default Constructor.
+        :param name: Name of the node.
+        :param function: Function called as function(*inputs, params). None for a source.
+        :param inputs: Names of the input nodes.
+        :param params: Dictionary of parameters.
+        """
+        self.name = name
+        self.function = function
+        self.inputs = list(inputs or [])
+        self.params = dict(params or {})
+        self.params_key = get_params_key(self.params)
+        self.key = None
+        self.output = None
+        self.nb_evaluations = 0
+
+
+class Pipeline:
+    """
+    Dataflow graph with a cache of the output of each node.
+    """
+
+    def __init__(self):
+        """Default Constructor."""
+        self.nodes = {}
+        self.__seen = {}   # (consumer, node name) -> key of the node seen by the consumer
+
+    def add_source(self, name: str):
+        """
+        Add a source node (frames).
+        :param name: Name of the node.
+        """
+        self.nodes[name] = PipelineNode(name)
+
+    def add_node(self, name: str, function: Callable, inputs: list, params: dict = None):
+        """
+        Add a processing node.
+        :param name: Name of the node.
+        :param function: Function called as function(*inputs, params).
+        :param inputs: Names of the input nodes (they must already exist).
+        :param params: Dictionary of parameters.
+        """
+        for input_name in inputs:
+            if input_name not in self.nodes:
+                raise KeyError(f'Unknown input node {input_name}')
+        self.nodes[name] = PipelineNode(name, function, inputs, params)
+
+    def set_frame(self, name: str, frame: np.ndarray, frame_id):
+        """
+        Set a new frame in a source node.
+        :param name: Name of the source node.
+        :param frame: New frame.
+        :param frame_id: Identifier of the frame (same id = same frame).
+        """
+        node = self.nodes[name]
+        node.output = frame
+        node.key = ('frame', frame_id)
+
+    def set_params(self, name: str, params: dict):
+        """
+        Update the parameters of a node. The node is recomputed only if they changed.
+        :param name: Name of the node.
+        :param params: Dictionary of parameters (merged with the actual ones).
+        """
+        node = self.nodes[name]
+        node.params.update(params)
+        node.params_key = get_params_key(node.params)
+
+    def get_key(self, name: str):
+        """Return the key of the output of a node (the node is evaluated if required)."""
+        self.get(name)
+        return self.nodes[name].key
+
+    def get(self, name: str):
+        """
+        Return the output of a node, computed only if its inputs or its parameters changed.
+        :param name: Name of the node.
+        :return: Output of the node.
+        """
+        node = self.nodes[name]
+        if node.function is None:
+            return node.output
+        inputs = [self.get(input_name) for input_name in node.inputs]
+        key = (tuple(self.nodes[input_name].key for input_name in node.inputs),
+               node.params_key)
+        if key != node.key:
+            node.output = node.function(*inputs, node.params)
+            node.key = key
+            node.nb_evaluations += 1
+        return node.output
+
+    def has_changed(self, name: str, consumer: str) -> bool:
+        """
+        Return True if the output of a node changed since the last call by a consumer.
+        :param name: Name of the node.
+        :param consumer: Name of the consumer (display, widget...).
+        """
+        key = self.get_key(name)
+        if self.__seen.get((consumer, name)) == key:
+            return False
+        self.__seen[(consumer, name)] = key
+        return True
+
+    def invalidate(self, consumer: str = None):
+        """
+        Force the consumers to update their display.
+        :param consumer: Name of a consumer. Default None for all the consumers.
+        """
+        if consumer is None:
+            self.__seen.clear()
+        else:
+            self.__seen = {k: v for k, v in self.__seen.items() if k[0] != consumer}
+
+
+if __name__ == '__main__':
+    import cv2
+
+    def crop(frame, params):
+        x, y, w, h = params['aoi']
+        return frame[y:y+h, x:x+w]
+
+    def threshold(frame, params):
+        return cv2.threshold(frame, params['value'], 255, cv2.THRESH_BINARY)[1]
+
+    def histogram(frame, params):
+        return np.bincount(frame.ravel(), minlength=256)
+
+    pipeline = Pipeline()
+    pipeline.add_source('frame')
+    pipeline.add_node('aoi', crop, ['frame'], {'aoi': (100, 100, 800, 600)})
+    pipeline.add_node('threshold', threshold, ['aoi'], {'value': 128})
+    pipeline.add_node('histogram', histogram, ['aoi'])
+    pipeline.set_frame('frame', np.random.randint(0, 256, (1200, 1920), dtype=np.uint8), 1)
+    for value in [100, 120, 140]:  # Frozen frame, threshold slider moved
+        pipeline.set_params('threshold', {'value': value})
+        pipeline.get('threshold')
+        pipeline.get('histogram')
+    for name, node in pipeline.nodes.items():
+        print(f'{name} : {node.nb_evaluations} evaluation(s)')
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""*quantization.py* file.
+
+This file contains the analysis of the quantization error of an image for all the
+bits depths at once, from 1 bit to the bits depth of the image.
+
+The quantization to b bits keeps the b most significant bits of each value
+(value >> (depth - b)) : each level of the image histogram gives the same error for
+all its pixels, so the errors are computed from the histogram (2**depth levels) and
+not from the pixels : O(levels x depths) instead of O(pixels x depths).
+
+For each bits depth :
+- MSE and PSNR between the image and the quantized image, reconstructed at the
+  middle of each quantization step (MSE = step**2 / 12 for uniform values),
+- occupancy : ratio of the quantization levels used by the image,
+- entropy of the quantized image in bits per pixel (number of bits really needed).
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import numpy as np
+
+
+def get_quantization_errors(histogram: np.ndarray, midpoint: bool = True) -> dict:
+    """
+    Quantization errors of an image for all the bits depths, from its histogram.
+    :param histogram: Number of pixels for each value (2**depth values).
+    :param midpoint: True to reconstruct the quantized values at the middle of the steps,
+        False to keep the lowest value of the steps (quantized image shifted back).
+    :return: Dictionary of arrays (one value per bits depth, from 1 to depth) : 'bits',
+        'mse', 'psnr' (dB, inf for no error), 'occupancy' (0 to 1), 'entropy' (bits).
+    """
+    histogram = np.asarray(histogram, dtype=np.float64)
+    depth = int(np.log2(len(histogram)))
+    nb_pixels = max(histogram.sum(), 1)
+    bits = np.arange(1, depth + 1)
+    mse = np.zeros(depth)
+    occupancy = np.zeros(depth)
+    entropy = np.zeros(depth)
+    for k, nb_bits in enumerate(bits):
+        # One row per quantization step : the error only depends on the column
+        steps = histogram.reshape(2 ** nb_bits, -1)
+        step = steps.shape[1]
+        errors = np.arange(step) - ((step - 1) / 2 if midpoint else 0)
+        mse[k] = (errors ** 2) @ steps.sum(axis=0) / nb_pixels
+        # Histogram of the quantized image
+        quantized = steps.sum(axis=1)
+        used = quantized[quantized > 0]
+        occupancy[k] = len(used) / 2 ** nb_bits
+        probability = used / nb_pixels
+        entropy[k] = -np.sum(probability * np.log2(probability))
+    with np.errstate(divide='ignore'):
+        psnr = 10 * np.log10((2 ** depth - 1) ** 2 / mse)
+    return {'bits': bits, 'mse': mse, 'psnr': psnr, 'occupancy': occupancy,
+            'entropy': entropy}
+
+
+def quantization_errors(histogram: np.ndarray, params: dict) -> dict:
+    """
+    Quantization errors, as a node of a pipeline (see processing.pipeline).
+    :param histogram: Number of pixels for each value (see operators.histogram).
+    :param params: 'midpoint' - see get_quantization_errors.
+    """
+    return get_quantization_errors(histogram, params.get('midpoint', True))
+
+
+if __name__ == '__main__':
+    import time
+
+    rng = np.random.default_rng(0)
+    for depth in [8, 12, 16]:
+        image = rng.integers(0, 2 ** depth, (1000, 1000))
+        histogram = np.bincount(image.ravel(), minlength=2 ** depth)
+        t1 = time.perf_counter()
+        for k in range(10):
+            errors = get_quantization_errors(histogram)
+        t2 = time.perf_counter()
+        # Check with the pixels for 4 bits
+        shift = depth - 4
+        quantized = ((image >> shift) << shift) + ((1 << shift) - 1) / 2
+        assert np.isclose(np.mean((image - quantized) ** 2), errors['mse'][3])
+        print(f'{depth} bits : {(t2-t1)*100:.2f} ms - PSNR 4 bits = {errors["psnr"][3]:.1f} dB - '
+              f'entropy = {errors["entropy"][-1]:.2f} bits')
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""*sampling.py* file.
+
+This file contains an integer downsampling and upscaling engine :
+- block mean : each block of factor x factor pixels is replaced by its mean value
+  (cv2.resize with INTER_AREA is an exact block mean for an integer factor, and
+  much faster than a numpy reshape followed by a mean). OpenCV rounds the mean to
+  the nearest value, ties to even, except for the factor 2 (ties up) : the edge
+  blocks are rounded the same way (see round_mean),
+- block pick : the top-left pixel of each block is kept (strided view, no copy),
+- nearest neighbour upscaling : each pixel is replicated in a block of
+  factor x factor pixels.
+
+When the size of the image is not a multiple of the factor, the last blocks of the
+rows and of the columns are smaller : they are averaged over their real pixels (the
+small image has ceil(size / factor) pixels) and the upscaled image is cropped to
+the initial size.
+
+SamplingPyramid stores the small and the upscaled images of one frame for all the
+factors already requested : moving the slider of the sampling factor only computes
+the new factors once per frame.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+
+SAMPLING_METHODS = ['mean', 'pick']
+
+
+def round_mean(mean: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Round block means as cv2.resize with INTER_AREA.
+    :param mean: Mean values of the blocks (float).
+    :param factor: Size of the blocks in pixels.
+    :return: Rounded values (float) : ties up for the factor 2, ties to even otherwise.
+    """
+    if factor == 2:
+        return np.floor(mean + 0.5)
+    return np.rint(mean)
+
+
+def downsample_mean(frame: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Downsample an image by block mean.
+    :param frame: Array containing the image.
+    :param factor: Size of the blocks in pixels.
+    :return: Small image, ceil(height / factor) x ceil(width / factor) pixels, same type.
+    """
+    if factor <= 1:
+        return frame
+    height, width = frame.shape[:2]
+    full_height, full_width = height // factor, width // factor
+    small_image = np.empty((-(-height // factor), -(-width // factor)) + frame.shape[2:],
+                           dtype=frame.dtype)
+    if full_height > 0 and full_width > 0:
+        small_image[:full_height, :full_width] = cv2.resize(
+            frame[:full_height * factor, :full_width * factor], (full_width, full_height),
+            interpolation=cv2.INTER_AREA)
+    # Last blocks of the rows and of the columns (smaller than factor x factor)
+    last_column = full_width * factor
+    last_row = full_height * factor
+    # (no full block if the factor is larger than the image)
+    if last_column < width and full_height > 0:
+        strip = frame[:last_row, last_column:].astype(np.float32)
+        small_image[:full_height, -1] = round_mean(
+            strip.reshape((full_height, factor, -1) + frame.shape[2:]).mean(axis=(1, 2)), factor)
+    if last_row < height and full_width > 0:
+        strip = frame[last_row:, :last_column].astype(np.float32)
+        small_image[-1, :full_width] = round_mean(
+            strip.reshape((height - last_row, full_width, factor) + frame.shape[2:]).mean(axis=(0, 2)),
+            factor)
+    if last_row < height and last_column < width:
+        small_image[-1, -1] = round_mean(
+            frame[last_row:, last_column:].astype(np.float32).mean(axis=(0, 1)), factor)
+    return small_image
+
+
+def downsample_pick(frame: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Downsample an image by keeping the first pixel of each block.
+    :param frame: Array containing the image.
+    :param factor: Size of the blocks in pixels.
+    :return: Small image, strided view of the image (no copy).
+    """
+    return frame[::factor, ::factor]
+
+
+def upscale_nearest(small_image: np.ndarray, factor: int, shape: tuple) -> np.ndarray:
+    """
+    Upscale an image by replicating each pixel (nearest neighbour).
+    :param small_image: Array containing the small image.
+    :param factor: Size of the blocks in pixels.
+    :param shape: Shape of the upscaled image (height, width).
+    :return: Upscaled image, cropped to the shape.
+    """
+    if factor <= 1:
+        return small_image
+    height, width = small_image.shape[:2]
+    # Integer scale : INTER_NEAREST replicates each pixel exactly factor x factor times
+    upscaled_image = cv2.resize(small_image, (width * factor, height * factor),
+                                interpolation=cv2.INTER_NEAREST)
+    if upscaled_image.shape[:2] == tuple(shape[:2]):
+        return upscaled_image
+    return np.ascontiguousarray(upscaled_image[:shape[0], :shape[1]])
+
+
+def downsample(frame: np.ndarray, factor: int, method: str = 'mean') -> np.ndarray:
+    """
+    Downsample an image.
+    :param frame: Array containing the image.
+    :param factor: Size of the blocks in pixels.
+    :param method: 'mean' (block mean) or 'pick' (first pixel of each block).
+    :return: Small image.
+    """
+    if method == 'pick':
+        return downsample_pick(frame, factor)
+    return downsample_mean(frame, factor)
+
+
+class SamplingPyramid:
+    """
+    Small and upscaled images of a frame, computed once for each factor.
+    """
+
+    def __init__(self, frame: np.ndarray, method: str = 'mean'):
+        """
+        Default Constructor.
+        :param frame: Array containing the image.
+        :param method: Downsampling method, see downsample.
+        """
+        self.frame = frame
+        self.method = method
+        self.levels = {1: (frame, frame)}
+
+    def get(self, factor: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the images of a factor (computed only at the first call).
+        :param factor: Size of the blocks in pixels.
+        :return: Small image, image upscaled to the initial size.
+        """
+        factor = max(1, int(factor))
+        if factor not in self.levels:
+            small_image = downsample(self.frame, factor, self.method)
+            self.levels[factor] = (small_image,
+                                   upscale_nearest(small_image, factor, self.frame.shape))
+        return self.levels[factor]
+
+
+def sampling_pyramid(frame: np.ndarray, params: dict) -> SamplingPyramid:
+    """
+    Sampling pyramid of a frame, as a node of a pipeline (see processing.pipeline).
+    :param frame: Array containing the image.
+    :param params: 'method' - downsampling method, see downsample.
+    """
+    return SamplingPyramid(frame, params.get('method', 'mean'))
+
+
+if __name__ == '__main__':
+    import time
+
+    image = np.random.default_rng(0).integers(0, 4096, (1001, 1003), dtype=np.uint16)
+    # Edge blocks are averaged over their real pixels
+    small = downsample_mean(image, 4)
+    assert small.shape == (251, 251)
+    assert small[-1, -1] == np.rint(image[1000:, 1000:].mean())
+    assert small[10, -1] == np.rint(image[40:44, 1000:].mean())
+    assert upscale_nearest(small, 4, image.shape).shape == image.shape
+    # Interior and edge blocks rounded the same way (factor 2 : ties up)
+    for frame in (image, (image >> 4).astype(np.uint8)):
+        for factor in (2, 3, 4):
+            small = downsample_mean(frame, factor)
+            size = (1001 // factor) * factor, (1003 // factor) * factor
+            blocks = frame[:size[0], :size[1]].reshape(size[0] // factor, factor,
+                                                        size[1] // factor, factor)
+            expected = round_mean(blocks.mean(axis=(1, 3)), factor)
+            assert np.array_equal(small[:size[0] // factor, :size[1] // factor], expected)
+            strip = frame[:size[0], size[1]:].reshape(size[0] // factor, -1)
+            assert np.array_equal(small[:-1, -1], round_mean(strip.mean(axis=1), factor))
+            assert small[-1, -1] == round_mean(frame[size[0]:, size[1]:].mean(), factor)
+    # Factors larger than the image (small AOI) : partial blocks only
+    for factor in (20, 38, 53, 69):
+        small = downsample_mean(image[:37, :53], factor)
+        assert small.shape == (-(-37 // factor), -(-53 // factor))
+        assert small[-1, -1] == np.rint(image[(36 // factor) * factor:37,
+                                              (52 // factor) * factor:53].mean())
+    for method in SAMPLING_METHODS:
+        t1 = time.perf_counter()
+        for k in range(10):
+            pyramid = SamplingPyramid(image, method)
+            for factor in range(1, 33):
+                pyramid.get(factor)
+        t2 = time.perf_counter()
+        for k in range(10):
+            for factor in range(1, 33):
+                pyramid.get(factor)
+        t3 = time.perf_counter()
+        print(f'{method} - 32 factors (1 MP) : {(t2-t1)*100:.2f} ms - '
+              f'cached : {(t3-t2)*100:.4f} ms')
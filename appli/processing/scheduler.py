@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""*scheduler.py* file.
+
+This file contains tools to schedule acquisitions when a camera parameter
+(exposure time, black level...) changes.
+
+After a new value is applied, the next frames can still be acquired with the old
+setting (frames already in the camera or the driver buffers). Those frames are
+discarded :
+- until the frame metadata gives the new value (if the metadata key is available),
+  at most during max_settle_frames frames (timeout : a camera that clamps or rounds
+  the value never gives the exact target),
+- or during a configured number of frames (settle count), without metadata.
+
+Then exactly K frames are collected for each step of a sequence (sweep or bracketing).
+
+The scheduler is fed frame by frame (from the camera thread or any frame source).
+It can also be used as an iterator (offline) or an asynchronous iterator (scripts).
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+from typing import Callable, Iterable, AsyncIterable
+import numpy as np
+
+# Maximum number of frames discarded while the metadata does not give the new value
+MAX_SETTLE_FRAMES = 10
+
+
+def exposure_sweep(start: float, stop: float, nb_steps: int, log_scale: bool = True) -> list:
+    """
+    Return the exposure values of a sweep.
+    :param start: First exposure time in microseconds.
+    :param stop: Last exposure time in microseconds.
+    :param nb_steps: Number of steps.
+    :param log_scale: True for a logarithmic progression. Default True.
+    :return: List of exposure times.
+    """
+    if log_scale:
+        return [float(v) for v in np.geomspace(start, stop, nb_steps)]
+    return [float(v) for v in np.linspace(start, stop, nb_steps)]
+
+
+def exposure_bracketing(center: float, nb_stops: int = 2, stop_step: float = 1.0) -> list:
+    """
+    Return the exposure values of a bracketing around a central value.
+    :param center: Central exposure time in microseconds.
+    :param nb_stops: Number of steps on each side of the central value.
+    :param stop_step: Step between two exposures in stops (1 stop = factor 2).
+    :return: List of exposure times, from the shortest to the longest.
+    """
+    stops = np.arange(-nb_stops, nb_stops + 1) * stop_step
+    return [float(v) for v in center * 2.0 ** stops]
+
+
+class SettleTracker:
+    """
+    Tracker of the frames acquired after a parameter changed.
+    """
+
+    def __init__(self, settle_frames: int = 2, metadata_key: str = None, tolerance: float = 0.01,
+                 max_settle_frames: int = MAX_SETTLE_FRAMES):
+        """
+        Default Constructor.
+        :param settle_frames: Number of frames to discard after a change,
+            if the value is not available in the frame metadata.
+        :param metadata_key: Key of the parameter in the frame metadata. Default None.
+        :param tolerance: Relative tolerance to compare the metadata value to the target.
+        :param max_settle_frames: Maximum number of frames to discard while the metadata
+            value does not match the target (timeout).
+        """
+        self.settle_frames = max(0, int(settle_frames))
+        self.metadata_key = metadata_key
+        self.tolerance = tolerance
+        self.max_settle_frames = max(0, int(max_settle_frames))
+        self.target = None
+        self.__settling = False
+        self.discarded = 0
+
+    def arm(self, value: float = None):
+        """
+        Declare that a new value was applied to the camera.
+        :param value: New value of the parameter.
+        """
+        self.target = value
+        self.__settling = True
+        self.discarded = 0
+
+    def is_settling(self) -> bool:
+        """Return True if the new value is not yet in effect."""
+        return self.__settling
+
+    def add_frame(self, metadata: dict = None) -> bool:
+        """
+        Check a new frame.
+        :param metadata: Metadata of the frame (optional).
+        :return: True if the frame was acquired with the new value.
+        """
+        if not self.__settling:
+            return True
+        if (metadata is not None and self.metadata_key in metadata
+                and self.target is not None):
+            value = metadata[self.metadata_key]
+            settled = (abs(value - self.target) <= self.tolerance * abs(self.target) or
+                       self.discarded >= self.max_settle_frames)
+        else:
+            settled = self.discarded >= self.settle_frames
+        if settled:
+            self.__settling = False
+            return True
+        self.discarded += 1
+        return False
+
+
+class AcquisitionStep:
+    """
+    Frames collected for one value of a sequence.
+    """
+
+    def __init__(self, index: int, value: float):
+        """
+        Default Constructor.
+        :param index: Index of the step in the sequence.
+        :param value: Value of the parameter for this step.
+        """
+        self.index = index
+        self.value = value
+        self.frames = []
+        self.metadata = []
+        self.discarded = 0
+
+    def get_mean_frame(self) -> np.ndarray:
+        """Return the mean of the collected frames (float64)."""
+        return np.mean(np.stack(self.frames), axis=0)
+
+
+class AcquisitionScheduler:
+    """
+    Apply each value of a sequence, wait for the new value, then collect K frames.
+    """
+
+    def __init__(self, set_parameter: Callable[[float], None], values: list,
+                 nb_frames: int = 1, settle_frames: int = 2,
+                 metadata_key: str = None, tolerance: float = 0.01,
+                 max_settle_frames: int = MAX_SETTLE_FRAMES):
+        """
+        Default Constructor.
+        :param set_parameter: Function applying a value to the camera (camera.set_exposure...).
+        :param values: List of values of the sequence.
+        :param nb_frames: Number of frames to collect per step (K).
+        :param settle_frames: Number of frames to discard after each change,
+            if the value is not available in the frame metadata.
+        :param metadata_key: Key of the parameter in the frame metadata. Default None.
+        :param tolerance: Relative tolerance to compare the metadata value to the target.
+        :param max_settle_frames: Maximum number of frames to discard while the metadata
+            value does not match the target (timeout).
+        """
+        self.set_parameter = set_parameter
+        self.values = list(values)
+        self.nb_frames = max(1, int(nb_frames))
+        self.tracker = SettleTracker(settle_frames, metadata_key, tolerance, max_settle_frames)
+        self.steps = []
+        self.__step = None
+        self.__running = False
+
+    def is_running(self) -> bool:
+        """Return True if the sequence is not finished."""
+        return self.__running
+
+    def get_progress(self) -> tuple[int, int]:
+        """Return the index of the actual step and the number of steps."""
+        return len(self.steps), len(self.values)
+
+    def start(self):
+        """Start the sequence - apply the first value."""
+        self.steps = []
+        self.__running = len(self.values) > 0
+        if self.__running:
+            self.__apply(0)
+
+    def stop(self):
+        """Stop the sequence."""
+        self.__running = False
+        self.__step = None
+
+    def __apply(self, index: int):
+        """Apply a value and wait for the new setting."""
+        value = self.values[index]
+        self.set_parameter(value)
+        self.tracker.arm(value)
+        self.__step = AcquisitionStep(index, value)
+
+    def add_frame(self, frame: np.ndarray, metadata: dict = None):
+        """
+        Process a new frame.
+        :param frame: New frame.
+        :param metadata: Metadata of the frame (optional).
+        :return: The step if it is completed by this frame, else None.
+        """
+        if not self.__running:
+            return None
+        if not self.tracker.add_frame(metadata):
+            return None
+        step = self.__step
+        step.frames.append(frame.copy())
+        step.metadata.append(metadata)
+        if len(step.frames) < self.nb_frames:
+            return None
+        step.discarded = self.tracker.discarded
+        self.steps.append(step)
+        if step.index + 1 < len(self.values):
+            self.__apply(step.index + 1)
+        else:
+            self.stop()
+        return step
+
+    def iterate(self, frames: Iterable):
+        """
+        Run the whole sequence on a frame source.
+        :param frames: Iterable of frames or (frame, metadata) tuples.
+        :return: Generator of the completed steps.
+        """
+        self.start()
+        for element in frames:
+            frame, metadata = element if isinstance(element, tuple) else (element, None)
+            step = self.add_frame(frame, metadata)
+            if step is not None:
+                yield step
+            if not self.__running:
+                break
+
+    async def run(self, frames: AsyncIterable):
+        """
+        Run the whole sequence on an asynchronous frame source.
+        :param frames: Asynchronous iterable of frames or (frame, metadata) tuples.
+        :return: Asynchronous generator of the completed steps.
+
+        Example::
+
+            scheduler = AcquisitionScheduler(camera.set_exposure,
+                                             exposure_bracketing(10000, 2), nb_frames=5)
+            async for step in scheduler.run(frame_source):
+                print(step.value, step.get_mean_frame().mean())
+        """
+        self.start()
+        async for element in frames:
+            frame, metadata = element if isinstance(element, tuple) else (element, None)
+            step = self.add_frame(frame, metadata)
+            if step is not None:
+                yield step
+            if not self.__running:
+                break
+
+
+if __name__ == '__main__':
+    # Simulated camera : the new exposure is in effect 'delay' frames after the change.
+    class SimuCamera:
+        def __init__(self, delay: int = 2):
+            self.exposure = 1000
+            self.max_exposure = 1e6
+            self.delay = delay
+            self.pending = []
+
+        def set_exposure(self, value):
+            self.pending = [self.exposure] * self.delay
+            self.exposure = min(value, self.max_exposure)
+
+        def frames(self):
+            while True:
+                expo = self.pending.pop(0) if self.pending else self.exposure
+                yield np.full((4, 4), expo / 100), {'exposure': expo}
+
+    camera = SimuCamera()
+    scheduler = AcquisitionScheduler(camera.set_exposure, exposure_sweep(1000, 8000, 4),
+                                     nb_frames=3, metadata_key='exposure')
+    for step in scheduler.iterate(camera.frames()):
+        print(f'{step.value:.0f} us : mean = {step.get_mean_frame().mean():.1f} '
+              f'/ discarded = {step.discarded}')
+    # Camera slower than the settle count : only frames with the new exposure are kept
+    camera = SimuCamera(delay=5)
+    scheduler = AcquisitionScheduler(camera.set_exposure, exposure_sweep(1000, 8000, 4),
+                                     nb_frames=3, settle_frames=2, metadata_key='exposure')
+    for step in scheduler.iterate(camera.frames()):
+        assert all(data['exposure'] == step.value for data in step.metadata)
+        assert step.discarded == (5 if step.index > 0 else 0)
+    # Camera clamping the exposure : the metadata never gives the target (timeout)
+    camera.max_exposure = 5000
+    scheduler = AcquisitionScheduler(camera.set_exposure, exposure_sweep(1000, 8000, 4),
+                                     nb_frames=3, metadata_key='exposure', max_settle_frames=8)
+    steps = list(scheduler.iterate(camera.frames()))
+    assert len(steps) == 4 and all(len(step.frames) == 3 for step in steps)
+    assert steps[-1].discarded == 8
+    print(f'Clamped camera : {len(steps)} steps - discarded = {[s.discarded for s in steps]}')
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""*segmentation.py* file.
+
+This file contains a marker-based watershed segmentation :
+
+    threshold -> distance transform -> markers -> watershed -> labels
+
+- the image is thresholded (given value or Otsu method),
+- the distance of each object pixel to the background is computed : the pixels far
+  from the background (ratio of the maximum distance) are the markers of the
+  regions, one marker per connected component,
+- the watershed floods the image from the markers : touching objects are split
+  along the lines where the floods meet.
+
+The statistics of the regions (area, centroid, bounding box, mean intensity) are
+computed in one vectorized pass over the label image, with numpy.bincount : no
+loop over the regions. The number of pixels of each region in each row and in each
+column gives the area, the centroid and the bounding box.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import cv2
+import numpy as np
+
+# Coordinates of the pixels of the last image sizes
+_coordinates_cache = {}
+
+
+def get_coordinates(shape: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the coordinates of all the pixels of an image (cached by size).
+    :param shape: Shape of the image (height, width).
+    :return: Flattened arrays of x and y coordinates.
+    """
+    if shape not in _coordinates_cache:
+        if len(_coordinates_cache) > 4:
+            _coordinates_cache.clear()
+        y, x = np.indices(shape, dtype=np.int32)
+        _coordinates_cache[shape] = (x.ravel(), y.ravel())
+    return _coordinates_cache[shape]
+
+
+def get_binary(image: np.ndarray, threshold: int = None, invert: bool = False) -> np.ndarray:
+    """
+    Threshold an 8 bits image.
+    :param image: Array containing the image (8 bits).
+    :param threshold: Threshold value. Default None (Otsu method).
+    :param invert: True if the objects are darker than the background.
+    :return: Binary image (255 for the objects).
+    """
+    threshold_type = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
+    if threshold is None:
+        _, binary = cv2.threshold(image, 0, 255, threshold_type + cv2.THRESH_OTSU)
+    else:
+        _, binary = cv2.threshold(image, threshold, 255, threshold_type)
+    return binary
+
+
+def get_markers(binary: np.ndarray, distance_ratio: float = 0.5) -> tuple[np.ndarray, int]:
+    """
+    Return the markers of the watershed.
+    :param binary: Binary image (255 for the objects).
+    :param distance_ratio: Minimum distance to the background of the markers, ratio of the
+        maximum distance (0 to 1).
+    :return: Markers (int32) - 0 for the unknown pixels, 1 for the background,
+        2 to N+1 for the regions - and number of regions N.
+    """
+    distance = cv2.distanceTransform(binary, cv2.DIST_L2, 5)
+    foreground = (distance > distance_ratio * distance.max()).astype(np.uint8)
+    nb_labels, markers = cv2.connectedComponents(foreground)
+    markers += 1
+    # Pixels of the objects that are not markers are flooded by the watershed
+    markers[(binary > 0) & (foreground == 0)] = 0
+    return markers, nb_labels - 1
+
+
+def segment_watershed(image: np.ndarray, params: dict) -> tuple[np.ndarray, int]:
+    """
+    Marker-based watershed segmentation (same interface as the operators).
+    :param image: Array containing the image (8 bits).
+    :param params: 'threshold' - threshold value or None (Otsu method),
+        'invert' - True for dark objects, 'distance_ratio' - see get_markers.
+    :return: Labels (int32) - 0 for the background, -1 for the boundaries,
+        1 to N for the regions - and number of regions N.
+    """
+    binary = get_binary(image, params.get('threshold'), params.get('invert', False))
+    markers, nb_regions = get_markers(binary, params.get('distance_ratio', 0.5))
+    cv2.watershed(cv2.cvtColor(image, cv2.COLOR_GRAY2BGR), markers)
+    # Background (1) to 0 and regions from 1, boundaries stay at -1
+    boundaries = markers == -1
+    markers -= 1
+    markers[boundaries] = -1
+    return markers, nb_regions
+
+
+def get_region_statistics(labels: np.ndarray, image: np.ndarray, nb_regions: int) -> dict:
+    """
+    Statistics of all the regions, in one vectorized pass over the label image.
+    :param labels: Labels of the pixels (0 for the background, 1 to N for the regions,
+        negative values are ignored).
+    :param image: Array containing the image (intensity of the pixels).
+    :param nb_regions: Number of regions N.
+    :return: Dictionary of arrays (one value per region, from the label 1) : 'label', 'area',
+        'centroid_x', 'centroid_y', 'x_min', 'y_min', 'width', 'height', 'mean'.
+        Regions without pixels (removed by the watershed) are not included.
+    """
+    height, width = labels.shape
+    nb_labels = nb_regions + 1
+    index = np.maximum(labels, 0).ravel()
+    x, y = get_coordinates(labels.shape)
+    sum_intensity = np.bincount(index, weights=image.ravel(), minlength=nb_labels)
+    if nb_labels * (height + width) <= labels.size:
+        # Number of pixels of each region in each row and in each column : the area, the
+        # centroid and the bounding box are obtained from these 2 projections
+        rows = np.bincount(index * height + y,
+                           minlength=nb_labels * height).reshape(nb_labels, height)
+        columns = np.bincount(index * width + x,
+                              minlength=nb_labels * width).reshape(nb_labels, width)
+        area = rows.sum(axis=1)
+        sum_y = rows @ np.arange(height)
+        sum_x = columns @ np.arange(width)
+        rows, columns = rows > 0, columns > 0
+        y_min = np.argmax(rows, axis=1)
+        y_max = height - 1 - np.argmax(rows[:, ::-1], axis=1)
+        x_min = np.argmax(columns, axis=1)
+        x_max = width - 1 - np.argmax(columns[:, ::-1], axis=1)
+    else:
+        # Many small regions : the projections would be larger than the image
+        area = np.bincount(index, minlength=nb_labels)
+        sum_x = np.bincount(index, weights=x, minlength=nb_labels)
+        sum_y = np.bincount(index, weights=y, minlength=nb_labels)
+        # Same type as the coordinates : fast path of ufunc.at
+        x_min = np.full(nb_labels, width, dtype=x.dtype)
+        y_min = np.full(nb_labels, height, dtype=y.dtype)
+        x_max, y_max = np.zeros(nb_labels, dtype=x.dtype), np.zeros(nb_labels, dtype=y.dtype)
+        np.minimum.at(x_min, index, x)
+        np.maximum.at(x_max, index, x)
+        np.minimum.at(y_min, index, y)
+        np.maximum.at(y_max, index, y)
+    valid = np.flatnonzero(area[1:] > 0) + 1
+    safe_area = area[valid].astype(np.float64)
+    return {'label': valid,
+            'area': area[valid],
+            'centroid_x': sum_x[valid] / safe_area,
+            'centroid_y': sum_y[valid] / safe_area,
+            'x_min': x_min[valid], 'y_min': y_min[valid],
+            'width': x_max[valid] - x_min[valid] + 1,
+            'height': y_max[valid] - y_min[valid] + 1,
+            'mean': sum_intensity[valid] / safe_area}
+
+
+def region_statistics(segmentation: tuple, image: np.ndarray, params: dict) -> dict:
+    """
+    Statistics of the regions, as a node of a pipeline (see processing.pipeline).
+    :param segmentation: Output of segment_watershed (labels, number of regions).
+    :param image: Array containing the image.
+    :param params: Not used.
+    """
+    labels, nb_regions = segmentation
+    return get_region_statistics(labels, image, nb_regions)
+
+
+def draw_regions(image: np.ndarray, labels: np.ndarray, alpha: float = 0.4) -> np.ndarray:
+    """
+    Draw the regions over an image (one color per region, boundaries in red).
+    :param image: Array containing the image (8 bits).
+    :param labels: Labels of the pixels (see segment_watershed).
+    :param alpha: Opacity of the colors of the regions.
+    :return: RGB image.
+    """
+    output_image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+    # Colors from a colormap (8 bits code of the label), neighbours get distant colors
+    codes = (labels * 97).astype(np.uint8)
+    colors = cv2.cvtColor(cv2.applyColorMap(codes, cv2.COLORMAP_HSV), cv2.COLOR_BGR2RGB)
+    blended = cv2.addWeighted(output_image, 1 - alpha, colors, alpha, 0)
+    cv2.copyTo(blended, (labels > 0).view(np.uint8), output_image)
+    output_image[labels < 0] = (255, 0, 0)
+    return output_image
+
+
+if __name__ == '__main__':
+    import time
+
+    # Overlapping disks
+    rng = np.random.default_rng(1)
+    image = np.zeros((1000, 1000), dtype=np.uint8)
+    for cx, cy in rng.integers(30, 970, (150, 2)):
+        cv2.circle(image, (int(cx), int(cy)), int(rng.integers(10, 30)), 200, -1)
+    image = cv2.add(image, rng.integers(0, 40, image.shape, dtype=np.uint8))
+    params = {'threshold': None, 'distance_ratio': 0.5}
+    t1 = time.perf_counter()
+    for k in range(10):
+        labels, nb_regions = segment_watershed(image, params)
+    t2 = time.perf_counter()
+    for k in range(10):
+        statistics = get_region_statistics(labels, image, nb_regions)
+    t3 = time.perf_counter()
+    for k in range(10):
+        overlay = draw_regions(image, labels)
+    t4 = time.perf_counter()
+    print(f'Watershed (1 MP) : {(t2-t1)*100:.2f} ms - {nb_regions} regions')
+    print(f'Statistics : {(t3-t2)*100:.2f} ms - mean area {np.mean(statistics["area"]):.0f} px')
+    print(f'Overlay : {(t4-t3)*100:.2f} ms')
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""*tiling.py* file.
+
+This file contains a tiled executor for neighbourhood operators (morphology,
+smoothing filters) on large images.
+
+The image is split in horizontal bands (contiguous in memory). Each band is extended
+by a halo of rows taken from its neighbours, at least as large as the reach of the
+operator, so the rows kept from each band are exactly the rows computed on the
+whole image (no seams). At the top and bottom of the image, the band has no halo
+and OpenCV applies its usual border, as for the whole image.
+
+Bands are processed by a pool of threads (OpenCV releases the GIL). The number of
+threads of OpenCV is not changed here : cv2.setNumThreads is global to the process
+and would also slow down (or race with) the OpenCV calls of the other threads (camera,
+GUI). OpenCV runs only one parallel region at a time, concurrent calls are executed
+sequentially, so the bands do not multiply the number of active threads. Set it once
+at startup if required (see processing.batch). Small images are processed in one call.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import numpy as np
+from processing.operators import OPERATORS
+
+# Images smaller than this number of pixels are processed in one call
+MIN_TILED_PIXELS = 1000000
+# Minimum height of a band, in rows
+MIN_TILE_ROWS = 64
+
+
+def get_operator_halo(name: str, params: dict) -> int:
+    """
+    Return the reach of an operator in rows (size of the halo).
+    :param name: Name of the operator ('morphology' or 'smooth').
+    :param params: Dictionary of parameters of the operator.
+    :return: Number of rows, or None if the operator can not be tiled.
+    """
+    if name == 'morphology':
+        kernel = params.get('kernel')
+        if kernel is None or params.get('operation') is None:
+            return 0
+        reach = np.shape(kernel)[0] // 2
+        if params['operation'] in ('opening', 'closing'):
+            return 2 * reach    # 2 successive passes
+        return reach
+    if name == 'smooth':
+        return params.get('kernel_size', 3) // 2
+    return None
+
+
+class TiledExecutor:
+    """
+    Execution of an operator on halo-padded bands, in a pool of threads.
+    """
+
+    def __init__(self, nb_threads: int = None, min_pixels: int = MIN_TILED_PIXELS):
+        """
+        Default Constructor.
+        :param nb_threads: Number of threads. Default None (number of cores).
+        :param min_pixels: Minimum size of an image to split it.
+        """
+        self.nb_threads = nb_threads or os.cpu_count() or 1
+        self.min_pixels = min_pixels
+        self.__pool = None
+        self.__lock = threading.Lock()
+
+    def get_tile_rows(self, height: int, halo: int) -> int:
+        """
+        Return the height of the bands : 2 bands per thread (load balancing),
+        large enough compared to the halo.
+        :param height: Height of the image.
+        :param halo: Size of the halo in rows.
+        """
+        rows = -(-height // (2 * self.nb_threads))
+        return max(rows, 4 * halo, MIN_TILE_ROWS)
+
+    def run(self, function: Callable, frame: np.ndarray, params: dict, halo: int) -> np.ndarray:
+        """
+        Apply a function to an image, band by band.
+        :param function: Function called as function(band, params), with the same output size.
+        :param frame: Array containing the image.
+        :param params: Dictionary of parameters of the function.
+        :param halo: Reach of the function in rows. None to process the image in one call.
+        :return: Processed image.
+        """
+        height = frame.shape[0]
+        if (halo is None or self.nb_threads == 1 or frame.shape[0] * frame.shape[1] < self.min_pixels):
+            return function(frame, params)
+        tile_rows = self.get_tile_rows(height, halo)
+        if tile_rows >= height:
+            return function(frame, params)
+        starts = range(0, height, tile_rows)
+        output = np.empty_like(frame)
+
+        def process_band(start: int):
+            stop = min(start + tile_rows, height)
+            top, bottom = max(start - halo, 0), min(stop + halo, height)
+            result = function(frame[top:bottom], params)
+            output[start:stop] = result[start - top:stop - top]
+
+        with self.__lock:
+            if self.__pool is None:
+                self.__pool = ThreadPoolExecutor(self.nb_threads)
+            pool = self.__pool
+        list(pool.map(process_band, starts))
+        return output
+
+    def apply_operator(self, name: str, frame: np.ndarray, params: dict = None):
+        """
+        Apply an operator (see processing.operators), in bands if possible.
+        :param name: Name of the operator.
+        :param frame: Array containing the image.
+        :param params: Dictionary of parameters of the operator.
+        :return: Result of the operator.
+        """
+        params = params or {}
+        halo = get_operator_halo(name, params)
+        if name == 'smooth' and params.get('filter') is None:
+            return None
+        return self.run(OPERATORS[name], frame, params, halo)
+
+    def get_operator(self, name: str) -> Callable:
+        """
+        Return a tiled version of an operator, called as operator(frame, params).
+        :param name: Name of the operator.
+        """
+        def tiled_operator(frame: np.ndarray, params: dict):
+            return self.apply_operator(name, frame, params)
+        return tiled_operator
+
+    def shutdown(self):
+        """Stop the threads of the pool."""
+        if self.__pool is not None:
+            self.__pool.shutdown()
+            self.__pool = None
+
+
+if __name__ == '__main__':
+    import time
+    from processing.operators import get_kernel
+
+    image = np.random.randint(0, 256, (3000, 4000), dtype=np.uint8)
+    executor = TiledExecutor()
+    tests = {'morphology': {'operation': 'opening', 'kernel': get_kernel('ellip', 15)},
+             'smooth': {'filter': 'median', 'kernel_size': 5}}
+    for name, params in tests.items():
+        t1 = time.perf_counter()
+        reference = OPERATORS[name](image, params)
+        t2 = time.perf_counter()
+        result = executor.apply_operator(name, image, params)
+        t3 = time.perf_counter()
+        print(f'{name} : {(t2-t1)*1000:.1f} ms / tiled ({executor.nb_threads} threads) '
+              f'{(t3-t2)*1000:.1f} ms / identical : {np.array_equal(reference, result)}')
+    executor.shutdown()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""*timeseries.py* file.
+
+This file contains a ring buffer to store time series (pixel values, measurements...)
+acquired during a live stream.
+
+- Each new sample is appended in O(1), in a preallocated array.
+- The last 'capacity' samples are kept at full resolution.
+- A min/max decimated view of the whole history is updated at each sample
+  (amortized O(1)). Its size never exceeds 'max_points', so a chart can be redrawn
+  in a constant time, even for 10^5 samples or more.
+
+This file is GUI-free and can be used without PyQt6.
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import numpy as np
+
+
+class TimeSeriesBuffer:
+    """
+    Ring buffer of samples, with a min/max decimated view of the whole history.
+    """
+
+    def __init__(self, capacity: int, shape: tuple = (), dtype=np.float64, max_points: int = 2000):
+        """
+        Default Constructor.
+        :param capacity: Number of samples to keep at full resolution.
+        :param shape: Shape of one sample. Default () for a scalar value.
+            (4,) for 4 pixels, (4, 3) for 4 RGB pixels...
+        :param dtype: Type of the data.
+        :param max_points: Maximum number of points of the decimated view.
+        """
+        self.capacity = max(1, int(capacity))
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.__data = np.zeros((self.capacity,) + self.shape, dtype=self.dtype)
+        self.__index = 0    # Next position to write in the ring buffer
+        self.__counter = 0  # Total number of samples since the last clear
+        # Min/max decimation (number of buckets must be even to merge them by pairs)
+        self.max_buckets = max(2, (int(max_points) // 4) * 2)
+        self.__mins = np.zeros((self.max_buckets,) + self.shape, dtype=self.dtype)
+        self.__maxs = np.zeros((self.max_buckets,) + self.shape, dtype=self.dtype)
+        self.__bucket_size = 1
+        self.__nb_buckets = 0
+        self.__bucket_fill = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples stored at full resolution."""
+        return min(self.__counter, self.capacity)
+
+    def clear(self):
+        """Remove all the samples."""
+        self.__index = 0
+        self.__counter = 0
+        self.__bucket_size = 1
+        self.__nb_buckets = 0
+        self.__bucket_fill = 0
+
+    def get_counter(self) -> int:
+        """Return the total number of samples appended since the last clear."""
+        return self.__counter
+
+    def append(self, value):
+        """
+        Append a new sample - O(1).
+        :param value: New sample. Its shape must be the shape of the buffer.
+        """
+        value = np.asarray(value, dtype=self.dtype)
+        self.__data[self.__index] = value
+        self.__index = (self.__index + 1) % self.capacity
+        self.__counter += 1
+        self.__update_decimation(value)
+
+    def __update_decimation(self, value: np.ndarray):
+        """Update the min/max value of the current bucket."""
+        if self.__bucket_fill == 0:
+            if self.__nb_buckets == self.max_buckets:
+                self.__merge_buckets()
+            k = self.__nb_buckets
+            self.__mins[k] = value
+            self.__maxs[k] = value
+            self.__nb_buckets += 1
+        else:
+            k = self.__nb_buckets - 1
+            np.minimum(self.__mins[k:k+1], value, out=self.__mins[k:k+1])
+            np.maximum(self.__maxs[k:k+1], value, out=self.__maxs[k:k+1])
+        self.__bucket_fill += 1
+        if self.__bucket_fill == self.__bucket_size:
+            self.__bucket_fill = 0
+
+    def __merge_buckets(self):
+        """Merge buckets by pairs - the size of the buckets is doubled."""
+        half = self.__nb_buckets // 2
+        new_shape = (half, 2) + self.shape
+        self.__mins[:half] = self.__mins[:2*half].reshape(new_shape).min(axis=1)
+        self.__maxs[:half] = self.__maxs[:2*half].reshape(new_shape).max(axis=1)
+        self.__nb_buckets = half
+        self.__bucket_size *= 2
+
+    def get_data(self) -> np.ndarray:
+        """
+        Return the samples stored at full resolution, in chronological order.
+        :return: Array of shape (N,) + shape. A view if the ring buffer did not wrap.
+        """
+        if self.__counter <= self.capacity:
+            return self.__data[:self.__counter]
+        return np.concatenate((self.__data[self.__index:], self.__data[:self.__index]))
+
+    def get_last(self, number: int) -> np.ndarray:
+        """
+        Return the last samples, in chronological order.
+        :param number: Number of samples to return.
+        :return: Array of shape (number,) + shape.
+        """
+        number = min(int(number), len(self))
+        indexes = (self.__index - number + np.arange(number)) % self.capacity
+        return self.__data[indexes]
+
+    def get_time_axis(self) -> np.ndarray:
+        """Return the sample numbers (from 1) of the samples stored at full resolution."""
+        return np.arange(self.__counter - len(self) + 1, self.__counter + 1)
+
+    def get_decimated(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the min/max decimated view of the whole history.
+        :return: Tuple of arrays: sample numbers (start of each bucket), min values, max values.
+        """
+        nb = self.__nb_buckets
+        x_axis = np.arange(nb) * self.__bucket_size + 1
+        return x_axis, self.__mins[:nb], self.__maxs[:nb]
+
+    def get_min_max_view(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return a single curve drawing the min/max envelope of the whole history.
+        Each bucket gives 2 points (min then max). If no decimation is required,
+        the raw samples are returned.
+        :return: Tuple of arrays: X-axis values, Y-axis values.
+        """
+        x_axis, mins, maxs = self.get_decimated()
+        if self.__bucket_size == 1:
+            return x_axis, mins
+        x_view = np.repeat(x_axis, 2)
+        y_view = np.stack((mins, maxs), axis=1).reshape((-1,) + self.shape)
+        return x_view, y_view
+
+
+if __name__ == '__main__':
+    import time
+
+    series = TimeSeriesBuffer(100000, shape=(4,), max_points=2000)
+    t1 = time.perf_counter()
+    for k in range(100000):
+        series.append(np.random.randint(0, 4096, 4))
+    t2 = time.perf_counter()
+    x, y = series.get_min_max_view()
+    print(f'Append : {(t2-t1)/100000*1e6:.2f} us / sample')
+    print(f'Decimated view : {x.shape} / {y.shape}')
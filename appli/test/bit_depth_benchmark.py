@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""*bit_depth_benchmark.py* file.
+
+Benchmark of the operators on a Mono12 frame (1920 x 1200) :
+- convert-then-process : conversion to 8 bits, operator on the 8 bits image,
+- native : operator on the uint16 image, then conversion to 8 bits for the display.
+  The point operators give the 8 bits display in the same pass ('display' parameter).
+
+The application processes the raw AOI only for the operators of NATIVE_OPERATORS
+(last column) : the native path is not slower for them. Morphology and smoothing
+filters are 2 to 3 times slower on uint16 images (OpenCV processes half as many
+16 bits pixels per SIMD instruction, no fast path for the 16 bits gaussian filter) :
+they process the 8 bits image.
+
+Run from the appli/test directory : python bit_depth_benchmark.py
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+import time
+from pathlib import Path
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from processing.operators import apply_operator, get_kernel, NATIVE_OPERATORS
+from processing.lut import LutOperator
+
+BIT_DEPTH = 12
+NB_LOOPS = 20
+
+
+def benchmark(function, *args) -> float:
+    """Return the mean time of a function in ms."""
+    function(*args)
+    start = time.perf_counter()
+    for k in range(NB_LOOPS):
+        function(*args)
+    return (time.perf_counter() - start) / NB_LOOPS * 1000
+
+
+def to_8bits(image: np.ndarray) -> np.ndarray:
+    return apply_operator('to_8bits', image, {'bit_depth': BIT_DEPTH})
+
+
+image = np.random.default_rng(0).integers(0, 2**BIT_DEPTH, (1200, 1920), dtype=np.uint16)
+kernel = get_kernel('ellip', 7)
+tests = {'threshold': {'type': 'binary', 'value': 100},
+         'quantization': {'bit_depth': 3, 'init_depth': 8},
+         'contrast_brightness': {'contrast': 1.5, 'brightness': 10},
+         'enhance_contrast': {'min': 20, 'max': 200},
+         'morphology': {'operation': 'opening', 'kernel': kernel},
+         'smooth': {'filter': 'gaussian', 'kernel_size': 5, 'sigma': 1.5},
+         'sampling': {'factor': 4}}
+# Parameters in the bits depth of the image
+native_params = {'enhance_contrast': {'min': 20 << (BIT_DEPTH - 8), 'max': 200 << (BIT_DEPTH - 8),
+                                      'display': True},
+                 'contrast_brightness': {'display': True},
+                 'threshold': {'type': 'binary', 'value': 100 << (BIT_DEPTH - 8)},
+                 'quantization': {'init_depth': BIT_DEPTH}}
+
+print(f'{"operator":<22}{"8 bits (ms)":>14}{"native (ms)":>14}{"source":>10}')
+for name, params in tests.items():
+    params = {'bit_depth': BIT_DEPTH, **params}
+    native = {**params, **native_params.get(name, {})}
+    if name in ('contrast_brightness', 'enhance_contrast'):
+        # Lookup table of the 8 bits image / one pass to the 8 bits display
+        lut_8bits = LutOperator(['to_8bits', name])
+        time_8bits = benchmark(lambda: lut_8bits(image, params))
+        time_native = benchmark(lambda: apply_operator(name, image, native))
+    else:
+        time_8bits = benchmark(lambda: apply_operator(name, to_8bits(image), params))
+        if name == 'threshold':     # Binary image (0 or 255), displayed as it is
+            time_native = benchmark(lambda: apply_operator(name, image, native))
+        elif name == 'quantization':    # Displayed with a shift (both paths)
+            time_native = benchmark(lambda: apply_operator(name, image, native))
+        elif name == 'sampling':
+            time_native = benchmark(lambda: to_8bits(apply_operator(name, image, native)[1]))
+        else:
+            time_native = benchmark(lambda: to_8bits(apply_operator(name, image, native)))
+    source = 'native' if name in NATIVE_OPERATORS else '8 bits'
+    print(f'{name:<22}{time_8bits:>14.2f}{time_native:>14.2f}{source:>10}')
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""*morphology_check.py* file.
+
+Check that the morphology engine (processing/morphology.py) gives exactly the same
+results as OpenCV, for all the operations, kernel shapes and sizes, on 8 and 16 bits
+images. Then compare the processing times on a 1920 x 1200 image.
+
+Run from the appli/test directory : python morphology_check.py
+
+.. note:: LEnsE - Institut d'Optique - version 1.0
+
+.. moduleauthor:: Julien VILLEMEJANE (PRAG LEnsE) <julien.villemejane@institutoptique.fr>
+Creation : oct/2026
+"""
+import sys
+import time
+from pathlib import Path
+import cv2
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import processing.morphology as morphology
+from processing.operators import get_kernel, MORPHOLOGY_OPERATIONS
+
+CV_OPERATIONS = {'erosion': lambda image, kernel: cv2.erode(image, kernel),
+                 'dilation': lambda image, kernel: cv2.dilate(image, kernel),
+                 'opening': lambda image, kernel: cv2.morphologyEx(image, cv2.MORPH_OPEN, kernel),
+                 'closing': lambda image, kernel: cv2.morphologyEx(image, cv2.MORPH_CLOSE, kernel),
+                 'gradient': lambda image, kernel: cv2.morphologyEx(image, cv2.MORPH_GRADIENT,
+                                                                    kernel)}
+
+
+def check(image: np.ndarray, sizes: list) -> int:
+    """Return the number of differences with OpenCV."""
+    nb_errors = 0
+    for shape in ['rect', 'cross', 'ellip']:
+        for size in sizes:
+            kernel = get_kernel(shape, size)
+            for operation in MORPHOLOGY_OPERATIONS:
+                reference = CV_OPERATIONS[operation](image, kernel)
+                result = morphology.morphology_ex(image, operation, kernel)
+                if not np.array_equal(reference, result):
+                    nb_errors += 1
+                    print(f'Error : {image.dtype} / {shape} {size} / {operation}')
+    return nb_errors
+
+
+rng = np.random.default_rng(0)
+sizes = [1, 2, 3, 4, 5, 7, 10, 15, 21, 31]
+errors = 0
+for image in [rng.integers(0, 256, (157, 203), dtype=np.uint8),
+              rng.integers(0, 4096, (157, 203), dtype=np.uint16),
+              (rng.random((157, 203)) > 0.7).astype(np.uint8) * 255]:
+    errors += check(image, sizes)
+print(f'Bit-exact check : {"OK" if errors == 0 else f"{errors} errors"}')
+
+image = rng.integers(0, 256, (1200, 1920), dtype=np.uint8)
+print(f'{"kernel":<12}{"OpenCV (ms)":>14}{"engine (ms)":>14}')
+for shape in ['rect', 'cross', 'ellip']:
+    for size in [5, 15, 31, 61, 101]:
+        kernel = get_kernel(shape, size)
+        times = []
+        for function in (cv2.erode, morphology.erode):
+            start = time.perf_counter()
+            for k in range(3):
+                function(image, kernel)
+            times.append((time.perf_counter() - start) / 3 * 1000)
+        print(f'{shape + " " + str(size):<12}{times[0]:>14.2f}{times[1]:>14.2f}')